@@ -11,7 +11,7 @@ import logging
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -451,6 +451,29 @@ class Reporter:
         Returns:
             Path to generated file
         """
+        path, _ = self.generate_json_report_with_data(analysis_result, output_file, pretty)
+        return path
+        
+    def generate_json_report_with_data(
+        self,
+        analysis_result,
+        output_file: Optional[str] = None,
+        pretty: bool = True,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Generate JSON export and also return the exported data.
+        
+        Saves callers that want the report contents from reading the
+        file back and parsing it again.
+        
+        Args:
+            analysis_result: AnalysisResult object
+            output_file: Output filename
+            pretty: Pretty-print JSON
+            
+        Returns:
+            Tuple of (path to generated file, report dict as serialized)
+        """
         if not output_file:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"airdump_report_{analysis_result.session_id}_{timestamp}.json"
@@ -466,7 +489,7 @@ class Reporter:
                 json.dump(data, f, default=str)
                 
         logger.info(f"Generated JSON report: {output_path}")
-        return str(output_path)
+        return str(output_path), data
         
     def generate_csv_report(
         self,
@@ -8,9 +8,10 @@ import sqlite3
 import json
 import time
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Iterable, Union
 from contextlib import contextmanager
 
 from .models import (
@@ -29,6 +30,9 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
+# Bump when SCHEMA changes so existing databases get the new DDL
+SCHEMA_VERSION = 1
+
 # Database schema
 SCHEMA = """
 -- Scan sessions
@@ -217,6 +221,16 @@ CREATE INDEX IF NOT EXISTS idx_gps_session ON gps_track(session_id);
 CREATE INDEX IF NOT EXISTS idx_gps_timestamp ON gps_track(timestamp);
 """
 
+# New WiFi device row, shared by single and bulk inserts
+WIFI_INSERT_SQL = """
+INSERT INTO wifi_devices
+(session_id, device_key, bssid, essid, device_type, channel, frequency,
+ signal_dbm, encryption, manufacturer, packets_total, first_seen, last_seen,
+ gps_lat, gps_lon, gps_alt, gps_valid, fingerprint_hash, fingerprint_data,
+ is_known, identified_as, seen_by_nodes)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class Database:
     """SQLite/SQLCipher database handler."""
@@ -226,6 +240,7 @@ class Database:
         db_path: str,
         encryption_key: Optional[str] = None,
         backup_dir: Optional[str] = None,
+        durable: bool = True,
     ):
         """
         Initialize database connection.
@@ -234,11 +249,16 @@ class Database:
             db_path: Path to SQLite database file
             encryption_key: Optional SQLCipher encryption key
             backup_dir: Directory for buffering failed writes
+            durable: If False, keep the journal in memory and never fsync.
+                     Only for throwaway databases such as test fixtures.
         """
         self.db_path = Path(db_path)
         self.encryption_key = encryption_key
+        self.durable = durable
         self.backup_dir = Path(backup_dir) if backup_dir else Path("/tmp/airdump_buffer")
         self._connection: Optional[sqlite3.Connection] = None
+        # Scanner callbacks and the orchestrator share one connection
+        self._lock = threading.RLock()
         
         # Ensure directories exist
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -254,22 +274,32 @@ class Database:
             if self.encryption_key:
                 try:
                     from pysqlcipher3 import dbapi2 as sqlcipher
-                    self._connection = sqlcipher.connect(str(self.db_path))
+                    self._connection = sqlcipher.connect(str(self.db_path), check_same_thread=False)
                     self._connection.execute(f"PRAGMA key = '{self.encryption_key}'")
                     logger.info("Connected with SQLCipher encryption")
                 except ImportError:
                     logger.warning("SQLCipher not available, using standard SQLite")
-                    self._connection = sqlite3.connect(str(self.db_path))
+                    self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
             else:
-                self._connection = sqlite3.connect(str(self.db_path))
+                self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
                 
             # Enable foreign keys and WAL mode (may fail for read-only access)
             self._connection.execute("PRAGMA foreign_keys = ON")
-            try:
-                self._connection.execute("PRAGMA journal_mode = WAL")
-            except sqlite3.OperationalError:
-                # Read-only database, skip WAL mode
-                pass
+            if self.durable:
+                try:
+                    mode = self._connection.execute("PRAGMA journal_mode = WAL").fetchone()
+                    if mode and str(mode[0]).lower() == "wal":
+                        # In WAL mode commits need not fsync; durability points
+                        # are the checkpoints issued by flush_buffer()
+                        self._connection.execute("PRAGMA synchronous = NORMAL")
+                except sqlite3.OperationalError:
+                    # Read-only database, skip WAL mode
+                    pass
+            else:
+                # Contents are disposable: no journal file, no fsync
+                self._connection.execute("PRAGMA journal_mode = MEMORY")
+                self._connection.execute("PRAGMA synchronous = OFF")
+                self._connection.execute("PRAGMA temp_store = MEMORY")
             
             # Row factory for dict-like access
             self._connection.row_factory = sqlite3.Row
@@ -282,27 +312,34 @@ class Database:
             
     def close(self):
         """Close database connection."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
-            logger.info("Database connection closed")
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+                logger.info("Database connection closed")
             
     @contextmanager
     def transaction(self):
         """Context manager for transactions."""
-        conn = self.connect()
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Transaction failed, rolled back: {e}")
-            raise
+        with self._lock:
+            conn = self.connect()
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Transaction failed, rolled back: {e}")
+                raise
             
     def initialize_schema(self):
-        """Create database schema."""
+        """Create database schema (skipped if already at SCHEMA_VERSION)."""
         conn = self.connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            logger.debug(f"Database schema already at version {version}")
+            return
         conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
         logger.info("Database schema initialized")
         
@@ -364,10 +401,16 @@ class Database:
             logger.info(f"Updated session: {session.session_id}")
     
     def flush_buffer(self):
-        """Flush any pending writes to database."""
-        # Commit any pending transaction
-        if self._connection:
-            self._connection.commit()
+        """Flush any pending writes to database and sync them to disk."""
+        with self._lock:
+            if self._connection:
+                # Commit any pending transaction
+                self._connection.commit()
+                # Checkpoint syncs the WAL and copies it into the database
+                try:
+                    self._connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                except sqlite3.OperationalError as e:
+                    logger.debug(f"WAL checkpoint skipped: {e}")
         logger.debug("Database buffer flushed")
             
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -465,42 +508,57 @@ class Database:
                 )
             else:
                 # Insert new device
-                conn.execute(
-                    """
-                    INSERT INTO wifi_devices
-                    (session_id, device_key, bssid, essid, device_type, channel, frequency,
-                     signal_dbm, encryption, manufacturer, packets_total, first_seen, last_seen,
-                     gps_lat, gps_lon, gps_alt, gps_valid, fingerprint_hash, fingerprint_data,
-                     is_known, identified_as, seen_by_nodes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        device.session_id,
-                        device.device_key,
-                        device.bssid,
-                        device.essid,
-                        device.device_type.value,
-                        device.channel,
-                        device.frequency,
-                        device.signal_dbm,
-                        device.encryption,
-                        device.manufacturer,
-                        device.packets_total,
-                        device.first_seen.isoformat(),
-                        device.last_seen.isoformat(),
-                        device.gps_lat,
-                        device.gps_lon,
-                        device.gps_alt,
-                        device.gps_valid,
-                        device.fingerprint_hash,
-                        json.dumps(device.fingerprint_data) if device.fingerprint_data else None,
-                        device.is_known,
-                        device.identified_as,
-                        json.dumps(device.seen_by_nodes),
-                    )
-                )
+                conn.execute(WIFI_INSERT_SQL, self._wifi_insert_row(device))
             return True
             
+    def insert_wifi_devices_bulk(self, devices: Iterable[WiFiDevice]) -> int:
+        """
+        Insert many new WiFi devices in a single transaction.
+        
+        Unlike insert_wifi_device() this does not merge with devices already
+        stored for the session, so it suits batches of first sightings such
+        as imports and test fixtures.
+        
+        Args:
+            devices: Devices not yet present in their sessions. May be a
+                     generator; rows are built as sqlite consumes them.
+            
+        Returns:
+            Number of devices inserted
+        """
+        rows = map(self._wifi_insert_row, devices)
+        with self.transaction() as conn:
+            cursor = conn.executemany(WIFI_INSERT_SQL, rows)
+        return cursor.rowcount
+        
+    @staticmethod
+    def _wifi_insert_row(device: WiFiDevice) -> tuple:
+        """Column values for WIFI_INSERT_SQL."""
+        return (
+            device.session_id,
+            device.device_key,
+            device.bssid,
+            device.essid,
+            device.device_type.value,
+            device.channel,
+            device.frequency,
+            device.signal_dbm,
+            device.encryption,
+            device.manufacturer,
+            device.packets_total,
+            device.first_seen.isoformat(),
+            device.last_seen.isoformat(),
+            device.gps_lat,
+            device.gps_lon,
+            device.gps_alt,
+            device.gps_valid,
+            device.fingerprint_hash,
+            json.dumps(device.fingerprint_data) if device.fingerprint_data else None,
+            device.is_known,
+            device.identified_as,
+            json.dumps(device.seen_by_nodes),
+        )
+            
     def get_wifi_devices(
         self,
         session_id: str,
@@ -683,6 +741,44 @@ class Database:
                 (session_id, timestamp.isoformat(), lat, lon, alt, speed, track, fix_quality, hdop, satellites)
             )
             
+    def insert_gps_points_bulk(
+        self,
+        session_id: str,
+        points: List[tuple],
+    ) -> int:
+        """
+        Insert many GPS track points in a single transaction.
+        
+        Args:
+            session_id: Session the points belong to
+            points: Tuples of (lat, lon, alt, speed, track, fix_quality,
+                    hdop, satellites, timestamp), matching insert_gps_point
+                    
+        Returns:
+            Number of points inserted
+        """
+        if not points:
+            return 0
+            
+        rows = [
+            (
+                session_id,
+                (timestamp or datetime.utcnow()).isoformat(),
+                lat, lon, alt, speed, track, fix_quality, hdop, satellites,
+            )
+            for lat, lon, alt, speed, track, fix_quality, hdop, satellites, timestamp in points
+        ]
+        with self.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO gps_track
+                (session_id, timestamp, latitude, longitude, altitude, speed, track, fix_quality, hdop, satellites)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        return len(rows)
+            
     def get_gps_track(self, session_id: str) -> List[Dict[str, Any]]:
         """Get GPS track for session."""
         conn = self.connect()
@@ -121,7 +121,7 @@ class ScanSession:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class WiFiDevice:
     """Represents a detected WiFi device."""
     # Identifiers
@@ -6,6 +6,8 @@ Shared utility functions for the project.
 
 import os
 import re
+import json
+import stat
 import yaml
 import logging
 import hashlib
@@ -69,10 +71,20 @@ def setup_logging(
     return logger
 
 
+# Use the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Suffix of the pre-parsed JSON copy written next to the YAML config
+CONFIG_CACHE_SUFFIX = ".cache.json"
+
+
 def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
     """
     Load YAML configuration file.
     
+    The parsed YAML is cached as JSON next to the config file and reused
+    while the YAML file's mtime and size are unchanged.
+    
     Args:
         config_path: Path to configuration file
         
@@ -84,8 +96,16 @@ def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
     if not config_file.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
-    with open(config_file, "r") as f:
-        config = yaml.safe_load(f)
+    st = config_file.stat()
+    cache_key = [st.st_mtime_ns, st.st_size]
+    cache_file = config_file.with_name(config_file.name + CONFIG_CACHE_SUFFIX)
+    
+    config = _read_config_cache(cache_file, cache_key)
+    if config is None:
+        with open(config_file, "r") as f:
+            config = yaml.load(f, Loader=_YAML_LOADER)
+        # The cache holds the same credentials, so it gets the same mode
+        _write_config_cache(cache_file, cache_key, config, stat.S_IMODE(st.st_mode))
         
     # Expand ${data_dir} variables
     data_dir = config.get("general", {}).get("data_dir", "/opt/airdump/data")
@@ -94,6 +114,45 @@ def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
     return config
 
 
+def _read_config_cache(cache_file: Path, cache_key: List[int]) -> Optional[Dict[str, Any]]:
+    """Return cached config if the cache matches the source file, else None."""
+    try:
+        with open(cache_file, "r") as f:
+            cached = json.load(f)
+        if cached.get("source") == cache_key:
+            return cached["config"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return None
+
+
+def _write_config_cache(
+    cache_file: Path,
+    cache_key: List[int],
+    config: Any,
+    mode: int = 0o600,
+):
+    """Write config JSON cache atomically; skipped if not JSON-representable."""
+    try:
+        data = json.dumps({"source": cache_key, "config": config})
+        # Non-string keys, dates etc. would not survive the round trip
+        if json.loads(data)["config"] != config:
+            return
+        tmp_file = cache_file.with_name(cache_file.name + f".{os.getpid()}.tmp")
+        try:
+            tmp_file.unlink()  # left behind by a crashed run with our pid
+        except FileNotFoundError:
+            pass
+        # Created with the final mode so the contents are never readable
+        # more widely than the source config
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Config cache not written: {e}")
+
+
 def _expand_variables(obj: Any, variables: Dict[str, str]) -> Any:
     """Recursively expand ${var} in config values."""
     if isinstance(obj, dict):
@@ -120,12 +179,14 @@ def generate_session_id(prefix: str = "") -> str:
     Returns:
         Session ID string
     """
-    date_str = datetime.utcnow().strftime("%Y%m%d")
-    timestamp = datetime.utcnow().strftime("%H%M%S")
+    # Single clock read so date and time always agree (e.g. at midnight)
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     
-    if prefix:
-        return f"{prefix}_{date_str}_{timestamp}"
-    return f"airdump_scan_{date_str}_{timestamp}"
+    return f"{prefix or 'airdump_scan'}_{stamp}"
+
+
+_MAC_NORMALIZED = re.compile(r"(?:[0-9A-F]{2}:){5}[0-9A-F]{2}")
+_MAC_SEPARATORS = re.compile(r"[^0-9A-Fa-f]")
 
 
 def normalize_mac(mac: str) -> str:
@@ -138,8 +199,12 @@ def normalize_mac(mac: str) -> str:
     Returns:
         Normalized MAC (AA:BB:CC:DD:EE:FF)
     """
+    # Fast path: already in canonical form
+    if _MAC_NORMALIZED.fullmatch(mac):
+        return mac
+        
     # Remove all separators and convert to uppercase
-    clean = re.sub(r"[^0-9A-Fa-f]", "", mac).upper()
+    clean = _MAC_SEPARATORS.sub("", mac).upper()
     
     if len(clean) != 12:
         return mac  # Return original if invalid
@@ -501,6 +566,79 @@ def _restart_network_manager():
         pass  # NetworkManager not available or not running
 
 
+def pin_to_cpus(pid: int, cpus: set) -> bool:
+    """
+    Restrict a process or thread to the given CPUs.
+    
+    Args:
+        pid: Process ID (0 for the calling thread)
+        cpus: Set of CPU indexes
+        
+    Returns:
+        True if affinity was applied
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+        
+    try:
+        os.sched_setaffinity(pid, cpus)
+        return True
+    except OSError as e:
+        logger.debug(f"Could not pin {pid} to CPUs {sorted(cpus)}: {e}")
+        return False
+
+
+def get_interface_cpus(interface: str) -> Optional[set]:
+    """
+    Get the CPUs local to a network interface's device (its NUMA node).
+    
+    Args:
+        interface: Network interface name
+        
+    Returns:
+        Set of CPU indexes, or None if the kernel doesn't report locality
+        (e.g. USB adapters)
+    """
+    try:
+        with open(f"/sys/class/net/{interface}/device/local_cpulist") as f:
+            cpulist = f.read().strip()
+    except OSError:
+        return None
+        
+    # Kernel cpulist format, e.g. "0-3,8-11"
+    cpus = set()
+    try:
+        for part in cpulist.split(","):
+            if part:
+                start, _, end = part.partition("-")
+                cpus.update(range(int(start), int(end or start) + 1))
+    except ValueError:
+        return None
+    return cpus or None
+
+
+def set_process_priority(pid: int, niceness: int) -> bool:
+    """
+    Set the scheduling niceness of a process.
+    
+    Args:
+        pid: Process ID
+        niceness: Nice value (negative raises priority, needs root)
+        
+    Returns:
+        True if the priority was applied
+    """
+    if not hasattr(os, "setpriority"):
+        return False
+        
+    try:
+        os.setpriority(os.PRIO_PROCESS, pid, niceness)
+        return True
+    except OSError as e:
+        logger.debug(f"Could not set priority of {pid} to {niceness}: {e}")
+        return False
+
+
 def get_system_uptime() -> int:
     """Get system uptime in seconds."""
     try:
@@ -69,6 +69,10 @@ class PowerMonitor:
         self._power_state: str = "unknown"
         self._on_battery: bool = False
         
+        # Latest state, published as a single reference store so pollers
+        # can read it without taking the lock
+        self.last_state: str = "unknown"
+        
         # Callbacks
         self._warning_callbacks: List[Callable[[float], None]] = []
         self._critical_callbacks: List[Callable[[float], None]] = []
@@ -115,6 +119,8 @@ class PowerMonitor:
                     old_state = self._power_state
                     self._power_state = self._determine_state(voltage)
                     
+                self.last_state = self._power_state
+                
                 # Trigger callbacks if state changed or critical
                 if self._power_state == "shutdown":
                     for callback in self._shutdown_callbacks:
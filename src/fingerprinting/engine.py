@@ -378,6 +378,13 @@ class FingerprintEngine:
             self.wifi.clear_cache()
             self.bluetooth.clear_cache()
             
+    def reset(self):
+        """Clear fingerprint caches and zero statistics, e.g. between sessions."""
+        with self._lock:
+            self.wifi.clear_cache()
+            self.bluetooth.clear_cache()
+            self._stats = dict.fromkeys(self._stats, 0)
+            
     def process_kismet_device(self, device) -> Optional[str]:
         """
         Process device from Kismet controller.
@@ -406,6 +413,26 @@ class FingerprintEngine:
                 timestamp=device.last_seen,
             )
         return None
+        
+    def process_kismet_devices_batch(self, devices: List[Any]) -> List[Optional[str]]:
+        """
+        Process a batch of devices from Kismet controller.
+        
+        Args:
+            devices: KismetDevice objects
+            
+        Returns:
+            Fingerprint hash (or None) for each device, in order
+        """
+        process = self.process_kismet_device
+        results = []
+        for device in devices:
+            try:
+                results.append(process(device))
+            except Exception as e:
+                logger.error(f"Failed to fingerprint {device.mac}: {e}")
+                results.append(None)
+        return results
 
 
 class FingerprintMatcher:
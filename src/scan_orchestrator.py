@@ -5,19 +5,33 @@ Main coordinator for all scanning operations.
 Manages lifecycle of GPS, Kismet, tshark, and fingerprinting modules.
 """
 
+import array
 import atexit
+import collections
+import contextlib
 import logging
+import os
+import queue
+import selectors
 import signal
 import sys
 import time
 import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from core.database import Database
 from core.models import ScanSession, ScanStatus
-from core.utils import setup_logging, load_config, generate_session_id, restore_managed_mode
+from core.utils import (
+    setup_logging,
+    load_config,
+    generate_session_id,
+    restore_managed_mode,
+    pin_to_cpus,
+    get_interface_cpus,
+)
 from core.encryption import KeyManager
 
 from scanners.gps_logger import GPSLogger, MockGPSLogger
@@ -30,6 +44,159 @@ from drone.power_monitor import PowerMonitor
 
 logger = logging.getLogger(__name__)
 
+# GPS fixes are buffered and written in batches of this size
+GPS_FLUSH_THRESHOLD = 64
+
+# New Kismet devices are fingerprinted in batches of up to this size,
+# or after FP_BATCH_WINDOW seconds, whichever comes first
+FP_BATCH_SIZE = 32
+FP_BATCH_WINDOW = 0.2
+
+# Indexes into ScanOrchestrator._counters
+CNT_WIFI = 0
+CNT_BT = 1
+CNT_PKT = 2
+CNT_GPS = 3
+
+@dataclass(frozen=True, slots=True)
+class OrchConfig:
+    """Orchestrator settings resolved once from the configuration dict."""
+    
+    node_id: str = "primary"
+    main_loop_interval: float = 10.0
+    cpu_pinning: bool = True
+    orchestrator_cpu: Optional[int] = None  # None = last available CPU
+    
+    db_path: str = "database/airdump.db"
+    db_encryption_enabled: bool = False
+    
+    gps_enabled: bool = False
+    gps_host: str = "localhost"
+    gps_port: int = 2947
+    gps_poll_interval: float = 1.0
+    gps_min_hdop: float = 10.0
+    gps_min_satellites: int = 4
+    gps_wait_for_fix: bool = False
+    gps_fix_timeout: float = 60
+    gps_use_streaming: bool = False
+    
+    kismet_enabled: bool = True
+    kismet_host: str = "localhost"
+    kismet_port: int = 2501
+    kismet_username: str = "kismet"
+    kismet_password: str = "kismet"
+    kismet_poll_interval: float = 2.0
+    
+    hop_fast_rate: float = 10.0
+    hop_slow_rate: float = 2.0
+    hop_default_mode: str = "adaptive"
+    
+    capture_enabled: bool = True
+    capture_interface: str = "wlan0mon"
+    capture_max_file_size_mb: int = 100
+    capture_filter: Optional[str] = None
+    capture_buffer_size_mb: int = 64
+    capture_cpu: Optional[int] = None  # None = first CPU local to the capture NIC
+    
+    power_monitor_enabled: bool = False
+    power_voltage_source: str = "sysfs"
+    power_poll_interval: float = 5.0
+    power_warning_voltage: float = 3.5
+    power_critical_voltage: float = 3.3
+    power_shutdown_voltage: float = 3.1
+    
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "OrchConfig":
+        """Build from a loaded configuration dict, keeping defaults for missing keys."""
+        sections = {
+            "general": {
+                "node_id": "node_id",
+                "main_loop_interval": "main_loop_interval",
+                "cpu_pinning": "cpu_pinning",
+                "orchestrator_cpu": "orchestrator_cpu",
+            },
+            "database": {
+                "path": "db_path",
+                "encryption_enabled": "db_encryption_enabled",
+            },
+            "gps": {
+                "enabled": "gps_enabled",
+                "host": "gps_host",
+                "port": "gps_port",
+                "poll_interval": "gps_poll_interval",
+                "min_hdop": "gps_min_hdop",
+                "min_satellites": "gps_min_satellites",
+                "wait_for_fix": "gps_wait_for_fix",
+                "fix_timeout": "gps_fix_timeout",
+                "use_streaming": "gps_use_streaming",
+            },
+            "kismet": {
+                "enabled": "kismet_enabled",
+                "host": "kismet_host",
+                "port": "kismet_port",
+                "username": "kismet_username",
+                "password": "kismet_password",
+                "poll_interval": "kismet_poll_interval",
+            },
+            "channel_hopping": {
+                "fast_rate": "hop_fast_rate",
+                "slow_rate": "hop_slow_rate",
+                "default_mode": "hop_default_mode",
+            },
+            "capture": {
+                "enabled": "capture_enabled",
+                "interface": "capture_interface",
+                "max_file_size_mb": "capture_max_file_size_mb",
+                "filter": "capture_filter",
+                "buffer_size_mb": "capture_buffer_size_mb",
+                "capture_cpu": "capture_cpu",
+            },
+            "power": {
+                "monitor_enabled": "power_monitor_enabled",
+                "voltage_source": "power_voltage_source",
+                "poll_interval": "power_poll_interval",
+                "warning_voltage": "power_warning_voltage",
+                "critical_voltage": "power_critical_voltage",
+                "shutdown_voltage": "power_shutdown_voltage",
+            },
+        }
+        
+        values = {}
+        for section, keys in sections.items():
+            section_config = config.get(section) or {}
+            for key, field_name in keys.items():
+                if key in section_config:
+                    values[field_name] = section_config[key]
+                    
+        return cls(**values)
+        
+    def resolve_cpus(self) -> tuple:
+        """
+        Get (orchestrator_cpu, capture_cpu) to pin to.
+        
+        Returns (None, None) when pinning is disabled or only one CPU is
+        available, since pinning cannot separate the workloads then.
+        """
+        if not self.cpu_pinning or not hasattr(os, "sched_getaffinity"):
+            return (None, None)
+            
+        available = sorted(os.sched_getaffinity(0))
+        if len(available) < 2:
+            return (None, None)
+            
+        orchestrator_cpu = self.orchestrator_cpu
+        if orchestrator_cpu is None:
+            orchestrator_cpu = available[-1]
+        capture_cpu = self.capture_cpu
+        if capture_cpu is None:
+            # Prefer a CPU on the capture NIC's NUMA node so packet handling
+            # stays near the device's interrupts
+            local = get_interface_cpus(self.capture_interface) or ()
+            candidates = [c for c in available if c in local and c != orchestrator_cpu]
+            capture_cpu = candidates[0] if candidates else available[0]
+        return (orchestrator_cpu, capture_cpu)
+
+
 # Global reference to active orchestrator for atexit cleanup
 _active_orchestrator: Optional['ScanOrchestrator'] = None
 
@@ -61,6 +228,45 @@ class ScanOrchestrator:
     - Data persistence
     """
     
+    __slots__ = (
+        "config_file",
+        "data_dir",
+        "_log_dir",
+        "_pcap_dir",
+        "mock_gps",
+        "config",
+        "cfg",
+        "_running",
+        "_session",
+        "_session_start_ns",
+        "_shutdown_event",
+        "_local_tz",
+        "_main_thread",
+        "database",
+        "gps",
+        "kismet",
+        "channel_hopper",
+        "tshark",
+        "fingerprint_engine",
+        "power_monitor",
+        "_counters",
+        "_counter_lock",
+        "_gps_queue",
+        "_gps_lock",
+        "_last_signum",
+        "_sig_r",
+        "_sig_w",
+        "_prev_wakeup_fd",
+        "_stop_lock",
+        "_stopped",
+        "_writer_q",
+        "_writer_thread",
+        "_exit_stack",
+        "_fp_batch",
+        "_fp_batch_lock",
+        "_fp_batch_timer",
+    )
+    
     def __init__(
         self,
         config_file: str = "config/config.yaml",
@@ -79,21 +285,36 @@ class ScanOrchestrator:
         self.data_dir = Path(data_dir)
         self.mock_gps = mock_gps
         
-        # Load configuration
+        # Fixed per-orchestrator directories. Each is created once by the
+        # module that writes to it (setup_logging, TsharkCapture, Database).
+        self._log_dir = self.data_dir / "logs"
+        self._pcap_dir = self.data_dir / "pcap"
+        
+        # Load configuration. The raw dict may still be adjusted by the caller
+        # (e.g. CLI overrides); it is resolved into self.cfg by start().
         self.config = load_config(config_file)
+        self.cfg = OrchConfig.from_dict(self.config)
         
         # Setup logging
-        log_dir = self.data_dir / "logs"
-        log_dir.mkdir(parents=True, exist_ok=True)
         setup_logging(
-            log_dir=str(log_dir),
+            log_dir=str(self._log_dir),
             log_level=self.config.get("general", {}).get("log_level", "INFO"),
         )
         
         # State
         self._running = False
         self._session: Optional[ScanSession] = None
+        self._session_start_ns = 0
         self._shutdown_event = threading.Event()
+        self._main_thread: Optional[threading.Thread] = None
+        # Set once stop() has finished tearing down; set while idle so
+        # waiting on an orchestrator that never started returns at once
+        self._stop_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._stopped.set()
+        
+        # Local timezone resolved once; session timestamps reuse it
+        self._local_tz = datetime.now().astimezone().tzinfo
         
         # Modules (initialized on start)
         self.database: Optional[Database] = None
@@ -104,22 +325,66 @@ class ScanOrchestrator:
         self.fingerprint_engine: Optional[FingerprintEngine] = None
         self.power_monitor: Optional[PowerMonitor] = None
         
-        # Statistics
-        self._stats = {
-            "wifi_devices": 0,
-            "bt_devices": 0,
-            "packets_captured": 0,
-            "gps_fixes": 0,
-        }
+        # Statistics, updated from scanner callback threads
+        self._counters = array.array("Q", [0, 0, 0, 0])
+        self._counter_lock = threading.Lock()
+        
+        # Teardown callbacks for started modules, run in reverse order by stop()
+        self._exit_stack = contextlib.ExitStack()
+        
+        # New devices awaiting fingerprinting
+        self._fp_batch: List[Any] = []
+        self._fp_batch_lock = threading.Lock()
+        self._fp_batch_timer: Optional[threading.Timer] = None
+        
+        # Database writes requested from callback threads ("flush",
+        # "update_session", "stop"), executed by the writer thread
+        self._writer_q: queue.Queue = queue.Queue(maxsize=16)
+        self._writer_thread: Optional[threading.Thread] = None
+        
+        # Pending GPS track points, flushed in batches
+        self._gps_queue: collections.deque = collections.deque(maxlen=4096)
+        self._gps_lock = threading.Lock()
+        
+        # Signals are delivered through a wakeup pipe so that shutdown runs
+        # from the main loop rather than inside the signal handler
+        self._last_signum: Optional[int] = None
+        self._sig_r = self._sig_w = -1
+        self._prev_wakeup_fd = -1
+        self._install_wakeup_pipe()
         
         # Register signal handlers
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
         
+    def _install_wakeup_pipe(self):
+        """Create the signal wakeup pipe (main thread only)."""
+        self._sig_r, self._sig_w = os.pipe()
+        os.set_blocking(self._sig_r, False)
+        os.set_blocking(self._sig_w, False)
+        self._prev_wakeup_fd = signal.set_wakeup_fd(self._sig_w)
+        
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals."""
-        logger.info(f"Received signal {signum}, initiating graceful shutdown")
-        self.stop()
+        """Record shutdown signal; the main loop performs the shutdown."""
+        self._last_signum = signum
+        # The C-level wakeup byte can reach the main loop before this
+        # handler runs, so wake it again once the signal is recorded
+        self._wakeup()
+        
+    def _drain_wakeup_pipe(self):
+        """Discard pending bytes from the signal wakeup pipe."""
+        try:
+            while os.read(self._sig_r, 512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+            
+    def _wakeup(self):
+        """Wake the main loop early."""
+        try:
+            os.write(self._sig_w, b"\0")
+        except (BlockingIOError, OSError):
+            pass
         
     def start(
         self,
@@ -149,24 +414,41 @@ class ScanOrchestrator:
         # Register for atexit cleanup
         _active_orchestrator = self
         
+        # Snapshot configuration for this session
+        self.cfg = OrchConfig.from_dict(self.config)
+        
+        # A previous stop() released the wakeup pipe
+        if self._sig_r < 0:
+            self._install_wakeup_pipe()
+        
         try:
             # Initialize database
             if not self._init_database():
                 return False
                 
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
+            self._exit_stack.callback(self._stop_writer)
+                
             # Create session
             session_id = generate_session_id()
             self._session = ScanSession(
                 session_id=session_id,
-                start_time=datetime.now().astimezone(),
+                start_time=datetime.now(self._local_tz),
                 status=ScanStatus.RUNNING,
                 property_id=property_id,
                 notes=session_name,
-                node_id=self.config.get("general", {}).get("node_id", "primary"),
+                node_id=self.cfg.node_id,
             )
             self.database.create_session(self._session)
+            self._session_start_ns = time.monotonic_ns()
             logger.info(f"Created session: {session_id}")
             
+            # Run after all scanner modules have stopped
+            self._exit_stack.callback(self._finalize_session)
+            self._exit_stack.callback(self._flush_fp_batch)
+            self._exit_stack.callback(self._flush_gps_points)
+            
             # Initialize GPS
             if not self._init_gps():
                 logger.warning("GPS initialization failed - continuing without GPS")
@@ -186,33 +468,34 @@ class ScanOrchestrator:
             if not self._init_power_monitor():
                 logger.warning("Power monitor initialization failed")
                 
+            self._stopped.clear()
             self._running = True
             
-            # Start main loop in thread
-            self._main_thread = threading.Thread(target=self._main_loop, daemon=True)
-            self._main_thread.start()
-            
             logger.info("Scan orchestrator started successfully")
             
-            # Wait for duration if specified
+            # Bounded run: the caller blocks anyway, so run the main loop on
+            # its thread until the deadline instead of spawning one
             if duration:
                 logger.info(f"Scanning for {duration} seconds...")
-                self._shutdown_event.wait(timeout=duration)
+                self._main_loop(deadline=time.monotonic() + duration)
                 if self._running:
                     self.stop()
-                    
+                return True
+                
+            # Unbounded run: return control to the caller
+            self._main_thread = threading.Thread(target=self._main_loop, daemon=True)
+            self._main_thread.start()
             return True
             
         except Exception as e:
             logger.error(f"Failed to start scan: {e}")
-            self.stop()
+            self._exit_stack.close()
             return False
             
     def _init_database(self) -> bool:
         """Initialize database connection."""
         try:
-            db_config = self.config.get("database", {})
-            db_path_str = db_config.get("path", "database/airdump.db")
+            db_path_str = self.cfg.db_path
             
             # Path may already be expanded by load_config, or contain ${data_dir}
             # Expand any remaining ${data_dir} variables
@@ -228,11 +511,9 @@ class ScanOrchestrator:
                 if not db_path_str.startswith(data_dir_str + "/") and not db_path_str.startswith(data_dir_str + "\\"):
                     db_path = self.data_dir / db_path_str
             
-            db_path.parent.mkdir(parents=True, exist_ok=True)
-            
             # Get encryption key if enabled
             encryption_key = None
-            if db_config.get("encryption_enabled", False):
+            if self.cfg.db_encryption_enabled:
                 key_manager = KeyManager()
                 encryption_key = key_manager.get_db_key()
                 if not encryption_key:
@@ -246,6 +527,7 @@ class ScanOrchestrator:
             # Initialize schema (creates tables if not exist)
             self.database.initialize_schema()
             
+            self._exit_stack.callback(self._close_database)
             logger.info(f"Database initialized: {db_path}")
             return True
             
@@ -256,32 +538,34 @@ class ScanOrchestrator:
     def _init_gps(self) -> bool:
         """Initialize GPS module."""
         try:
-            gps_config = self.config.get("gps", {})
+            cfg = self.cfg
             
             # Check if GPS is enabled in config
-            if not gps_config.get("enabled", False) and not self.mock_gps:
+            if not cfg.gps_enabled and not self.mock_gps:
                 logger.info("GPS disabled in config (use --gps to enable)")
                 return False
             
             if self.mock_gps:
                 self.gps = MockGPSLogger(
-                    poll_interval=gps_config.get("poll_interval", 1.0),
+                    poll_interval=cfg.gps_poll_interval,
                 )
             else:
                 self.gps = GPSLogger(
-                    host=gps_config.get("host", "localhost"),
-                    port=gps_config.get("port", 2947),
-                    poll_interval=gps_config.get("poll_interval", 1.0),
-                    min_hdop=gps_config.get("min_hdop", 10.0),
-                    min_satellites=gps_config.get("min_satellites", 4),
+                    host=cfg.gps_host,
+                    port=cfg.gps_port,
+                    poll_interval=cfg.gps_poll_interval,
+                    min_hdop=cfg.gps_min_hdop,
+                    min_satellites=cfg.gps_min_satellites,
+                    use_streaming=cfg.gps_use_streaming,
                 )
                 
             if not self.gps.start():
                 return False
+            self._exit_stack.callback(self.gps.stop)
                 
             # Wait for initial fix only if configured
-            if gps_config.get("wait_for_fix", False):
-                timeout = gps_config.get("fix_timeout", 60)
+            if cfg.gps_wait_for_fix:
+                timeout = cfg.gps_fix_timeout
                 logger.info(f"Waiting for GPS fix (timeout: {timeout}s)...")
                 if self.gps.wait_for_fix(timeout):
                     logger.info("GPS fix acquired")
@@ -300,18 +584,18 @@ class ScanOrchestrator:
     def _init_kismet(self) -> bool:
         """Initialize Kismet controller."""
         try:
-            kismet_config = self.config.get("kismet", {})
+            cfg = self.cfg
             
-            if not kismet_config.get("enabled", True):
+            if not cfg.kismet_enabled:
                 logger.info("Kismet disabled in config")
                 return False
                 
             self.kismet = KismetController(
-                host=kismet_config.get("host", "localhost"),
-                port=kismet_config.get("port", 2501),
-                username=kismet_config.get("username", "kismet"),
-                password=kismet_config.get("password", "kismet"),
-                poll_interval=kismet_config.get("poll_interval", 2.0),
+                host=cfg.kismet_host,
+                port=cfg.kismet_port,
+                username=cfg.kismet_username,
+                password=cfg.kismet_password,
+                poll_interval=cfg.kismet_poll_interval,
             )
             
             if not self.kismet.check_connection():
@@ -324,18 +608,18 @@ class ScanOrchestrator:
             
             if not self.kismet.start():
                 return False
+            self._exit_stack.callback(self.kismet.stop)
                 
             # Initialize channel hopper
-            hop_config = self.config.get("channel_hopping", {})
             self.channel_hopper = ChannelHopper(
                 kismet=self.kismet,
                 gps_logger=self.gps,
-                fast_rate=hop_config.get("fast_rate", 10.0),
-                slow_rate=hop_config.get("slow_rate", 2.0),
+                fast_rate=cfg.hop_fast_rate,
+                slow_rate=cfg.hop_slow_rate,
             )
             
             # Set initial hop mode
-            self.channel_hopper.set_mode(hop_config.get("default_mode", "adaptive"))
+            self.channel_hopper.set_mode(cfg.hop_default_mode)
             
             logger.info("Kismet initialized")
             return True
@@ -347,28 +631,28 @@ class ScanOrchestrator:
     def _init_tshark(self) -> bool:
         """Initialize tshark capture."""
         try:
-            capture_config = self.config.get("capture", {})
+            cfg = self.cfg
             
-            if not capture_config.get("enabled", True):
+            if not cfg.capture_enabled:
                 logger.info("Packet capture disabled in config")
                 return False
                 
-            pcap_dir = self.data_dir / "pcap"
-            pcap_dir.mkdir(parents=True, exist_ok=True)
-            
             self.tshark = TsharkCapture(
-                interface=capture_config.get("interface", "wlan0mon"),
-                output_dir=str(pcap_dir),
-                max_file_size_mb=capture_config.get("max_file_size_mb", 100),
+                interface=cfg.capture_interface,
+                output_dir=str(self._pcap_dir),
+                max_file_size_mb=cfg.capture_max_file_size_mb,
+                buffer_size_mb=cfg.capture_buffer_size_mb,
+                capture_cpu=cfg.resolve_cpus()[1],
             )
             
             # Start capture for current session
             if self._session:
                 self.tshark.start_capture(
                     session_id=self._session.session_id,
-                    filter_expr=capture_config.get("filter", None),
+                    filter_expr=cfg.capture_filter,
                 )
                 
+            self._exit_stack.callback(self._stop_capture)
             logger.info("tshark capture initialized")
             return True
             
@@ -392,18 +676,18 @@ class ScanOrchestrator:
     def _init_power_monitor(self) -> bool:
         """Initialize power monitor."""
         try:
-            power_config = self.config.get("power", {})
+            cfg = self.cfg
             
-            if not power_config.get("monitor_enabled", False):
+            if not cfg.power_monitor_enabled:
                 logger.info("Power monitoring disabled in config")
                 return False
                 
             self.power_monitor = PowerMonitor(
-                voltage_source=power_config.get("voltage_source", "sysfs"),
-                poll_interval=power_config.get("poll_interval", 5.0),
-                warning_threshold=power_config.get("warning_voltage", 3.5),
-                critical_threshold=power_config.get("critical_voltage", 3.3),
-                shutdown_threshold=power_config.get("shutdown_voltage", 3.1),
+                voltage_source=cfg.power_voltage_source,
+                poll_interval=cfg.power_poll_interval,
+                warning_threshold=cfg.power_warning_voltage,
+                critical_threshold=cfg.power_critical_voltage,
+                shutdown_threshold=cfg.power_shutdown_voltage,
             )
             
             # Register callbacks
@@ -412,6 +696,7 @@ class ScanOrchestrator:
             self.power_monitor.register_shutdown_callback(self._on_power_shutdown)
             
             self.power_monitor.start()
+            self._exit_stack.callback(self.power_monitor.stop)
             logger.info("Power monitoring initialized")
             return True
             
@@ -419,58 +704,146 @@ class ScanOrchestrator:
             logger.error(f"Power monitor initialization failed: {e}")
             return False
             
-    def _main_loop(self):
-        """Main orchestration loop."""
-        while self._running:
-            try:
-                # Update adaptive channel hopping
-                if self.channel_hopper:
-                    self.channel_hopper.update_adaptive_rate()
+    def _main_loop(self, deadline: Optional[float] = None):
+        """
+        Main orchestration loop.
+        
+        Args:
+            deadline: time.monotonic() value at which to return (None to
+                      run until stopped)
+        """
+        # Keep bookkeeping off the CPU handling packet capture. The
+        # calling thread's affinity is restored when the loop exits.
+        orchestrator_cpu, _ = self.cfg.resolve_cpus()
+        original_cpus = None
+        if orchestrator_cpu is not None:
+            original_cpus = os.sched_getaffinity(0)
+            if pin_to_cpus(0, {orchestrator_cpu}):
+                logger.info(f"Main loop pinned to CPU {orchestrator_cpu}")
+            else:
+                original_cpus = None
+                
+        try:
+            self._run_main_loop(deadline)
+        finally:
+            if original_cpus:
+                pin_to_cpus(0, original_cpus)
+                
+    def _run_main_loop(self, deadline: Optional[float]):
+        """Run main loop iterations until stopped or the deadline passes."""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._sig_r, selectors.EVENT_READ)
+            
+            while self._running:
+                try:
+                    # Update adaptive channel hopping
+                    if self.channel_hopper:
+                        self.channel_hopper.update_adaptive_rate()
                     
-                # Log periodic stats
-                self._log_stats()
+                    # Write buffered GPS track points
+                    self._flush_gps_points()
                 
-                # Check for shutdown conditions
-                if self.power_monitor and self.power_monitor.should_shutdown():
-                    logger.warning("Power critical - initiating shutdown")
-                    self.stop()
-                    break
+                    # Log periodic stats
+                    self._log_stats()
+                
+                    # Check for shutdown using the monitor's last published
+                    # state, so its thresholds stay the only source of truth
+                    if self.power_monitor and self.power_monitor.last_state == "shutdown":
+                        logger.warning("Power critical - initiating shutdown")
+                        self.stop()
+                        break
                     
-            except Exception as e:
-                logger.error(f"Main loop error: {e}")
+                except Exception as e:
+                    logger.error(f"Main loop error: {e}")
                 
-            time.sleep(10)  # Main loop interval
+                # Main loop interval; a signal or stop() wakes the selector early
+                timeout = self.cfg.main_loop_interval
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    timeout = min(timeout, remaining)
+                    
+                if selector.select(timeout=timeout):
+                    self._drain_wakeup_pipe()
+                if self._last_signum is not None:
+                    logger.info(f"Received signal {self._last_signum}, initiating graceful shutdown")
+                    self._last_signum = None
+                    self.stop()
             
     def _on_gps_update(self, position):
         """Handle GPS position update."""
         if position.valid:
-            self._stats["gps_fixes"] += 1
+            self._increment(CNT_GPS)
             
-            # Log to database
-            if self.database and self._session:
-                self.database.insert_gps_point(
-                    self._session.session_id,
+            # Buffer for batched database write
+            with self._gps_lock:
+                self._gps_queue.append((
                     position.latitude,
                     position.longitude,
                     position.altitude,
-                    position.timestamp,
+                    position.speed,
+                    position.heading,
+                    position.fix_quality,
                     position.hdop,
                     position.satellites,
-                )
+                    position.timestamp,
+                ))
+                pending = len(self._gps_queue)
+                
+            if pending >= GPS_FLUSH_THRESHOLD:
+                self._flush_gps_points()
+                
+    def _flush_gps_points(self):
+        """Write buffered GPS track points to the database."""
+        if not self.database or not self._session:
+            return
+            
+        with self._gps_lock:
+            if not self._gps_queue:
+                return
+            points = list(self._gps_queue)
+            self._gps_queue.clear()
+            
+        try:
+            self.database.insert_gps_points_bulk(self._session.session_id, points)
+        except Exception as e:
+            logger.error(f"GPS track write failed ({len(points)} points): {e}")
                 
     def _on_new_device(self, device):
         """Handle new device discovery from Kismet."""
         if device.device_type == "wifi":
-            self._stats["wifi_devices"] += 1
+            self._increment(CNT_WIFI)
         elif device.device_type == "bluetooth":
-            self._stats["bt_devices"] += 1
+            self._increment(CNT_BT)
             
-        # Process through fingerprinting engine
+        # Queue for batched fingerprinting
         if self.fingerprint_engine:
-            self.fingerprint_engine.process_kismet_device(device)
+            with self._fp_batch_lock:
+                self._fp_batch.append(device)
+                full = len(self._fp_batch) >= FP_BATCH_SIZE
+                if not full and self._fp_batch_timer is None:
+                    self._fp_batch_timer = threading.Timer(FP_BATCH_WINDOW, self._flush_fp_batch)
+                    self._fp_batch_timer.daemon = True
+                    self._fp_batch_timer.start()
+                    
+            if full:
+                self._flush_fp_batch()
             
         logger.info(f"New device: {device.device_type} {device.mac} (RSSI: {device.rssi})")
         
+    def _flush_fp_batch(self):
+        """Fingerprint all queued new devices."""
+        with self._fp_batch_lock:
+            if self._fp_batch_timer is not None:
+                self._fp_batch_timer.cancel()
+                self._fp_batch_timer = None
+            batch = self._fp_batch
+            self._fp_batch = []
+            
+        if batch and self.fingerprint_engine:
+            self.fingerprint_engine.process_kismet_devices_batch(batch)
+        
     def _on_device_update(self, device):
         """Handle device update from Kismet."""
         # Could update fingerprint or track movement
@@ -495,56 +868,110 @@ class ScanOrchestrator:
         self.stop()
         
     def _save_state(self):
-        """Save current state for recovery."""
-        if self.database:
-            self.database.flush_buffer()
+        """Save current state for recovery (queued to the writer thread)."""
+        if not self.database:
+            return
+            
+        try:
+            self._writer_q.put_nowait("flush")
+        except queue.Full:
+            logger.warning("Writer queue full - state save skipped")
+            
+    def _writer_loop(self):
+        """Execute queued database writes off the callback threads."""
+        while True:
+            command = self._writer_q.get()
+            try:
+                if command == "stop":
+                    return
+                elif command == "flush":
+                    self.database.flush_buffer()
+                elif command == "update_session":
+                    self.database.update_session(self._session)
+            except Exception as e:
+                logger.error(f"Database writer error ({command}): {e}")
+            finally:
+                self._writer_q.task_done()
+                
+    def _stop_writer(self):
+        """Drain pending writes and stop the writer thread."""
+        if not self._writer_thread:
+            return
+            
+        self._writer_q.put("stop")
+        self._writer_thread.join(timeout=10.0)
+        self._writer_thread = None
+            
+    def _increment(self, counter: int):
+        """Increment a statistics counter."""
+        with self._counter_lock:
+            self._counters[counter] += 1
+            
+    def _counter_snapshot(self) -> array.array:
+        """Get a consistent copy of all statistics counters."""
+        with self._counter_lock:
+            return array.array("Q", self._counters)
             
     def _log_stats(self):
         """Log current statistics."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+            
+        counters = self._counter_snapshot()
         logger.info(
-            f"Stats: WiFi={self._stats['wifi_devices']}, "
-            f"BT={self._stats['bt_devices']}, "
-            f"GPS={self._stats['gps_fixes']}"
+            "Stats: WiFi=%d, BT=%d, GPS=%d",
+            counters[CNT_WIFI],
+            counters[CNT_BT],
+            counters[CNT_GPS],
         )
         
     def stop(self):
-        """Stop scanning and cleanup."""
-        if not self._running:
-            return
+        """
+        Stop scanning and cleanup.
         
+        Safe to call from several threads: the first call tears down and
+        later calls block until it has finished.
+        """
+        with self._stop_lock:
+            running = self._running
+            self._running = False
+            
+        if running:
+            self._shutdown()
+        else:
+            self._stopped.wait()
+            
+        # The wakeup fd can only be reset from the main thread; when stop()
+        # ran on the main loop thread, the caller's own stop() finishes it
+        if threading.current_thread() is threading.main_thread():
+            self._release_wakeup_pipe()
+            
+    def wait_until_stopped(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a running scan has fully stopped.
+        
+        Args:
+            timeout: Seconds to wait (None to wait indefinitely)
+            
+        Returns:
+            True if stopped, False on timeout
+        """
+        return self._stopped.wait(timeout)
+        
+    def _shutdown(self):
+        """Tear down started modules; runs once per stop()."""
         global _active_orchestrator
             
         logger.info("Stopping scan orchestrator...")
-        self._running = False
         self._shutdown_event.set()
+        self._wakeup()
         
-        # Stop modules in reverse order
-        if self.power_monitor:
-            self.power_monitor.stop()
-            
-        if self.tshark:
-            pcap_file = self.tshark.stop_capture()
-            if pcap_file:
-                logger.info(f"Capture saved: {pcap_file}")
-                
-        if self.kismet:
-            self.kismet.stop()
-            
-        if self.gps:
-            self.gps.stop()
-            
-        # Update session
-        if self._session and self.database:
-            self._session.end_time = datetime.now().astimezone()
-            self._session.status = ScanStatus.STOPPED
-            self._session.wifi_device_count = self._stats["wifi_devices"]
-            self._session.bt_device_count = self._stats["bt_devices"]
-            self.database.update_session(self._session)
-            
-        # Flush database
-        if self.database:
-            self.database.flush_buffer()
-            self.database.close()
+        # Stop started modules in reverse start order, then write the
+        # session summary and close the database
+        try:
+            self._exit_stack.close()
+        except Exception as e:
+            logger.error(f"Error during shutdown: {e}")
         
         # Restore WiFi interface to managed mode
         interface = None
@@ -555,15 +982,65 @@ class ScanOrchestrator:
         # Clear global reference
         _active_orchestrator = None
             
-        logger.info("Scan orchestrator stopped")
+        logger.info(f"Scan orchestrator stopped after {self.get_elapsed_seconds():.0f}s")
+        self._stopped.set()
+        
+    def _release_wakeup_pipe(self):
+        """Restore the previous signal wakeup fd and close the pipe."""
+        if self._sig_w < 0:
+            return
+        # The main loop thread must be done with the pipe before it closes
+        main_thread = self._main_thread
+        if main_thread and main_thread is not threading.current_thread():
+            main_thread.join()
+        signal.set_wakeup_fd(self._prev_wakeup_fd)
+        os.close(self._sig_r)
+        os.close(self._sig_w)
+        self._sig_r = self._sig_w = -1
+        
+    def _stop_capture(self):
+        """Stop tshark capture."""
+        pcap_file = self.tshark.stop_capture()
+        if pcap_file:
+            logger.info(f"Capture saved: {pcap_file}")
+            
+    def _finalize_session(self):
+        """Record session end and device counts."""
+        self._session.end_time = datetime.now(self._local_tz)
+        self._session.status = ScanStatus.STOPPED
+        counters = self._counter_snapshot()
+        self._session.wifi_device_count = counters[CNT_WIFI]
+        self._session.bt_device_count = counters[CNT_BT]
+        if self._writer_thread:
+            self._writer_q.put("update_session")
+        else:
+            self.database.update_session(self._session)
+            
+    def _close_database(self):
+        """Flush and close the database."""
+        self.database.flush_buffer()
+        self.database.close()
         
     def get_session_id(self) -> Optional[str]:
         """Get current session ID."""
         return self._session.session_id if self._session else None
         
+    def get_elapsed_seconds(self) -> float:
+        """Get seconds elapsed since the session started (monotonic clock)."""
+        if not self._session_start_ns:
+            return 0.0
+        return (time.monotonic_ns() - self._session_start_ns) / 1e9
+        
     def get_stats(self) -> dict:
         """Get current statistics."""
-        stats = {**self._stats}
+        counters = self._counter_snapshot()
+        stats = {
+            "wifi_devices": counters[CNT_WIFI],
+            "bt_devices": counters[CNT_BT],
+            "packets_captured": counters[CNT_PKT],
+            "gps_fixes": counters[CNT_GPS],
+        }
+        stats["elapsed_seconds"] = round(self.get_elapsed_seconds(), 1)
         
         if self.gps:
             stats["gps"] = self.gps.get_stats()
@@ -614,8 +1091,9 @@ def main():
         
         # If no duration, wait for signal
         if not args.duration:
-            while orchestrator._running:
-                time.sleep(1)
+            # Timed waits keep the main thread responsive to signals
+            while not orchestrator.wait_until_stopped(timeout=1):
+                pass
                 
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
@@ -4,13 +4,14 @@ Project Airdump - Scanner Modules
 Capture layer for WiFi, Bluetooth, GPS, and RF data.
 """
 
-from .gps_logger import GPSLogger, MockGPSLogger
+from .gps_logger import GPSLogger, MockGPSLogger, BatchedCallback
 from .kismet_controller import KismetController, ChannelHopper
 from .tshark_capture import TsharkCapture, LivePacketParser
 
 __all__ = [
     "GPSLogger",
     "MockGPSLogger",
+    "BatchedCallback",
     "KismetController",
     "ChannelHopper",
     "TsharkCapture",
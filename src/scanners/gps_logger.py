@@ -5,12 +5,18 @@ Real-time GPS position tracking via gpsd daemon.
 Provides position data for tagging all wireless detections.
 """
 
+import collections
+import itertools
+import json
 import logging
-import time
+import queue
+import random
+import selectors
+import socket
 import threading
 from datetime import datetime
-from typing import Optional, Callable, List, Tuple
-from dataclasses import dataclass
+from typing import Deque, Iterator, Optional, Callable, List, Tuple
+from dataclasses import dataclass, fields
 
 logger = logging.getLogger(__name__)
 
@@ -22,10 +28,36 @@ except ImportError:
     GPSD_AVAILABLE = False
     logger.warning("gpsd-py3 not installed - GPS features disabled")
 
+# Optional fast JSON backend
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Sent once on connect to make gpsd push JSON reports as they arrive
+GPSD_WATCH_COMMAND = b'?WATCH={"enable":true,"json":true}\n'
+
+# Maximum positions handed to callbacks in one dispatch
+CALLBACK_BATCH_SIZE = 32
+
+# Hop modes indexed by how many speed thresholds are exceeded
+HOP_MODES = ("slow", "adaptive", "fast")
+
+# Speed change (m/s) needed before a hop mode decision is recomputed
+HOP_MODE_HYSTERESIS = 0.5
+
+# Evicted history positions kept for reuse when reuse_positions is set
+POSITION_POOL_SIZE = 16
+
+# Reconnect delay bounds (seconds); doubles on each consecutive failure
+RECONNECT_BACKOFF_MIN = 1.0
+RECONNECT_BACKOFF_MAX = 30.0
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GPSPosition:
-    """GPS position with quality metrics."""
+    """GPS position with quality metrics (immutable once published)."""
     
     latitude: float
     longitude: float
@@ -48,7 +80,7 @@ class GPSPosition:
             "latitude": self.latitude,
             "longitude": self.longitude,
             "altitude": self.altitude,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "timestamp": self.timestamp.isoformat(),
             "speed": self.speed,
             "heading": self.heading,
             "hdop": self.hdop,
@@ -57,16 +89,56 @@ class GPSPosition:
             "valid": self.valid,
         }
         
+    def to_json_bytes(self) -> bytes:
+        """Serialize to compact JSON (same keys as to_dict)."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self)
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode()
+        
     @classmethod
     def invalid(cls) -> "GPSPosition":
-        """Return an invalid position placeholder."""
-        return cls(
-            latitude=0.0,
-            longitude=0.0,
-            altitude=0.0,
-            timestamp=datetime.utcnow(),
-            valid=False,
-        )
+        """Return the shared invalid position placeholder."""
+        return _INVALID_POSITION
+
+
+# Placeholder timestamp for positions without a fix
+_NO_FIX_TIME = datetime(1970, 1, 1)
+
+_INVALID_POSITION = GPSPosition(
+    latitude=0.0,
+    longitude=0.0,
+    altitude=0.0,
+    timestamp=_NO_FIX_TIME,
+    valid=False,
+)
+
+_NO_FIX_TUPLE = _INVALID_POSITION.to_tuple()
+
+_POSITION_FIELDS = tuple(f.name for f in fields(GPSPosition))
+
+
+class BatchedCallback:
+    """
+    Adapter for GPS consumers that prefer positions in batches.
+    
+    Registered like any other callback; the dispatcher calls on_batch()
+    with every position that queued up while the previous dispatch ran.
+    """
+    
+    def __init__(self, func: Callable[[List[GPSPosition]], None]):
+        """
+        Args:
+            func: Called with a list of positions
+        """
+        self.func = func
+        
+    def on_batch(self, positions: List[GPSPosition]):
+        """Deliver a batch of positions."""
+        self.func(positions)
+        
+    def __call__(self, position: GPSPosition):
+        """Deliver a single position."""
+        self.func([position])
 
 
 class GPSLogger:
@@ -75,6 +147,10 @@ class GPSLogger:
     
     Continuously polls gpsd and maintains current position.
     Supports position history buffering and track logging.
+    
+    Only the polling thread assigns ``_current_position`` and it never
+    mutates a published GPSPosition, so readers take the reference
+    without locking. ``_lock`` guards the history and fix counters.
     """
     
     def __init__(
@@ -85,6 +161,8 @@ class GPSLogger:
         history_size: int = 100,
         min_hdop: float = 10.0,
         min_satellites: int = 4,
+        use_streaming: bool = False,
+        reuse_positions: bool = False,
     ):
         """
         Initialize GPS logger.
@@ -96,21 +174,50 @@ class GPSLogger:
             history_size: Number of positions to keep in buffer
             min_hdop: Maximum HDOP to consider fix valid
             min_satellites: Minimum satellites for valid fix
+            use_streaming: Read gpsd's JSON watch stream instead of polling
+            reuse_positions: Recycle positions evicted from history for new
+                fixes. Saves allocations on long high-rate tracks, but
+                positions from get_history() or callbacks are overwritten
+                once history_size newer fixes arrive, so consumers must copy
+                anything they keep.
         """
         self.host = host
         self.port = port
         self.poll_interval = poll_interval
         self.history_size = history_size
-        self.min_hdop = min_hdop
-        self.min_satellites = min_satellites
+        # Coerced once so per-fix validation compares like types
+        self.min_hdop = float(min_hdop)
+        self.min_satellites = int(min_satellites)
+        self.use_streaming = use_streaming
+        self._position_pool: Optional[Deque[GPSPosition]] = (
+            collections.deque(maxlen=POSITION_POOL_SIZE) if reuse_positions else None
+        )
         
         self._current_position: Optional[GPSPosition] = None
-        self._position_history: List[GPSPosition] = []
+        self._position_history: Deque[GPSPosition] = collections.deque(maxlen=history_size)
         self._lock = threading.Lock()
+        self._fix_event = threading.Event()  # Set while the latest position is valid
         self._running = False
+        self._stop_event = threading.Event()
+        self._backoff = RECONNECT_BACKOFF_MIN
         self._thread: Optional[threading.Thread] = None
         self._connected = False
-        self._callbacks: List[Callable[[GPSPosition], None]] = []
+        # Copy-on-write so dispatch reads it without locking
+        self._callbacks: Tuple[Callable[[GPSPosition], None], ...] = ()
+        self._callback_queue: "queue.SimpleQueue[Optional[GPSPosition]]" = queue.SimpleQueue()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        
+        # Streaming mode state
+        self._sock: Optional[socket.socket] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._sky: dict = {}
+        
+        # (packet type, has altitude, has speed, has movement, has mode),
+        # probed once since gpsd packets are all the same type
+        self._packet_caps: Optional[tuple] = None
+        
+        # (speed, fast_threshold, slow_threshold, mode) of last hop decision
+        self._last_hop: Optional[tuple] = None
         
         # Statistics
         self._fix_count = 0
@@ -124,6 +231,9 @@ class GPSLogger:
         Returns:
             True if connection successful
         """
+        if self.use_streaming:
+            return self._open_stream()
+            
         if not GPSD_AVAILABLE:
             logger.error("gpsd library not available")
             return False
@@ -154,6 +264,12 @@ class GPSLogger:
                 return False
                 
         self._running = True
+        self._stop_event.clear()
+        # Callbacks run off the poll thread so a slow consumer can't delay fixes
+        self._dispatch_thread = threading.Thread(
+            target=self._dispatch_loop, name="gps-callbacks", daemon=True
+        )
+        self._dispatch_thread.start()
         self._thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
         logger.info("GPS polling started")
@@ -162,60 +278,286 @@ class GPSLogger:
     def stop(self):
         """Stop GPS polling thread."""
         self._running = False
+        self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=5.0)
             self._thread = None
+        if self._dispatch_thread:
+            self._callback_queue.put(None)
+            self._dispatch_thread.join(timeout=5.0)
+            self._dispatch_thread = None
+        self._close_stream()
         logger.info("GPS polling stopped")
         
+    def _open_stream(self) -> bool:
+        """
+        Open a socket to gpsd and enable the JSON watch stream.
+        
+        Returns:
+            True if the stream was opened
+        """
+        self._close_stream()
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=5.0)
+            sock.sendall(GPSD_WATCH_COMMAND)
+            sock.setblocking(False)
+        except OSError as e:
+            logger.error(f"Failed to open gpsd stream: {e}")
+            self._connected = False
+            return False
+            
+        self._sock = sock
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sock, selectors.EVENT_READ)
+        self._connected = True
+        logger.info(f"Streaming from gpsd at {self.host}:{self.port}")
+        return True
+        
+    def _close_stream(self):
+        """Close the gpsd stream socket if open."""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+            self._connected = False
+            
     def _poll_loop(self):
         """Main polling loop (runs in separate thread)."""
+        if self.use_streaming:
+            self._stream_loop()
+            return
+            
         while self._running:
             try:
                 self._update_position()
             except Exception as e:
                 logger.error(f"GPS poll error: {e}")
-                # Try to reconnect
-                time.sleep(2.0)
-                self.connect()
+                self._reconnect()
+            else:
+                self._backoff = RECONNECT_BACKOFF_MIN
+                self._stop_event.wait(self.poll_interval)
+                
+    def _reconnect(self) -> bool:
+        """
+        Wait out the current backoff, then reconnect to gpsd.
+        
+        Returns:
+            True if reconnected
+        """
+        if self._stop_event.wait(self._backoff):
+            return False
+        self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+        return self.connect()
+            
+    def _stream_loop(self):
+        """Read gpsd reports as they arrive (runs in separate thread)."""
+        buf = b""
+        while self._running:
+            if self._sock is None:
+                self._reconnect()
+                buf = b""
+                continue
+                
+            # Wake on incoming data, or periodically to notice stop()
+            if not self._selector.select(timeout=1.0):
+                continue
+                
+            try:
+                data = self._sock.recv(65536)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                logger.error(f"GPS stream error: {e}")
+                data = b""
+                
+            if not data:
+                logger.warning("gpsd stream closed, reconnecting")
+                self._close_stream()
+                continue
                 
-            time.sleep(self.poll_interval)
+            self._backoff = RECONNECT_BACKOFF_MIN
+            buf += data
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if line:
+                    self._handle_report(line)
+                    
+    def _handle_report(self, line: bytes):
+        """
+        Handle one JSON report line from the gpsd stream.
+        
+        Args:
+            line: Raw report without trailing newline
+        """
+        try:
+            report = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+        except ValueError:
+            logger.debug("Malformed gpsd report: %r", line[:80])
+            return
             
+        cls = report.get("class")
+        if cls == "SKY":
+            # Satellite/DOP info arrives separately; keep latest for TPV parsing
+            self._sky = report
+        elif cls == "TPV":
+            self._publish_position(self._parse_tpv_report(report))
+            
+    def _parse_tpv_report(self, tpv: dict) -> GPSPosition:
+        """
+        Parse a gpsd TPV report into GPSPosition.
+        
+        Args:
+            tpv: Decoded TPV report
+            
+        Returns:
+            GPSPosition object
+        """
+        mode = tpv.get("mode", 0)
+        lat = tpv.get("lat")
+        lon = tpv.get("lon")
+        if mode < 2 or lat is None or lon is None:
+            return GPSPosition.invalid()
+            
+        sky = self._sky
+        hdop = sky.get("hdop")
+        if hdop is None:
+            # No SKY yet: fall back to the TPV error estimate, as gpsd-py3 does
+            hdop = max(tpv.get("epx", 99.0), tpv.get("epy", 99.0))
+        satellites = sky.get("uSat")
+        if satellites is None:
+            satellites = sum(1 for s in sky.get("satellites") or () if s.get("used"))
+            
+        valid = (
+            hdop <= self.min_hdop and
+            satellites >= self.min_satellites
+        )
+        
+        return self._new_position(
+            lat,
+            lon,
+            tpv.get("altMSL", tpv.get("alt", 0.0)),
+            datetime.utcnow(),
+            tpv.get("speed", 0.0),
+            tpv.get("track", 0.0),
+            hdop,
+            1,
+            satellites,
+            valid,
+        )
+        
+    def _new_position(self, *values) -> GPSPosition:
+        """
+        Build a GPSPosition, reusing a pooled instance if available.
+        
+        Args:
+            values: Field values in GPSPosition field order
+            
+        Returns:
+            GPSPosition object
+        """
+        pool = self._position_pool
+        if not pool:
+            return GPSPosition(*values)
+        position = pool.pop()
+        for name, value in zip(_POSITION_FIELDS, values):
+            object.__setattr__(position, name, value)
+        return position
+        
     def _update_position(self):
         """Fetch current position from gpsd."""
         if not GPSD_AVAILABLE:
             return
             
+        # Connection errors propagate so _poll_loop can reconnect
+        packet = gpsd.get_current()
+        
         try:
-            packet = gpsd.get_current()
-            
             # Parse position from gpsd packet
             position = self._parse_gpsd_packet(packet)
-            
-            with self._lock:
-                self._current_position = position
-                
-                # Add to history if valid
-                if position.valid:
-                    self._position_history.append(position)
-                    # Trim history to max size
-                    if len(self._position_history) > self.history_size:
-                        self._position_history = self._position_history[-self.history_size:]
-                    
-                    self._fix_count += 1
-                    self._last_fix_time = position.timestamp
-                else:
-                    self._no_fix_count += 1
-                    
-            # Notify callbacks
-            for callback in self._callbacks:
-                try:
-                    callback(position)
-                except Exception as e:
-                    logger.error(f"GPS callback error: {e}")
+            self._publish_position(position)
                     
         except Exception as e:
-            logger.debug(f"GPS update failed: {e}")
+            logger.debug("GPS update failed: %s", e)
             
+    def _publish_position(self, position: GPSPosition):
+        """
+        Store a new position and notify callbacks.
+        
+        Args:
+            position: Parsed position (valid or not)
+        """
+        self._current_position = position
+        if position.valid:
+            self._fix_event.set()
+        else:
+            self._fix_event.clear()
+        
+        with self._lock:
+            # Add to history if valid
+            if position.valid:
+                history = self._position_history
+                if self._position_pool is not None and len(history) == history.maxlen:
+                    self._position_pool.append(history[0])
+                history.append(position)
+                
+                self._fix_count += 1
+                self._last_fix_time = position.timestamp
+            else:
+                self._no_fix_count += 1
+                
+        # Notify callbacks
+        callbacks = self._callbacks
+        if not callbacks:
+            return
+        if self._dispatch_thread is None:
+            self._dispatch_callbacks(callbacks, [position])
+        else:
+            self._callback_queue.put(position)
+            
+    def _dispatch_loop(self):
+        """Deliver queued positions to callbacks (runs in separate thread)."""
+        q = self._callback_queue
+        while True:
+            position = q.get()
+            if position is None:
+                return
+                
+            # Take whatever else is already waiting; never wait for more
+            batch = [position]
+            stop = False
+            while len(batch) < CALLBACK_BATCH_SIZE:
+                try:
+                    position = q.get_nowait()
+                except queue.Empty:
+                    break
+                if position is None:
+                    stop = True
+                    break
+                batch.append(position)
+                
+            self._dispatch_callbacks(self._callbacks, batch)
+            if stop:
+                return
+                
+    @staticmethod
+    def _dispatch_callbacks(callbacks: tuple, positions: List[GPSPosition]):
+        """Deliver positions to each callback, logging failures."""
+        for callback in callbacks:
+            try:
+                if isinstance(callback, BatchedCallback):
+                    callback.on_batch(positions)
+                else:
+                    for position in positions:
+                        callback(position)
+            except Exception as e:
+                logger.error(f"GPS callback error: {e}")
+                
+
     def _parse_gpsd_packet(self, packet) -> GPSPosition:
         """
         Parse gpsd packet into GPSPosition.
@@ -226,31 +568,45 @@ class GPSLogger:
         Returns:
             GPSPosition object
         """
+        caps = self._packet_caps
+        if caps is None or caps[0] is not type(packet):
+            caps = self._packet_caps = (
+                type(packet),
+                hasattr(packet, 'altitude'),
+                hasattr(packet, 'speed'),
+                hasattr(packet, 'movement'),
+                hasattr(packet, 'mode'),
+            )
+        _, has_altitude, has_speed, has_movement, has_mode = caps
+        
         try:
             # Get position (may raise NoFixError)
             lat, lon = packet.position()
-            alt = packet.altitude() if hasattr(packet, 'altitude') else 0.0
+            alt = packet.altitude() if has_altitude else 0.0
             
             # Get additional data
-            speed = packet.speed() if hasattr(packet, 'speed') else 0.0
-            heading = packet.movement().get('track', 0.0) if hasattr(packet, 'movement') else 0.0
+            speed = packet.speed() if has_speed else 0.0
+            heading = packet.movement().get('track', 0.0) if has_movement else 0.0
             
             # Get precision info
             try:
                 precision = packet.position_precision()
                 hdop = precision[0] if precision else 99.0
-            except:
+            except (AttributeError, KeyError):
                 hdop = 99.0
                 
-            # Get satellite count
+            # Get satellite count (gpsd-py3 reports counts, not a sat list)
             try:
                 sats = packet.sats
-                satellites = len([s for s in sats if s.used]) if sats else 0
-            except:
+                if isinstance(sats, int):
+                    satellites = getattr(packet, 'sats_valid', sats)
+                else:
+                    satellites = sum(1 for s in sats if s.used) if sats else 0
+            except (AttributeError, TypeError):
                 satellites = 0
                 
             # Determine fix quality
-            mode = packet.mode if hasattr(packet, 'mode') else 0
+            mode = packet.mode if has_mode else 0
             fix_quality = 1 if mode >= 2 else 0  # 2D or 3D fix
             
             # Validate fix
@@ -260,23 +616,23 @@ class GPSLogger:
                 mode >= 2
             )
             
-            return GPSPosition(
-                latitude=lat,
-                longitude=lon,
-                altitude=alt,
-                timestamp=datetime.utcnow(),
-                speed=speed,
-                heading=heading,
-                hdop=hdop,
-                fix_quality=fix_quality,
-                satellites=satellites,
-                valid=valid,
+            return self._new_position(
+                lat,
+                lon,
+                alt,
+                datetime.utcnow(),
+                speed,
+                heading,
+                hdop,
+                fix_quality,
+                satellites,
+                valid,
             )
             
         except gpsd.NoFixError:
             return GPSPosition.invalid()
         except Exception as e:
-            logger.debug(f"Parse error: {e}")
+            logger.debug("Parse error: %s", e)
             return GPSPosition.invalid()
             
     def get_current_position(self) -> Tuple[float, float, float, datetime]:
@@ -285,12 +641,12 @@ class GPSLogger:
         
         Returns:
             Tuple of (latitude, longitude, altitude, timestamp)
-            Returns (0, 0, 0, now) if no valid fix
+            Returns (0, 0, 0, 1970-01-01) if no valid fix
         """
-        with self._lock:
-            if self._current_position and self._current_position.valid:
-                return self._current_position.to_tuple()
-            return (0.0, 0.0, 0.0, datetime.utcnow())
+        pos = self._current_position
+        if pos and pos.valid:
+            return pos.to_tuple()
+        return _NO_FIX_TUPLE
             
     def get_position(self) -> Optional[GPSPosition]:
         """
@@ -299,8 +655,7 @@ class GPSLogger:
         Returns:
             GPSPosition or None if no data
         """
-        with self._lock:
-            return self._current_position
+        return self._current_position
             
     def get_history(self, count: Optional[int] = None) -> List[GPSPosition]:
         """
@@ -313,14 +668,33 @@ class GPSLogger:
             List of GPSPosition objects
         """
         with self._lock:
+            history = self._position_history
             if count:
-                return self._position_history[-count:]
-            return self._position_history.copy()
+                return list(itertools.islice(history, max(len(history) - count, 0), None))
+            return list(history)
+            
+    def get_history_iter(self, count: Optional[int] = None) -> Iterator[GPSPosition]:
+        """
+        Iterate over position history, oldest first.
+        
+        Iterates a snapshot, so callers that only walk the track once
+        (exports) skip building a list.
+        
+        Args:
+            count: Number of recent positions (None for all)
+            
+        Returns:
+            Iterator of GPSPosition objects
+        """
+        with self._lock:
+            snapshot = tuple(self._position_history)
+        start = max(len(snapshot) - count, 0) if count else 0
+        return itertools.islice(snapshot, start, None)
             
     def has_fix(self) -> bool:
         """Check if we currently have a valid GPS fix."""
-        with self._lock:
-            return self._current_position is not None and self._current_position.valid
+        pos = self._current_position
+        return pos is not None and pos.valid
             
     def get_stats(self) -> dict:
         """
@@ -329,9 +703,9 @@ class GPSLogger:
         Returns:
             Dictionary with fix stats
         """
+        has_fix = self.has_fix()
         with self._lock:
             total = self._fix_count + self._no_fix_count
-            has_fix = self._current_position is not None and self._current_position.valid
             return {
                 "connected": self._connected,
                 "running": self._running,
@@ -350,12 +724,16 @@ class GPSLogger:
         Args:
             callback: Function to call with each GPSPosition
         """
-        self._callbacks.append(callback)
+        with self._lock:
+            self._callbacks = self._callbacks + (callback,)
         
     def unregister_callback(self, callback: Callable[[GPSPosition], None]):
         """Remove a callback."""
-        if callback in self._callbacks:
-            self._callbacks.remove(callback)
+        with self._lock:
+            if callback in self._callbacks:
+                callbacks = list(self._callbacks)
+                callbacks.remove(callback)
+                self._callbacks = tuple(callbacks)
             
     def wait_for_fix(self, timeout: float = 60.0) -> bool:
         """
@@ -367,12 +745,7 @@ class GPSLogger:
         Returns:
             True if fix acquired
         """
-        start = time.time()
-        while time.time() - start < timeout:
-            if self.has_fix():
-                return True
-            time.sleep(0.5)
-        return False
+        return self._fix_event.wait(timeout=timeout)
         
     def get_velocity(self) -> Tuple[float, float]:
         """
@@ -381,10 +754,10 @@ class GPSLogger:
         Returns:
             Tuple of (speed in m/s, heading in degrees)
         """
-        with self._lock:
-            if self._current_position and self._current_position.valid:
-                return (self._current_position.speed, self._current_position.heading)
-            return (0.0, 0.0)
+        pos = self._current_position
+        if pos and pos.valid:
+            return (pos.speed, pos.heading)
+        return (0.0, 0.0)
             
     def estimate_channel_hop_mode(
         self,
@@ -403,12 +776,18 @@ class GPSLogger:
         """
         speed, _ = self.get_velocity()
         
-        if speed >= fast_threshold:
-            return "fast"
-        elif speed <= slow_threshold:
-            return "slow"
-        else:
-            return "adaptive"
+        last = self._last_hop
+        if (
+            last is not None
+            and abs(speed - last[0]) < HOP_MODE_HYSTERESIS
+            and last[1] == fast_threshold
+            and last[2] == slow_threshold
+        ):
+            return last[3]
+            
+        mode = HOP_MODES[(speed > slow_threshold) + (speed >= fast_threshold)]
+        self._last_hop = (speed, fast_threshold, slow_threshold, mode)
+        return mode
 
 
 class MockGPSLogger(GPSLogger):
@@ -419,6 +798,7 @@ class MockGPSLogger(GPSLogger):
         base_lat: float = 51.5074,
         base_lon: float = -0.1278,
         base_alt: float = 50.0,
+        seed: Optional[int] = None,
         **kwargs
     ):
         """
@@ -428,11 +808,13 @@ class MockGPSLogger(GPSLogger):
             base_lat: Base latitude
             base_lon: Base longitude
             base_alt: Base altitude
+            seed: Seed for the position jitter (None for random)
         """
         super().__init__(**kwargs)
         self.base_lat = base_lat
         self.base_lon = base_lon
         self.base_alt = base_alt
+        self._rng = random.Random(seed)
         self._mock_position = GPSPosition(
             latitude=base_lat,
             longitude=base_lon,
@@ -452,29 +834,28 @@ class MockGPSLogger(GPSLogger):
         
     def _update_position(self):
         """Update mock position with slight variation."""
-        import random
+        uniform = self._rng.uniform
         
         # Add small random variation
-        lat_offset = random.uniform(-0.0001, 0.0001)
-        lon_offset = random.uniform(-0.0001, 0.0001)
+        lat_offset = uniform(-0.0001, 0.0001)
+        lon_offset = uniform(-0.0001, 0.0001)
         
         self._mock_position = GPSPosition(
             latitude=self.base_lat + lat_offset,
             longitude=self.base_lon + lon_offset,
-            altitude=self.base_alt + random.uniform(-1, 1),
+            altitude=self.base_alt + uniform(-1, 1),
             timestamp=datetime.utcnow(),
-            speed=random.uniform(0, 15),
-            heading=random.uniform(0, 360),
-            hdop=random.uniform(0.8, 2.0),
+            speed=uniform(0, 15),
+            heading=uniform(0, 360),
+            hdop=uniform(0.8, 2.0),
             fix_quality=1,
-            satellites=random.randint(6, 12),
+            satellites=self._rng.randint(6, 12),
             valid=True,
         )
         
+        self._current_position = self._mock_position
+        self._fix_event.set()
         with self._lock:
-            self._current_position = self._mock_position
             self._position_history.append(self._mock_position)
-            if len(self._position_history) > self.history_size:
-                self._position_history = self._position_history[-self.history_size:]
             self._fix_count += 1
             self._last_fix_time = self._mock_position.timestamp
@@ -4,19 +4,68 @@ Project Airdump - Kismet Controller
 Interface to Kismet's REST API for WiFi and Bluetooth device discovery.
 """
 
+import functools
+import json
 import logging
+import socket
 import time
 import threading
 import requests
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Iterator, Sequence, Tuple
 from dataclasses import dataclass, field
-from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
 logger = logging.getLogger(__name__)
 
+# Optional fast JSON backend for large device lists
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# Optional streaming JSON decoder, caps memory on large device lists
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Kismet base types _parse_device classifies, as a regex alternation
+TRACKED_DEVICE_TYPES = "Wi-Fi Device|BR/EDR|BTLE"
+BLUETOOTH_DEVICE_TYPES = "BR/EDR|BTLE"
+
+# Kismet base type -> device_type / Bluetooth bt_type
+_TYPE_MAP = {"Wi-Fi Device": "wifi", "BR/EDR": "bluetooth", "BTLE": "bluetooth"}
+_BT_SUBTYPE = {"BR/EDR": "classic", "BTLE": "ble"}
+
+# Kismet times are whole seconds, and within a poll many devices share the
+# same few values, so converted datetimes (immutable) are memoized
+_datetime_from_epoch = functools.lru_cache(maxsize=4096)(datetime.fromtimestamp)
+
+# Concurrent connections kept open to Kismet (poller, hopper, orchestrator)
+HTTP_POOL_SIZE = 4
+
+# Header for pre-serialized JSON bodies (merged with session headers)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Smallest adaptive hop rate change (hops/second) worth sending to Kismet
+ADAPTIVE_RATE_STEP = 0.5
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive on pooled sockets."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+@dataclass(slots=True)
 class KismetDevice:
     """Device discovered by Kismet."""
     
@@ -63,6 +112,12 @@ class KismetDevice:
             "kismet_key": self.kismet_key,
             "packets": self.packets,
         }
+        
+    def to_json_bytes(self) -> bytes:
+        """Serialize to compact JSON (same keys as to_dict)."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self)
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode()
 
 
 class KismetController:
@@ -75,6 +130,32 @@ class KismetController:
     - Manage data sources (interfaces)
     """
     
+    # Device fields requested from Kismet
+    _DEVICE_FIELDS = (
+        "kismet.device.base.macaddr",
+        "kismet.device.base.name",
+        "kismet.device.base.type",
+        "kismet.device.base.first_time",
+        "kismet.device.base.last_time",
+        "kismet.device.base.channel",
+        "kismet.device.base.frequency",
+        "kismet.device.base.signal/kismet.common.signal.last_signal",
+        "kismet.device.base.manuf",
+        "kismet.device.base.packets.total",
+        "kismet.device.base.key",
+        "dot11.device/dot11.device.last_beaconed_ssid",
+        "dot11.device/dot11.device.probed_ssid_map",
+        "dot11.device/dot11.device.wpa_present_handshake",
+    )
+    
+    # Unfiltered device query body, serialized once
+    _BASE_DEVICE_BODY = json.dumps({"fields": _DEVICE_FIELDS}).encode()
+    # Poll query body: projection and type selection both done by Kismet
+    _TRACKED_DEVICE_BODY = json.dumps({
+        "fields": _DEVICE_FIELDS,
+        "regex": [["kismet.device.base.type", TRACKED_DEVICE_TYPES]],
+    }).encode()
+    
     def __init__(
         self,
         host: str = "localhost",
@@ -103,17 +184,38 @@ class KismetController:
         
         self._session = requests.Session()
         self._session.auth = (username, password)
+        # Constant per controller, so set once rather than per request
+        if api_token:
+            self._session.headers["KISMET"] = api_token
+        # Single host, so one pool sized for the threads that share it
+        self._session.mount(
+            "http://",
+            _KeepAliveAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE),
+        )
         
         self._running = False
+        self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
         
-        # Device tracking
+        # Device tracking. Readers take the current dict without locking;
+        # the poller updates a copy under _lock and swaps it in.
         self._devices: Dict[str, KismetDevice] = {}
-        self._new_device_callbacks: List[Callable[[KismetDevice], None]] = []
-        self._device_update_callbacks: List[Callable[[KismetDevice], None]] = []
-        
-        # Last timestamp for incremental updates
+        # (devices dict, its size, wifi count, bluetooth count), kept in step
+        # by the poller so get_device_count needn't scan every device
+        self._device_counts: tuple = (self._devices, 0, 0, 0)
+        # MAC -> hash of fields that change on activity; unchanged devices
+        # are skipped without parsing (poll thread only)
+        self._device_sig: Dict[str, int] = {}
+        # Copy-on-write so the poller reads them without locking
+        self._new_device_callbacks: Tuple[Callable[[KismetDevice], None], ...] = ()
+        self._device_update_callbacks: Tuple[Callable[[KismetDevice], None], ...] = ()
+        
+        # Newest Kismet last_time seen (server clock) for incremental updates
+        self._server_last_time: int = 0
+        # Monotonic start of the last poll, for scheduling only
+        self._last_poll_mono: float = 0.0
+        # Wall-clock time of the last completed poll (informational)
         self._last_poll_time: Optional[float] = None
         
     def _api_request(
@@ -122,6 +224,8 @@ class KismetController:
         method: str = "GET",
         json_data: Optional[dict] = None,
         params: Optional[dict] = None,
+        data: Optional[bytes] = None,
+        stream: bool = False,
     ) -> Optional[Any]:
         """
         Make API request to Kismet.
@@ -131,30 +235,40 @@ class KismetController:
             method: HTTP method
             json_data: JSON body data
             params: Query parameters
+            data: Pre-serialized JSON body (used instead of json_data)
+            stream: Return the unread Response for the caller to consume
+                and close, instead of decoded JSON
             
         Returns:
-            Response JSON or None on error
+            Response JSON (or Response if stream) or None on error
         """
-        url = urljoin(self.base_url, endpoint)
+        # Endpoints are absolute paths and base_url has none, so this
+        # matches urljoin without reparsing both on every request
+        url = self.base_url + endpoint
         
-        headers = {}
-        if self.api_token:
-            headers["KISMET"] = self.api_token
-            
         try:
             if method == "GET":
-                resp = self._session.get(url, params=params, headers=headers, timeout=10)
+                resp = self._session.get(url, params=params, timeout=10)
+            elif method == "POST" and data is not None:
+                resp = self._session.post(
+                    url, data=data, headers=_JSON_HEADERS, timeout=10, stream=stream
+                )
             elif method == "POST":
-                resp = self._session.post(url, json=json_data, headers=headers, timeout=10)
+                resp = self._session.post(
+                    url, json=json_data, timeout=10, stream=stream
+                )
             else:
                 logger.error(f"Unsupported HTTP method: {method}")
                 return None
                 
             resp.raise_for_status()
-            
+            if stream:
+                return resp
+                
             # Try to parse JSON
-            if resp.content:
-                return resp.json()
+            content = resp.content
+            if content:
+                return orjson.loads(content) if ORJSON_AVAILABLE else resp.json()
             return {}
             
         except requests.exceptions.ConnectionError:
@@ -222,7 +336,7 @@ class KismetController:
     def set_hop_channels(
         self,
         source_uuid: str,
-        channels: List[str],
+        channels: Sequence[str],
         rate: float = 5.0,
     ) -> bool:
         """
@@ -271,45 +385,79 @@ class KismetController:
         Get list of discovered devices.
         
         Args:
-            device_type: Filter by type ("Wi-Fi Device", "BR/EDR", "BTLE")
+            device_type: Filter by type ("Wi-Fi Device", "BR/EDR", "BTLE"),
+                or a regex alternation of them ("BR/EDR|BTLE")
             last_time: Only devices active since this timestamp
             
         Returns:
             List of device dictionaries
         """
-        # Build filter for device query
-        fields = [
-            "kismet.device.base.macaddr",
-            "kismet.device.base.name",
-            "kismet.device.base.type",
-            "kismet.device.base.first_time",
-            "kismet.device.base.last_time",
-            "kismet.device.base.channel",
-            "kismet.device.base.frequency",
-            "kismet.device.base.signal/kismet.common.signal.last_signal",
-            "kismet.device.base.manuf",
-            "kismet.device.base.packets.total",
-            "kismet.device.base.key",
-            "dot11.device/dot11.device.last_beaconed_ssid",
-            "dot11.device/dot11.device.probed_ssid_map",
-            "dot11.device/dot11.device.wpa_present_handshake",
-        ]
+        endpoint, body = self._device_query(device_type, last_time)
+        result = self._api_request(
+            endpoint,
+            method="POST",
+            data=body,
+        )
         
-        json_data = {"fields": fields}
+        return result if result else []
         
-        if device_type:
-            json_data["regex"] = [["kismet.device.base.type", device_type]]
+    def _device_query(
+        self,
+        device_type: Optional[str],
+        last_time: Optional[float],
+    ) -> Tuple[str, bytes]:
+        """
+        Build endpoint and body for a device query.
+        
+        Returns:
+            Tuple of (endpoint, serialized JSON body)
+        """
+        # Build filter for device query; the common bodies are prebuilt
+        if not device_type:
+            body = self._BASE_DEVICE_BODY
+        elif device_type == TRACKED_DEVICE_TYPES:
+            body = self._TRACKED_DEVICE_BODY
+        else:
+            body = json.dumps({
+                "fields": self._DEVICE_FIELDS,
+                "regex": [["kismet.device.base.type", device_type]],
+            }).encode()
             
+        # Time-windowed view: Kismet only returns devices seen since last_time.
+        # Regex terms are ORed, so the window can't be expressed as one.
         if last_time:
-            json_data["last_time"] = int(last_time)
+            endpoint = f"/devices/last-time/{int(last_time)}/devices.json"
+        else:
+            endpoint = "/devices/views/all/devices.json"
             
-        result = self._api_request(
-            "/devices/views/all/devices.json",
-            method="POST",
-            json_data=json_data,
-        )
+        return endpoint, body
         
-        return result if result else []
+    def _iter_devices(self, last_time: Optional[float] = None) -> Iterator[dict]:
+        """
+        Iterate WiFi and Bluetooth devices.
+        
+        With ijson installed the response is decoded one device at a
+        time instead of materializing the whole list.
+        
+        Args:
+            last_time: Only devices active since this timestamp
+            
+        Returns:
+            Iterator of device dictionaries
+        """
+        if not IJSON_AVAILABLE:
+            yield from self.get_all_devices_raw(last_time=last_time)
+            return
+            
+        endpoint, body = self._device_query(TRACKED_DEVICE_TYPES, last_time)
+        resp = self._api_request(endpoint, method="POST", data=body, stream=True)
+        if resp is None:
+            return
+        try:
+            resp.raw.decode_content = True
+            yield from ijson.items(resp.raw, "item", use_float=True)
+        finally:
+            resp.close()
         
     def get_wifi_devices(self, last_time: Optional[float] = None) -> List[dict]:
         """Get WiFi devices only."""
@@ -317,10 +465,11 @@ class KismetController:
         
     def get_bluetooth_devices(self, last_time: Optional[float] = None) -> List[dict]:
         """Get Bluetooth devices (classic and BLE)."""
-        # Get both BR/EDR and BTLE devices
-        bredr = self.get_devices(device_type="BR/EDR", last_time=last_time)
-        btle = self.get_devices(device_type="BTLE", last_time=last_time)
-        return bredr + btle
+        return self.get_devices(device_type=BLUETOOTH_DEVICE_TYPES, last_time=last_time)
+        
+    def get_all_devices_raw(self, last_time: Optional[float] = None) -> List[dict]:
+        """Get WiFi and Bluetooth devices in a single query."""
+        return self.get_devices(device_type=TRACKED_DEVICE_TYPES, last_time=last_time)
         
     def _parse_device(self, raw: dict) -> KismetDevice:
         """
@@ -332,52 +481,48 @@ class KismetController:
         Returns:
             KismetDevice object
         """
-        mac = raw.get("kismet.device.base.macaddr", "00:00:00:00:00:00")
-        dev_type = raw.get("kismet.device.base.type", "unknown")
+        get = raw.get
+        mac = get("kismet.device.base.macaddr", "00:00:00:00:00:00").upper()
+        dev_type = get("kismet.device.base.type", "unknown")
         
         # Determine device type
-        if dev_type == "Wi-Fi Device":
-            device_type = "wifi"
-        elif dev_type in ["BR/EDR", "BTLE"]:
-            device_type = "bluetooth"
-        else:
-            device_type = "unknown"
-            
+        device_type = _TYPE_MAP.get(dev_type, "unknown")
+        
         # Parse timestamps
-        first_time = raw.get("kismet.device.base.first_time", 0)
-        last_time = raw.get("kismet.device.base.last_time", 0)
+        first_time = get("kismet.device.base.first_time", 0)
+        last_time = get("kismet.device.base.last_time", 0)
         
         device = KismetDevice(
             mac=mac,
             device_type=device_type,
-            first_seen=datetime.fromtimestamp(first_time) if first_time else datetime.utcnow(),
-            last_seen=datetime.fromtimestamp(last_time) if last_time else datetime.utcnow(),
-            channel=raw.get("kismet.device.base.channel", 0),
-            frequency=raw.get("kismet.device.base.frequency", 0),
-            rssi=raw.get("kismet.device.base.signal/kismet.common.signal.last_signal", -100),
-            manufacturer=raw.get("kismet.device.base.manuf", ""),
-            packets=raw.get("kismet.device.base.packets.total", 0),
-            kismet_key=raw.get("kismet.device.base.key", ""),
+            first_seen=_datetime_from_epoch(first_time) if first_time else datetime.utcnow(),
+            last_seen=_datetime_from_epoch(last_time) if last_time else datetime.utcnow(),
+            channel=get("kismet.device.base.channel", 0),
+            frequency=get("kismet.device.base.frequency", 0),
+            rssi=get("kismet.device.base.signal/kismet.common.signal.last_signal", -100),
+            manufacturer=get("kismet.device.base.manuf", ""),
+            packets=get("kismet.device.base.packets.total", 0),
+            kismet_key=get("kismet.device.base.key", ""),
         )
         
         # WiFi specific fields
         if device_type == "wifi":
-            dot11 = raw.get("dot11.device", {})
+            dot11 = get("dot11.device", {})
             device.ssid = dot11.get("dot11.device.last_beaconed_ssid", "")
             
             # Extract probed SSIDs
             probe_map = dot11.get("dot11.device.probed_ssid_map", [])
             if isinstance(probe_map, list):
                 device.probe_ssids = [
-                    p.get("dot11.probedssid.ssid", "")
+                    ssid
                     for p in probe_map
-                    if p.get("dot11.probedssid.ssid")
+                    if (ssid := p.get("dot11.probedssid.ssid"))
                 ]
                 
         # Bluetooth specific fields
         elif device_type == "bluetooth":
-            device.bt_name = raw.get("kismet.device.base.name", "")
-            device.bt_type = "ble" if dev_type == "BTLE" else "classic"
+            device.bt_name = get("kismet.device.base.name", "")
+            device.bt_type = _BT_SUBTYPE[dev_type]
             
         return device
         
@@ -396,6 +541,7 @@ class KismetController:
             return False
             
         self._running = True
+        self._stop_event.clear()
         self._thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
         logger.info("Kismet polling started")
@@ -404,6 +550,7 @@ class KismetController:
     def stop(self):
         """Stop device polling."""
         self._running = False
+        self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=5.0)
             self._thread = None
@@ -411,73 +558,134 @@ class KismetController:
         
     def _poll_loop(self):
         """Main polling loop."""
-        while self._running:
+        while not self._stop_event.is_set():
+            self._last_poll_mono = time.monotonic()
             try:
                 self._poll_devices()
             except Exception as e:
                 logger.error(f"Kismet poll error: {e}")
                 
-            time.sleep(self.poll_interval)
+            # Keep cadence under load; stop() wakes the wait immediately
+            elapsed = time.monotonic() - self._last_poll_mono
+            self._stop_event.wait(max(0.0, self.poll_interval - elapsed))
             
     def _poll_devices(self):
         """Poll for new/updated devices."""
-        # Get devices since last poll
-        raw_devices = self.get_devices(last_time=self._last_poll_time)
+        # The window is keyed on Kismet's own clock so a local NTP step
+        # can't rewind it and trigger a full re-fetch
+        since = self._server_last_time
+        newest = since
+        new_callbacks = self._new_device_callbacks
+        update_callbacks = self._device_update_callbacks
+        
+        sigs = self._device_sig
+        parsed = []
+        # Devices since last poll
+        for raw in self._iter_devices(last_time=since or None):
+            get = raw.get
+            mac = get("kismet.device.base.macaddr")
+            last_time = get("kismet.device.base.last_time", 0)
+            if last_time > newest:
+                newest = last_time
+            sig = hash((
+                get("kismet.device.base.type"),
+                last_time,
+                get("kismet.device.base.signal/kismet.common.signal.last_signal"),
+                get("kismet.device.base.packets.total"),
+                get("kismet.device.base.channel"),
+            ))
+            if sigs.get(mac) == sig:
+                continue
+            sigs[mac] = sig
+            parsed.append(self._parse_device(raw))
+            
+        if not parsed:
+            # Idle poll: nothing changed, so skip the table copy and recount
+            self._server_last_time = int(newest)
+            self._last_poll_time = time.time()
+            return
         
-        for raw in raw_devices:
-            device = self._parse_device(raw)
+        with self._lock:
+            devices = dict(self._devices)
+            counts = self._count_devices(self._devices)
+            count = {"wifi": counts["wifi"], "bluetooth": counts["bluetooth"]}
+            changes = []
+            for device in parsed:
+                existing = devices.get(device.mac)
+                if existing is not None and existing.device_type in count:
+                    count[existing.device_type] -= 1
+                if device.device_type in count:
+                    count[device.device_type] += 1
+                changes.append((device, existing is None))
+                devices[device.mac] = device
+            self._device_counts = (devices, len(devices), count["wifi"], count["bluetooth"])
+            self._devices = devices
             
-            with self._lock:
-                existing = self._devices.get(device.mac)
-                
-                if existing is None:
-                    # New device
-                    self._devices[device.mac] = device
-                    for callback in self._new_device_callbacks:
-                        try:
-                            callback(device)
-                        except Exception as e:
-                            logger.error(f"Callback error: {e}")
-                else:
-                    # Update existing
-                    self._devices[device.mac] = device
-                    for callback in self._device_update_callbacks:
-                        try:
-                            callback(device)
-                        except Exception as e:
-                            logger.error(f"Callback error: {e}")
-                            
+        # Callbacks run after the lock is released so slow listeners
+        # don't hold up readers or the next poll's swap
+        for device, is_new in changes:
+            # New device or update to an existing one
+            self._dispatch(new_callbacks if is_new else update_callbacks, device)
+                    
+        self._server_last_time = int(newest)
         self._last_poll_time = time.time()
         
+    @staticmethod
+    def _dispatch(callbacks: Tuple[Callable[[KismetDevice], None], ...], device: KismetDevice):
+        """Run callbacks on device; a failing listener doesn't stop the rest."""
+        for callback in callbacks:
+            try:
+                callback(device)
+            except Exception as e:
+                logger.error(f"Callback error: {e}")
+                
+    def _dispatch_new_device(self, device: KismetDevice):
+        """Notify new-device callbacks, as a poll discovering device would."""
+        self._dispatch(self._new_device_callbacks, device)
+        
     def get_all_devices(self) -> List[KismetDevice]:
         """Get all tracked devices."""
-        with self._lock:
-            return list(self._devices.values())
+        return list(self._devices.values())
             
     def get_device(self, mac: str) -> Optional[KismetDevice]:
         """Get specific device by MAC."""
-        with self._lock:
-            return self._devices.get(mac.upper())
+        # Keys are stored uppercase; only non-canonical lookups pay for upper()
+        devices = self._devices
+        device = devices.get(mac)
+        if device is None:
+            device = devices.get(mac.upper())
+        return device
             
     def get_device_count(self) -> dict:
         """Get device counts by type."""
-        with self._lock:
-            wifi = sum(1 for d in self._devices.values() if d.device_type == "wifi")
-            bt = sum(1 for d in self._devices.values() if d.device_type == "bluetooth")
-            return {"wifi": wifi, "bluetooth": bt, "total": len(self._devices)}
+        return self._count_devices(self._devices)
+        
+    def _count_devices(self, devices: Dict[str, KismetDevice]) -> dict:
+        """Device counts for devices, from the poller's tally when current."""
+        counted, size, wifi, bt = self._device_counts
+        if counted is not devices or size != len(devices):
+            # Table changed outside _poll_devices; count it once
+            wifi = sum(1 for d in devices.values() if d.device_type == "wifi")
+            bt = sum(1 for d in devices.values() if d.device_type == "bluetooth")
+            self._device_counts = (devices, len(devices), wifi, bt)
+        return {"wifi": wifi, "bluetooth": bt, "total": len(devices)}
             
     def register_new_device_callback(self, callback: Callable[[KismetDevice], None]):
         """Register callback for new device discovery."""
-        self._new_device_callbacks.append(callback)
+        with self._lock:
+            self._new_device_callbacks = self._new_device_callbacks + (callback,)
         
     def register_update_callback(self, callback: Callable[[KismetDevice], None]):
         """Register callback for device updates."""
-        self._device_update_callbacks.append(callback)
+        with self._lock:
+            self._device_update_callbacks = self._device_update_callbacks + (callback,)
         
     def clear_devices(self):
         """Clear device tracking (for new session)."""
         with self._lock:
-            self._devices.clear()
+            self._devices = {}
+            self._device_sig = {}
+            self._server_last_time = 0
             self._last_poll_time = None
 
 
@@ -496,6 +704,9 @@ class ChannelHopper:
         "132", "136", "140", "144", "149", "153", "157", "161", "165"
     ]
     
+    # Hop list used by every hopping mode
+    _ALL_CHANNELS = tuple(CHANNELS_24GHZ + CHANNELS_5GHZ)
+    
     def __init__(
         self,
         kismet: KismetController,
@@ -519,9 +730,16 @@ class ChannelHopper:
         self.fast_rate = fast_rate
         self.slow_rate = slow_rate
         self.adaptive_rate = adaptive_rate
+        self._rate_table = {
+            "fast": fast_rate,
+            "slow": slow_rate,
+            "adaptive": adaptive_rate,
+        }
         
         self._mode = "adaptive"
         self._active_source: Optional[str] = None
+        # Hop rate last applied to the active source (None if not hopping)
+        self._applied_rate: Optional[float] = None
         
     def set_mode(self, mode: str) -> bool:
         """
@@ -533,7 +751,8 @@ class ChannelHopper:
         Returns:
             True if successful
         """
-        if mode not in ["fast", "slow", "adaptive", "lock"]:
+        rate = self._rate_table.get(mode)
+        if rate is None and mode != "lock":
             logger.error(f"Invalid hop mode: {mode}")
             return False
             
@@ -544,32 +763,21 @@ class ChannelHopper:
             return True
             
         # Apply mode to active source
-        if mode == "fast":
-            return self.kismet.set_hop_channels(
-                self._active_source,
-                self.CHANNELS_24GHZ + self.CHANNELS_5GHZ,
-                self.fast_rate,
-            )
-        elif mode == "slow":
-            return self.kismet.set_hop_channels(
-                self._active_source,
-                self.CHANNELS_24GHZ + self.CHANNELS_5GHZ,
-                self.slow_rate,
-            )
-        elif mode == "adaptive":
-            return self.kismet.set_hop_channels(
-                self._active_source,
-                self.CHANNELS_24GHZ + self.CHANNELS_5GHZ,
-                self.adaptive_rate,
-            )
-        elif mode == "lock":
+        if rate is None:
+            self._applied_rate = None
             return self.kismet.disable_hop_mode(self._active_source)
-            
-        return False
+        return self._apply_rate(rate)
+        
+    def _apply_rate(self, rate: float) -> bool:
+        """Send the hop list at rate to the active source."""
+        ok = self.kismet.set_hop_channels(self._active_source, self._ALL_CHANNELS, rate)
+        self._applied_rate = rate if ok else None
+        return ok
         
     def set_active_source(self, source_uuid: str):
         """Set the active data source for channel control."""
         self._active_source = source_uuid
+        self._applied_rate = None
         
     def lock_channel(self, channel: str) -> bool:
         """Lock to specific channel (disable hopping)."""
@@ -578,6 +786,7 @@ class ChannelHopper:
             return False
             
         self._mode = "lock"
+        self._applied_rate = None
         return self.kismet.set_channel(self._active_source, channel)
         
     def update_adaptive_rate(self):
@@ -597,9 +806,7 @@ class ChannelHopper:
             # Linear interpolation
             rate = self.slow_rate + (speed - 2.0) / 8.0 * (self.fast_rate - self.slow_rate)
             
-        if self._active_source:
-            self.kismet.set_hop_channels(
-                self._active_source,
-                self.CHANNELS_24GHZ + self.CHANNELS_5GHZ,
-                rate,
-            )
+        # Skip the REST round trip unless the rate moved meaningfully
+        applied = self._applied_rate
+        if self._active_source and (applied is None or abs(rate - applied) >= ADAPTIVE_RATE_STEP):
+            self._apply_rate(rate)
@@ -6,8 +6,13 @@ Extracts Information Elements (IEs), vendor-specific data, and
 protocol fingerprints from captured traffic.
 """
 
+import functools
 import logging
+import re
+import selectors
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import tempfile
 import threading
 import json
 import time
@@ -15,13 +20,103 @@ import os
 import signal
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
 from dataclasses import dataclass, field
 
+# Optional fast JSON decoder for tshark JSON/ek output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Nice value for the live capture process (applied when running as root)
+CAPTURE_NICE = -5
+
+# Seconds allowed for tshark to read back a pcap file
+PARSE_TIMEOUT = 300
+
+# Kernel pipe and read buffer size for tshark output (F_SETPIPE_SZ). The
+# default 64 KiB pipe stalls tshark whenever Python is busy parsing; 1 MiB
+# is the unprivileged Linux maximum.
+PIPE_SIZE = 1 << 20
+
+# Numbers in a rates string such as "1(B),2(B),5.5,11" or "54 Mb/s"
+_RATE_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+@functools.lru_cache(maxsize=1024)
+def _rate_tuple(rates_str: str) -> Tuple[int, ...]:
+    """
+    Parse a rates string into integer rates, memoized.
+    
+    A device advertises the same rate set in every probe/beacon, so a
+    capture holds few distinct strings and most frames hit the cache.
+    """
+    return tuple(int(float(num)) for num in _RATE_RE.findall(rates_str))
+
+# tshark fields for probe request analysis (column order is parsed
+# positionally by _probe_from_fields)
+PROBE_FIELDS = (
+    "frame.time_epoch",
+    "wlan.sa",
+    "wlan.ssid",
+    "wlan.channel",
+    "wlan_radio.signal_dbm",
+    "wlan.seq",
+    "frame.len",
+    "wlan.supported_rates",
+    "wlan.extended_supported_rates",
+    "wlan.ht.capabilities",
+    "wlan.vht.capabilities",
+)
+
+# tshark fields for beacons (parsed positionally by _beacon_from_fields)
+BEACON_FIELDS = (
+    "frame.time_epoch",
+    "wlan.bssid",
+    "wlan.ssid",
+    "wlan.channel",
+    "wlan_radio.signal_dbm",
+    "wlan.fixed.beacon",
+    "wlan.supported_rates",
+    "wlan.ht.capabilities",
+    "wlan.vht.capabilities",
+    "wlan.rsn.pcs.type",
+    "wlan.rsn.akms.type",
+)
+
+# Vendor-specific IE (tag 221) fields, as returned by extract_vendor_ies
+VENDOR_IE_FIELDS = (
+    "wlan.tag.oui",
+    "wlan.tag.vendor.oui.type",
+    "wlan.tag.vendor.data",
+)
+
+# Options for reading captures back. Only 802.11 headers and management
+# bodies are needed: stopping dissection at LLC skips data frame payloads
+# (IP, TCP, ...), which are most of a busy capture. Name resolution, FCS
+# checks and decryption attempts are per-frame costs nothing here uses.
+READBACK_ARGS = [
+    "-n",
+    "--disable-protocol", "llc",
+    "-o", "wlan.check_fcs:FALSE",
+    "-o", "wlan.enable_decryption:FALSE",
+]
+
+# tshark -T fields output options: tab separated, first occurrence, unquoted
+FIELDS_OUTPUT = [
+    "-T", "fields",
+    "-E", "separator=/t",
+    "-E", "occurrence=f",
+    "-E", "quote=n",
+    "-E", "header=n",
+]
 
-@dataclass
+
+@dataclass(slots=True)
 class CaptureSession:
     """Active capture session metadata."""
     
@@ -36,12 +131,12 @@ class CaptureSession:
     bytes_captured: int = 0
     
     
-@dataclass
+@dataclass(slots=True)
 class ProbeRequest:
     """Parsed probe request data for fingerprinting."""
     
     source_mac: str
-    timestamp: datetime
+    timestamp: float  # Epoch seconds; see timestamp_dt
     ssid: str
     channel: int
     rssi: int
@@ -56,14 +151,19 @@ class ProbeRequest:
     # Raw frame data
     sequence_number: int = 0
     frame_length: int = 0
+    
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Capture time as a local datetime (converted on demand)."""
+        return datetime.fromtimestamp(self.timestamp)
 
 
-@dataclass
+@dataclass(slots=True)
 class BeaconFrame:
     """Parsed beacon frame data."""
     
     bssid: str
-    timestamp: datetime
+    timestamp: float  # Epoch seconds; see timestamp_dt
     ssid: str
     channel: int
     rssi: int
@@ -80,6 +180,11 @@ class BeaconFrame:
     vendor_ies: List[Dict[str, Any]] = field(default_factory=list)
     
     beacon_interval: int = 100
+    
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Capture time as a local datetime (converted on demand)."""
+        return datetime.fromtimestamp(self.timestamp)
 
 
 class TsharkCapture:
@@ -98,6 +203,8 @@ class TsharkCapture:
         output_dir: str = "data/pcap",
         max_file_size_mb: int = 100,
         rotate_files: bool = True,
+        capture_cpu: Optional[int] = None,
+        buffer_size_mb: int = 64,
     ):
         """
         Initialize tshark capture.
@@ -107,11 +214,16 @@ class TsharkCapture:
             output_dir: Directory for pcap files
             max_file_size_mb: Max pcap file size before rotation
             rotate_files: Enable file rotation
+            capture_cpu: CPU to pin the tshark capture process to (None = no pinning)
+            buffer_size_mb: Kernel capture buffer size, so bursts arriving
+                while a rotated file is closed and synced aren't dropped
         """
         self.interface = interface or self._detect_monitor_interface()
         self.output_dir = Path(output_dir)
         self.max_file_size_mb = max_file_size_mb
         self.rotate_files = rotate_files
+        self.capture_cpu = capture_cpu
+        self.buffer_size_mb = buffer_size_mb
         
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -122,6 +234,20 @@ class TsharkCapture:
         # Callbacks for real-time processing
         self._probe_callbacks: List[Callable[[ProbeRequest], None]] = []
         self._beacon_callbacks: List[Callable[[BeaconFrame], None]] = []
+        
+    def __getstate__(self) -> dict:
+        # Picklable for process-pool parsing: workers get the configuration
+        # only, not the lock, live session or callbacks
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_active_session"] = None
+        state["_probe_callbacks"] = []
+        state["_beacon_callbacks"] = []
+        return state
+        
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
     
     def _detect_monitor_interface(self) -> str:
         """Auto-detect a monitor mode interface."""
@@ -233,6 +359,7 @@ class TsharkCapture:
             "-i", self.interface,
             "-w", str(output_file),
             "-F", "pcapng",  # Output format
+            "-B", str(self.buffer_size_mb),  # Capture buffer (MB)
         ]
         
         if filter_expr:
@@ -250,9 +377,22 @@ class TsharkCapture:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                pipesize=PIPE_SIZE,
             )
             
+            from core.utils import pin_to_cpus, set_process_priority
+            if self.capture_cpu is not None:
+                if pin_to_cpus(process.pid, {self.capture_cpu}):
+                    logger.info(f"Pinned tshark capture to CPU {self.capture_cpu}")
+            # Favour the capture over readback/analysis work on the same CPUs
+            set_process_priority(process.pid, CAPTURE_NICE)
+            
             with self._lock:
+                # Re-check: another caller may have started meanwhile
+                if self._active_session:
+                    process.terminate()
+                    logger.warning("Capture already active")
+                    return False
                 self._active_session = CaptureSession(
                     session_id=session_id,
                     interface=self.interface,
@@ -299,31 +439,32 @@ class TsharkCapture:
         
     def is_capturing(self) -> bool:
         """Check if capture is active."""
-        with self._lock:
-            return self._active_session is not None
+        # A single reference read is atomic; _lock only orders start/stop
+        return self._active_session is not None
             
     def get_capture_stats(self) -> Optional[dict]:
         """Get statistics for active capture."""
-        with self._lock:
-            if not self._active_session:
-                return None
-                
-            session = self._active_session
+        # Snapshot the session once so a concurrent stop can't swap it
+        # out mid-read; the file stat no longer runs under the lock
+        session = self._active_session
+        if not session:
+            return None
             
-            # Get file size
-            try:
-                file_size = Path(session.output_file).stat().st_size
-            except:
-                file_size = 0
-                
-            return {
-                "session_id": session.session_id,
-                "interface": session.interface,
-                "output_file": session.output_file,
-                "start_time": session.start_time.isoformat(),
-                "duration_seconds": (datetime.now() - session.start_time).total_seconds(),
-                "file_size_bytes": file_size,
-            }
+        # Get file size
+        try:
+            file_size = os.stat(session.output_file).st_size
+        except OSError:
+            # Usually missing: with rotation tshark suffixes the file name
+            file_size = 0
+            
+        return {
+            "session_id": session.session_id,
+            "interface": session.interface,
+            "output_file": session.output_file,
+            "start_time": session.start_time.isoformat(),
+            "duration_seconds": (datetime.now() - session.start_time).total_seconds(),
+            "file_size_bytes": file_size,
+        }
             
     def parse_pcap(
         self,
@@ -348,117 +489,176 @@ class TsharkCapture:
             logger.error(f"Pcap file not found: {pcap_file}")
             return result
             
-        if extract_probes:
-            result["probes"] = self._extract_probe_requests(pcap_file)
-            
-        if extract_beacons:
-            result["beacons"] = self._extract_beacons(pcap_file)
+        if extract_probes or extract_beacons:
+            # One tshark pass dissects the file for both frame types
+            result["probes"], result["beacons"] = self._extract_mgmt_frames(
+                pcap_file, probes=extract_probes, beacons=extract_beacons
+            )
             
         return result
         
-    def _extract_probe_requests(self, pcap_file: str) -> List[ProbeRequest]:
-        """Extract probe requests from pcap file."""
-        probes = []
+    def analyze_pcap(self, pcap_file: str) -> Dict[str, Any]:
+        """
+        Extract probes, beacons, vendor IEs and source MACs in one pass.
         
-        # tshark fields for probe request analysis
-        fields = [
-            "frame.time_epoch",
-            "wlan.sa",
-            "wlan.ssid",
-            "wlan.channel",
-            "wlan_radio.signal_dbm",
-            "wlan.seq",
-            "frame.len",
-            "wlan.supported_rates",
-            "wlan.extended_supported_rates",
-            "wlan.ht.capabilities",
-            "wlan.vht.capabilities",
-            "wlan.tag.vendor.oui.type",
-            "wlan.tag.vendor.data",
-        ]
+        Equivalent to parse_pcap() plus extract_vendor_ies() and
+        get_unique_macs(), but tshark starts and dissects the file once
+        instead of three times.
+        
+        Args:
+            pcap_file: Path to pcap file
+            
+        Returns:
+            Dictionary with 'probes', 'beacons', 'vendor_ies' and 'macs'
+        """
+        result: Dict[str, Any] = {"probes": [], "beacons": [], "vendor_ies": {}, "macs": []}
+        
+        if not Path(pcap_file).exists():
+            logger.error(f"Pcap file not found: {pcap_file}")
+            return result
+            
+        # No display filter: every frame contributes its source MAC
+        fields = ["wlan.fc.type_subtype", *PROBE_FIELDS, *BEACON_FIELDS, *VENDOR_IE_FIELDS]
+        probe_end = 1 + len(PROBE_FIELDS)
+        beacon_end = probe_end + len(BEACON_FIELDS)
         
         field_args = []
         for f in fields:
             field_args.extend(["-e", f])
             
-        cmd = [
-            "tshark",
-            "-r", pcap_file,
-            "-Y", "wlan.fc.type_subtype == 0x04",  # Probe Request
-            "-T", "json",
-        ] + field_args
+        cmd = ["tshark", "-r", pcap_file] + READBACK_ARGS + FIELDS_OUTPUT + field_args
         
+        probes: List[ProbeRequest] = []
+        latest: Dict[bytes, List[bytes]] = {}
+        vendor_ies: Dict[str, List[dict]] = {}
+        macs = set()
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
-            
-            if result.returncode != 0:
-                logger.error(f"tshark error: {result.stderr}")
-                return probes
-                
-            data = json.loads(result.stdout) if result.stdout else []
-            
-            for packet in data:
-                layers = packet.get("_source", {}).get("layers", {})
-                
-                probe = ProbeRequest(
-                    source_mac=self._get_field(layers, "wlan.sa", "00:00:00:00:00:00"),
-                    timestamp=datetime.fromtimestamp(
-                        float(self._get_field(layers, "frame.time_epoch", "0"))
-                    ),
-                    ssid=self._get_field(layers, "wlan.ssid", ""),
-                    channel=int(self._get_field(layers, "wlan.channel", "0")),
-                    rssi=int(self._get_field(layers, "wlan_radio.signal_dbm", "-100")),
-                    sequence_number=int(self._get_field(layers, "wlan.seq", "0")),
-                    frame_length=int(self._get_field(layers, "frame.len", "0")),
-                )
-                
-                # Parse supported rates
-                rates_str = self._get_field(layers, "wlan.supported_rates", "")
-                if rates_str:
-                    probe.supported_rates = self._parse_rates(rates_str)
+            for line in self._iter_tshark_output(cmd):
+                parts = line.rstrip(b"\r\n").split(b"\t")
+                if len(parts) != len(fields):
+                    continue
+                # wlan.sa (first probe column) is filled for any frame with one
+                sa = parts[2]
+                if sa:
+                    mac = sa.decode()
+                    macs.add(mac.upper())
                     
-                ext_rates_str = self._get_field(layers, "wlan.extended_supported_rates", "")
-                if ext_rates_str:
-                    probe.extended_rates = self._parse_rates(ext_rates_str)
+                    oui, oui_type, data = parts[beacon_end:]
+                    if oui:
+                        vendor_ies.setdefault(mac, []).append({
+                            "oui": oui.decode(),
+                            "type": oui_type.decode(),
+                            "data": data.decode(),
+                        })
+                        
+                if not parts[0]:
+                    continue
+                subtype = int(parts[0], 0)
+                if subtype == 0x04:
+                    probes.append(self._probe_from_fields(parts[1:probe_end]))
+                elif subtype == 0x08:
+                    row = parts[probe_end:beacon_end]
+                    latest[row[1]] = row
                     
-                # HT/VHT capabilities
-                probe.ht_capabilities = self._get_field(layers, "wlan.ht.capabilities", None)
-                probe.vht_capabilities = self._get_field(layers, "wlan.vht.capabilities", None)
-                
-                probes.append(probe)
-                
+            result["beacons"] = [self._beacon_from_fields(row) for row in latest.values()]
+            result["probes"] = probes
+            result["vendor_ies"] = vendor_ies
+            result["macs"] = list(macs)
+            
+        except subprocess.CalledProcessError as e:
+            logger.error(f"tshark error: {e.stderr}")
         except subprocess.TimeoutExpired:
             logger.error(f"tshark timeout parsing {pcap_file}")
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parse error: {e}")
         except Exception as e:
-            logger.error(f"Probe extraction error: {e}")
+            logger.error(f"Pcap analysis error: {e}")
             
-        return probes
+        return result
+        
+    def parse_rotated(
+        self,
+        session_id: str,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, List]:
+        """
+        Parse every rotated pcap file of a capture session in parallel.
+        
+        Each file is handled by its own worker process (and tshark), then
+        probes are concatenated in file order and beacons reduced to the
+        latest per BSSID.
+        
+        Args:
+            session_id: Scan session ID used in the capture file names
+            max_workers: Worker processes (default: CPU count)
+            
+        Returns:
+            Dictionary with 'probes' and 'beacons' lists
+        """
+        files = sorted(
+            str(p) for p in self.output_dir.glob(f"airdump_capture_{session_id}_*.pcapng")
+        )
+        result = {"probes": [], "beacons": []}
+        if not files:
+            logger.warning(f"No capture files for session {session_id}")
+            return result
+            
+        workers = min(len(files), max_workers or os.cpu_count() or 1)
+        if workers == 1:
+            parsed = list(map(self._extract_mgmt_frames, files))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(self._extract_mgmt_frames, files))
+                
+        latest: Dict[str, BeaconFrame] = {}
+        for probes, beacons in parsed:
+            result["probes"].extend(probes)
+            for beacon in beacons:
+                seen = latest.get(beacon.bssid)
+                if seen is None or beacon.timestamp >= seen.timestamp:
+                    latest[beacon.bssid] = beacon
+        result["beacons"] = list(latest.values())
+        
+        return result
+        
+    def _extract_probe_requests(self, pcap_file: str) -> List[ProbeRequest]:
+        """Extract probe requests from pcap file."""
+        return self._extract_mgmt_frames(pcap_file, probes=True, beacons=False)[0]
         
     def _extract_beacons(self, pcap_file: str) -> List[BeaconFrame]:
         """Extract beacon frames from pcap file."""
-        beacons = []
+        return self._extract_mgmt_frames(pcap_file, probes=False, beacons=True)[1]
         
-        fields = [
-            "frame.time_epoch",
-            "wlan.bssid",
-            "wlan.ssid",
-            "wlan.channel",
-            "wlan_radio.signal_dbm",
-            "wlan.fixed.beacon",
-            "wlan.supported_rates",
-            "wlan.ht.capabilities",
-            "wlan.vht.capabilities",
-            "wlan.rsn.pcs.type",
-            "wlan.rsn.akms.type",
-        ]
+    def _extract_mgmt_frames(
+        self,
+        pcap_file: str,
+        probes: bool = True,
+        beacons: bool = True,
+    ) -> Tuple[List[ProbeRequest], List[BeaconFrame]]:
+        """
+        Extract probe requests and/or beacons in a single tshark pass.
+        
+        Args:
+            pcap_file: Path to pcap file
+            probes: Extract probe requests
+            beacons: Extract beacon frames (latest per BSSID)
+            
+        Returns:
+            Tuple of (probe requests, beacon frames)
+        """
+        probe_list: List[ProbeRequest] = []
+        beacon_list: List[BeaconFrame] = []
         
+        # Columns: subtype, then the probe and/or beacon field groups
+        fields = ["wlan.fc.type_subtype"]
+        subtypes = []
+        if probes:
+            probe_start = len(fields)
+            fields.extend(PROBE_FIELDS)
+            subtypes.append("wlan.fc.type_subtype == 0x04")  # Probe Request
+        if beacons:
+            beacon_start = len(fields)
+            fields.extend(BEACON_FIELDS)
+            subtypes.append("wlan.fc.type_subtype == 0x08")  # Beacon
+            
         field_args = []
         for f in fields:
             field_args.extend(["-e", f])
@@ -466,76 +666,162 @@ class TsharkCapture:
         cmd = [
             "tshark",
             "-r", pcap_file,
-            "-Y", "wlan.fc.type_subtype == 0x08",  # Beacon
-            "-T", "json",
-        ] + field_args
+            "-Y", " || ".join(subtypes),
+        ] + READBACK_ARGS + FIELDS_OUTPUT + field_args
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
-            
-            if result.returncode != 0:
-                logger.error(f"tshark error: {result.stderr}")
-                return beacons
-                
-            data = json.loads(result.stdout) if result.stdout else []
+            # Track unique BSSIDs (only keep latest beacon per AP). APs beacon
+            # ~10x a second, so keep raw columns and build frames at the end.
+            latest: Dict[bytes, List[bytes]] = {}
             
-            # Track unique BSSIDs (only keep latest beacon per AP)
-            seen_bssids: Dict[str, BeaconFrame] = {}
-            
-            for packet in data:
-                layers = packet.get("_source", {}).get("layers", {})
-                
-                bssid = self._get_field(layers, "wlan.bssid", "00:00:00:00:00:00")
-                
-                beacon = BeaconFrame(
-                    bssid=bssid,
-                    timestamp=datetime.fromtimestamp(
-                        float(self._get_field(layers, "frame.time_epoch", "0"))
-                    ),
-                    ssid=self._get_field(layers, "wlan.ssid", ""),
-                    channel=int(self._get_field(layers, "wlan.channel", "0")),
-                    rssi=int(self._get_field(layers, "wlan_radio.signal_dbm", "-100")),
-                    beacon_interval=int(self._get_field(layers, "wlan.fixed.beacon", "100")),
-                )
-                
-                # Parse rates
-                rates_str = self._get_field(layers, "wlan.supported_rates", "")
-                if rates_str:
-                    beacon.supported_rates = self._parse_rates(rates_str)
-                    
-                # Capabilities
-                beacon.ht_capabilities = self._get_field(layers, "wlan.ht.capabilities", None)
-                beacon.vht_capabilities = self._get_field(layers, "wlan.vht.capabilities", None)
-                
-                # Security
-                cipher = self._get_field(layers, "wlan.rsn.pcs.type", None)
-                auth = self._get_field(layers, "wlan.rsn.akms.type", None)
-                
-                if cipher or auth:
-                    beacon.encryption = "WPA2/WPA3"
-                    beacon.cipher = cipher
-                    beacon.auth = auth
+            for line in self._iter_tshark_output(cmd):
+                # Columns follow the fields list above
+                parts = line.rstrip(b"\r\n").split(b"\t")
+                if len(parts) != len(fields) or not parts[0]:
+                    continue
+                # "4" or "0x0004" depending on tshark version
+                subtype = int(parts[0], 0)
+                if subtype == 0x04 and probes:
+                    probe_list.append(self._probe_from_fields(
+                        parts[probe_start:probe_start + len(PROBE_FIELDS)]
+                    ))
+                elif subtype == 0x08 and beacons:
+                    row = parts[beacon_start:]
+                    latest[row[1]] = row
                     
-                seen_bssids[bssid] = beacon
-                
-            beacons = list(seen_bssids.values())
+            beacon_list = [self._beacon_from_fields(row) for row in latest.values()]
             
+        except subprocess.CalledProcessError as e:
+            logger.error(f"tshark error: {e.stderr}")
+            return [], []
         except subprocess.TimeoutExpired:
             logger.error(f"tshark timeout parsing {pcap_file}")
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parse error: {e}")
         except Exception as e:
-            logger.error(f"Beacon extraction error: {e}")
+            logger.error(f"Frame extraction error: {e}")
             
-        return beacons
+        return probe_list, beacon_list
         
+    def _probe_from_fields(self, parts: List[bytes]) -> ProbeRequest:
+        """Build a ProbeRequest from PROBE_FIELDS columns."""
+        (epoch, sa, ssid, channel, signal_dbm, seq, length,
+         rates, ext_rates, ht, vht) = parts
+        
+        probe = ProbeRequest(
+            source_mac=sa.decode() or "00:00:00:00:00:00",
+            timestamp=float(epoch or 0),
+            ssid=ssid.decode("utf-8", "replace"),
+            channel=int(channel or 0),
+            rssi=int(signal_dbm or -100),
+            sequence_number=int(seq or 0),
+            frame_length=int(length or 0),
+        )
+        
+        # Parse supported rates
+        if rates:
+            probe.supported_rates = self._parse_rates(rates.decode())
+            
+        if ext_rates:
+            probe.extended_rates = self._parse_rates(ext_rates.decode())
+            
+        # HT/VHT capabilities
+        probe.ht_capabilities = ht.decode() or None
+        probe.vht_capabilities = vht.decode() or None
+        
+        return probe
+        
+    def _beacon_from_fields(self, parts: List[bytes]) -> BeaconFrame:
+        """Build a BeaconFrame from BEACON_FIELDS columns."""
+        (epoch, bssid, ssid, channel, signal_dbm, interval,
+         rates, ht, vht, cipher, auth) = parts
+        
+        beacon = BeaconFrame(
+            bssid=bssid.decode() or "00:00:00:00:00:00",
+            timestamp=float(epoch or 0),
+            ssid=ssid.decode("utf-8", "replace"),
+            channel=int(channel or 0),
+            rssi=int(signal_dbm or -100),
+            beacon_interval=int(interval or 100),
+        )
+        
+        # Parse rates
+        if rates:
+            beacon.supported_rates = self._parse_rates(rates.decode())
+            
+        # Capabilities
+        beacon.ht_capabilities = ht.decode() or None
+        beacon.vht_capabilities = vht.decode() or None
+        
+        # Security
+        if cipher or auth:
+            beacon.encryption = "WPA2/WPA3"
+            beacon.cipher = cipher.decode() or None
+            beacon.auth = auth.decode() or None
+            
+        return beacon
+        
+    def _iter_tshark_output(self, cmd: List[str]) -> Iterator[bytes]:
+        """
+        Run tshark and yield its stdout one line at a time.
+        
+        Lines are consumed as tshark produces them, so memory stays flat
+        regardless of pcap size.
+        
+        Args:
+            cmd: tshark command line
+            
+        Returns:
+            Iterator of raw output lines
+            
+        Raises:
+            subprocess.CalledProcessError: tshark exited non-zero
+            subprocess.TimeoutExpired: tshark ran past PARSE_TIMEOUT
+        """
+        # stderr goes to a file so a chatty tshark can't fill the pipe
+        # and stall while stdout is being consumed
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                bufsize=PIPE_SIZE,
+                pipesize=PIPE_SIZE,
+            )
+            timed_out = threading.Event()
+            
+            def kill():
+                timed_out.set()
+                process.kill()
+                
+            timer = threading.Timer(PARSE_TIMEOUT, kill)
+            timer.start()
+            try:
+                yield from process.stdout
+            except BaseException:
+                # Consumer raised or stopped early
+                process.kill()
+                raise
+            finally:
+                process.stdout.close()
+                returncode = process.wait()
+                timer.cancel()
+                
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, PARSE_TIMEOUT)
+            if returncode != 0:
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(
+                    returncode, cmd, stderr=stderr.read().decode(errors="replace")
+                )
+                
     def _get_field(self, layers: dict, field: str, default: Any) -> Any:
         """Extract field from tshark JSON layers."""
+        # tshark normally emits the field name itself as the key
+        if field in layers:
+            value = layers[field]
+            if isinstance(value, list):
+                return value[0] if value else default
+            return value
+            
         # Fields may be nested or direct
         for key, value in layers.items():
             if field in key:
@@ -550,17 +836,15 @@ class TsharkCapture:
         
     def _parse_rates(self, rates_str: str) -> List[int]:
         """Parse rates string into list of integers."""
-        rates = []
+        if not rates_str:
+            return []
         try:
-            # Rates may be comma-separated or in various formats
-            for part in str(rates_str).replace(",", " ").split():
-                # Remove units like "Mb/s"
-                num = ''.join(c for c in part if c.isdigit() or c == '.')
-                if num:
-                    rates.append(int(float(num)))
-        except:
-            pass
-        return rates
+            # Rates may be comma-separated or in various formats; units
+            # like "Mb/s" and "(B)" markers are skipped by the pattern.
+            # A fresh list per frame since callers may mutate it.
+            return list(_rate_tuple(str(rates_str)))
+        except (ValueError, TypeError):
+            return []
         
     def extract_vendor_ies(self, pcap_file: str) -> Dict[str, List[dict]]:
         """
@@ -574,48 +858,36 @@ class TsharkCapture:
         """
         vendor_ies: Dict[str, List[dict]] = {}
         
+        fields = ("wlan.sa", *VENDOR_IE_FIELDS)
+        field_args = []
+        for f in fields:
+            field_args.extend(["-e", f])
+            
         cmd = [
             "tshark",
             "-r", pcap_file,
             "-Y", "wlan.tag.number == 221",  # Vendor Specific IE
-            "-T", "json",
-            "-e", "wlan.sa",
-            "-e", "wlan.tag.vendor.oui.type",
-            "-e", "wlan.tag.vendor.data",
-            "-e", "wlan.tag.oui",
-        ]
+        ] + READBACK_ARGS + FIELDS_OUTPUT + field_args
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
-            
-            if result.returncode != 0:
-                return vendor_ies
-                
-            data = json.loads(result.stdout) if result.stdout else []
-            
-            for packet in data:
-                layers = packet.get("_source", {}).get("layers", {})
-                mac = self._get_field(layers, "wlan.sa", None)
-                
-                if not mac:
+            for line in self._iter_tshark_output(cmd):
+                # Columns follow the fields tuple above
+                parts = line.rstrip(b"\r\n").split(b"\t")
+                if len(parts) != len(fields) or not parts[0]:
                     continue
-                    
-                if mac not in vendor_ies:
-                    vendor_ies[mac] = []
-                    
-                ie = {
-                    "oui": self._get_field(layers, "wlan.tag.oui", ""),
-                    "type": self._get_field(layers, "wlan.tag.vendor.oui.type", ""),
-                    "data": self._get_field(layers, "wlan.tag.vendor.data", ""),
-                }
-                
-                vendor_ies[mac].append(ie)
+                mac, oui, oui_type, data = (part.decode() for part in parts)
+                vendor_ies.setdefault(mac, []).append({
+                    "oui": oui,
+                    "type": oui_type,
+                    "data": data,
+                })
                 
+        except subprocess.CalledProcessError as e:
+            logger.error(f"tshark error: {e.stderr}")
+            return {}
+        except subprocess.TimeoutExpired:
+            logger.error(f"tshark timeout extracting vendor IEs from {pcap_file}")
+            return {}
         except Exception as e:
             logger.error(f"Vendor IE extraction error: {e}")
             
@@ -636,6 +908,7 @@ class TsharkCapture:
         cmd = [
             "tshark",
             "-r", pcap_file,
+            *READBACK_ARGS,
             "-T", "fields",
             "-e", "wlan.sa",
         ]
@@ -644,15 +917,14 @@ class TsharkCapture:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
                 timeout=60,
+                pipesize=PIPE_SIZE,
             )
             
             if result.returncode == 0:
-                for line in result.stdout.strip().split("\n"):
-                    mac = line.strip()
-                    if mac and mac != "":
-                        macs.add(mac.upper())
+                # Dedupe the raw lines first so only unique MACs are decoded
+                for mac in set(result.stdout.split()):
+                    macs.add(mac.decode().upper())
                         
         except Exception as e:
             logger.error(f"MAC extraction error: {e}")
@@ -668,6 +940,78 @@ class TsharkCapture:
         self._beacon_callbacks.append(callback)
 
 
+class _LiveReader:
+    """
+    Shared reader for every running LivePacketParser.
+    
+    tshark pipes are watched with a selector on one thread, so several
+    live parsers (one per interface) don't each need a thread blocked in
+    readline(). The thread exits once no pipes are registered.
+    """
+    
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        
+    def add(self, parser: "LivePacketParser", fd: int):
+        """Start delivering lines read from fd to parser."""
+        os.set_blocking(fd, False)
+        with self._lock:
+            # data: [parser, partial trailing line]
+            self._selector.register(fd, selectors.EVENT_READ, [parser, b""])
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tshark-live", daemon=True
+                )
+                self._thread.start()
+                
+    def remove(self, fd: int):
+        """Stop watching fd (no-op if already removed)."""
+        with self._lock:
+            try:
+                self._selector.unregister(fd)
+            except (KeyError, ValueError):
+                pass
+                
+    def _run(self):
+        """Read ready pipes until none are registered."""
+        while True:
+            with self._lock:
+                if not self._selector.get_map():
+                    self._thread = None
+                    return
+            # Short timeout so a removed last pipe ends the thread promptly
+            for key, _ in self._selector.select(timeout=0.5):
+                self._read(key)
+                
+    def _read(self, key: selectors.SelectorKey):
+        """Read what's available on one pipe and dispatch whole lines."""
+        parser, pending = key.data
+        try:
+            chunk = os.read(key.fd, PIPE_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+            
+        if not chunk:
+            # tshark exited or the pipe was closed
+            self.remove(key.fd)
+            if pending:
+                parser._handle_line(pending)
+            return
+            
+        lines = (pending + chunk).split(b"\n")
+        key.data[1] = lines.pop()
+        for line in lines:
+            if line:
+                parser._handle_line(line)
+
+
+_live_reader = _LiveReader()
+
+
 class LivePacketParser:
     """
     Real-time packet parsing using tshark live capture.
@@ -692,7 +1036,6 @@ class LivePacketParser:
         
         self._process: Optional[subprocess.Popen] = None
         self._running = False
-        self._thread: Optional[threading.Thread] = None
         
     def start(self) -> bool:
         """Start live packet parsing."""
@@ -729,13 +1072,13 @@ class LivePacketParser:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line buffered
+                # The shared reader reads the fd directly, in bytes
+                bufsize=0,
+                pipesize=PIPE_SIZE,
             )
             
             self._running = True
-            self._thread = threading.Thread(target=self._read_loop, daemon=True)
-            self._thread.start()
+            _live_reader.add(self, self._process.stdout.fileno())
             
             logger.info("Live packet parser started")
             return True
@@ -749,35 +1092,27 @@ class LivePacketParser:
         self._running = False
         
         if self._process:
+            _live_reader.remove(self._process.stdout.fileno())
             self._process.terminate()
             try:
                 self._process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 self._process.kill()
+            self._process.stdout.close()
             self._process = None
             
-        if self._thread:
-            self._thread.join(timeout=5)
-            self._thread = None
-            
         logger.info("Live packet parser stopped")
         
-    def _read_loop(self):
-        """Read and parse packets from tshark output."""
-        while self._running and self._process:
+    def _handle_line(self, line: bytes):
+        """Parse one tshark ek line and pass it to the callback."""
+        if not self._running:
+            return
+        try:
+            data = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+        except json.JSONDecodeError:
+            return
+        if self.callback:
             try:
-                line = self._process.stdout.readline()
-                if not line:
-                    break
-                    
-                # Parse JSON line
-                try:
-                    data = json.loads(line)
-                    if self.callback:
-                        self.callback(data)
-                except json.JSONDecodeError:
-                    continue
-                    
+                self.callback(data)
             except Exception as e:
-                logger.debug(f"Read error: {e}")
-                break
+                logger.debug(f"Live packet callback error: {e}")
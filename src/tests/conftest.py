@@ -6,21 +6,34 @@ Pytest fixtures and configuration for all tests.
 
 import os
 import sys
+import copy
+import json
+import itertools
+import yaml
 import pytest
+import shutil
 import tempfile
 import sqlite3
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.database import Database
 from core.models import (
     GPSPosition, ScanSession, WiFiDevice, BTDevice,
     DeviceType, BTDeviceType, ScanStatus, GPSFixQuality
 )
 
+# Use the libyaml-backed dumper when PyYAML was built with it
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Fixed clock for fixtures; keeps them deterministic
+NOW = datetime(2025, 12, 25, 12, 0, tzinfo=timezone.utc)
+
 
 # =============================================================================
 # FIXTURES - GPS
@@ -38,7 +51,7 @@ def sample_gps_position():
         fix_quality=GPSFixQuality.FIX_3D,
         hdop=1.2,
         satellites=8,
-        timestamp=datetime.now(timezone.utc),
+        timestamp=NOW,
         gps_valid=True,
     )
 
@@ -65,7 +78,7 @@ def sample_session():
     """Sample scan session fixture."""
     return ScanSession(
         session_id="20251225_120000",
-        start_time=datetime.now(timezone.utc),
+        start_time=NOW,
         status=ScanStatus.RUNNING,
         property_id="TEST-FACILITY",
         operator="test_user",
@@ -106,8 +119,8 @@ def sample_wifi_ap():
         encryption="WPA2",
         manufacturer="Cisco",
         packets_total=1000,
-        first_seen=datetime.now(timezone.utc),
-        last_seen=datetime.now(timezone.utc),
+        first_seen=NOW,
+        last_seen=NOW,
         gps_lat=51.5074,
         gps_lon=-0.1278,
         gps_alt=30.0,
@@ -151,6 +164,25 @@ def randomized_mac_device():
     )
 
 
+@pytest.fixture
+def make_wifi_device():
+    """Build WiFi devices with sequential keys and BSSIDs."""
+    seq = itertools.count()
+    
+    def make(**overrides) -> WiFiDevice:
+        n = next(seq)
+        fields = {
+            "device_key": f"wifi_{n}",
+            "bssid": f"AA:BB:CC:DD:EE:{n:02X}",
+            "session_id": "test_session",
+            "first_seen": NOW,
+            "last_seen": NOW,
+        }
+        fields.update(overrides)
+        return WiFiDevice(**fields)
+    return make
+
+
 # =============================================================================
 # FIXTURES - BLUETOOTH DEVICES
 # =============================================================================
@@ -192,6 +224,26 @@ def sample_bt_ble():
     )
 
 
+@pytest.fixture
+def make_bt_device():
+    """Build Bluetooth devices with sequential keys and MACs."""
+    seq = itertools.count()
+    
+    def make(**overrides) -> BTDevice:
+        n = next(seq)
+        fields = {
+            "device_key": f"bt_{n}",
+            "mac_address": f"11:22:33:44:55:{n:02X}",
+            "device_name": f"BTDevice_{n}",
+            "session_id": "test_session",
+            "first_seen": NOW,
+            "last_seen": NOW,
+        }
+        fields.update(overrides)
+        return BTDevice(**fields)
+    return make
+
+
 # =============================================================================
 # FIXTURES - DATABASE
 # =============================================================================
@@ -208,23 +260,50 @@ def temp_db_path():
         pass
 
 
+@pytest.fixture(scope="session")
+def _db_template_path(tmp_path_factory):
+    """Database file with the schema applied, built once per session."""
+    base = tmp_path_factory.mktemp("db_template")
+    db = Database(str(base / "template.db"), backup_dir=str(base / "buffer"))
+    db.initialize_schema()
+    db.close()
+    return str(db.db_path)
+
+
 @pytest.fixture
-def temp_db(temp_db_path, tmp_path):
+def temp_db(temp_db_path, tmp_path, _db_template_path):
     """Initialized temporary database."""
-    from core.database import Database
     backup_dir = tmp_path / "buffer"
     backup_dir.mkdir(exist_ok=True)
-    db = Database(temp_db_path, backup_dir=str(backup_dir))
-    db.initialize_schema()
+    # Copying the template is much cheaper than running the schema DDL
+    shutil.copyfile(_db_template_path, temp_db_path)
+    db = Database(temp_db_path, backup_dir=str(backup_dir), durable=False)
     yield db
     db.close()
 
 
+@pytest.fixture
+def wifi_device_factory(temp_db, make_wifi_device):
+    """Factory that bulk-inserts n WiFi devices into temp_db."""
+    def make(n: int, session_id: str, **overrides) -> int:
+        # Generator: each device is dropped once its row is written
+        return temp_db.insert_wifi_devices_bulk(
+            make_wifi_device(**{
+                # Distinct BSSIDs past the 256 a single octet allows
+                "bssid": f"{i // 256:02X}:{i % 256:02X}:CC:DD:EE:FF",
+                "session_id": session_id,
+                **overrides,
+            })
+            for i in range(n)
+        )
+    return make
+
+
 # =============================================================================
 # FIXTURES - CONFIG
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_config():
     """Sample configuration dictionary."""
     return {
@@ -269,27 +348,32 @@ def sample_config():
     }
 
 
+@pytest.fixture(scope="session")
+def _config_template_path(tmp_path_factory, sample_config):
+    """sample_config serialized to YAML once per session."""
+    path = tmp_path_factory.mktemp("config") / "config.yaml"
+    with open(path, "w") as f:
+        yaml.dump(sample_config, f, Dumper=_YAML_DUMPER)
+    return str(path)
+
+
 @pytest.fixture
-def temp_config_file(sample_config):
+def temp_config_file(_config_template_path, tmp_path):
     """Temporary config file."""
-    import yaml
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        yaml.dump(sample_config, f)
-        yield f.name
-    try:
-        os.unlink(f.name)
-    except OSError:
-        pass
+    # Per-test copy: tests append to it and load_config writes a cache beside it
+    path = tmp_path / "config.yaml"
+    shutil.copyfile(_config_template_path, path)
+    return str(path)
 
 
 # =============================================================================
 # FIXTURES - MOCK KISMET
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_kismet_devices():
-    """Mock Kismet device data."""
-    return [
+    """Mock Kismet device data (read-only; shared by the session)."""
+    devices = [
         {
             "kismet.device.base.macaddr": "AA:BB:CC:DD:EE:FF",
             "kismet.device.base.name": "TestAP",
@@ -320,9 +404,16 @@ def mock_kismet_devices():
             "kismet.device.base.key": "wifi_key_002",
         },
     ]
+    return tuple(MappingProxyType(d) for d in devices)
 
 
 @pytest.fixture
+def mock_kismet_devices_mutable(mock_kismet_devices):
+    """Per-test deep copy of mock_kismet_devices as plain dicts."""
+    return [copy.deepcopy(dict(d)) for d in mock_kismet_devices]
+
+
+@pytest.fixture(scope="session")
 def mock_kismet_response():
     """Mock Kismet API response."""
     return {
@@ -337,7 +428,7 @@ def mock_kismet_response():
 # FIXTURES - MOCK GPS
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_gps_response():
     """Mock gpsd response."""
     return {
@@ -356,7 +447,7 @@ def mock_gps_response():
 # FIXTURES - WHITELIST
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_whitelist():
     """Sample known devices whitelist."""
     return {
@@ -384,17 +475,13 @@ def sample_whitelist():
     }
 
 
-@pytest.fixture
-def temp_whitelist_file(sample_whitelist):
-    """Temporary whitelist file."""
-    import json
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+@pytest.fixture(scope="session")
+def temp_whitelist_file(tmp_path_factory, sample_whitelist):
+    """Temporary whitelist file (read-only, shared by the session)."""
+    path = tmp_path_factory.mktemp("whitelist") / "known_devices.json"
+    with open(path, "w") as f:
         json.dump(sample_whitelist, f)
-        yield f.name
-    try:
-        os.unlink(f.name)
-    except OSError:
-        pass
+    return str(path)
 
 
 # =============================================================================
@@ -413,39 +500,3 @@ def temp_log_dir():
     """Temporary log directory."""
     with tempfile.TemporaryDirectory() as d:
         yield d
-
-
-# =============================================================================
-# HELPER FUNCTIONS
-# =============================================================================
-
-def create_mock_wifi_device(
-    mac: str = "AA:BB:CC:DD:EE:FF",
-    ssid: str = "TestNetwork",
-    rssi: int = -50,
-) -> WiFiDevice:
-    """Helper to create mock WiFi device."""
-    return WiFiDevice(
-        device_key=f"key_{mac}",
-        bssid=mac,
-        essid=ssid,
-        device_type=DeviceType.AP,
-        signal_dbm=rssi,
-        session_id="test_session",
-    )
-
-
-def create_mock_bt_device(
-    mac: str = "AA:BB:CC:DD:EE:FF",
-    name: str = "TestDevice",
-    rssi: int = -60,
-) -> BTDevice:
-    """Helper to create mock BT device."""
-    return BTDevice(
-        device_key=f"key_{mac}",
-        mac_address=mac,
-        device_name=name,
-        device_type=BTDeviceType.BLE,
-        rssi=rssi,
-        session_id="test_session",
-    )
@@ -0,0 +1,262 @@
+"""
+Project Airdump - Orchestrator Tests
+
+Lifecycle and shutdown tests for the scan orchestrator, run with Kismet,
+capture and real GPS disabled.
+"""
+
+import os
+import signal
+import logging
+import sqlite3
+import threading
+import time
+import yaml
+import pytest
+from datetime import datetime, timezone
+from functools import partial
+from unittest.mock import patch
+
+from core.models import ScanStatus
+from drone.power_monitor import MockPowerMonitor
+from scanners.gps_logger import GPSPosition
+from scanners.kismet_controller import KismetDevice
+from scan_orchestrator import ScanOrchestrator
+
+# Tests don't depend on wall-clock time
+NOW = datetime(2025, 12, 25, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def make_orchestrator(tmp_path):
+    """Factory for orchestrators backed by a temp config and database."""
+    created = []
+    handlers = {
+        signum: signal.getsignal(signum)
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    
+    def make(**sections) -> ScanOrchestrator:
+        config = {
+            "general": {"main_loop_interval": 0.05, "cpu_pinning": False},
+            "database": {"path": str(tmp_path / "airdump.db")},
+            "gps": {"enabled": False, "poll_interval": 0.05},
+            "kismet": {"enabled": False},
+            "capture": {"enabled": False},
+        }
+        for section, values in sections.items():
+            config.setdefault(section, {}).update(values)
+        
+        config_file = tmp_path / f"config_{len(created)}.yaml"
+        config_file.write_text(yaml.safe_dump(config))
+        orchestrator = ScanOrchestrator(
+            config_file=str(config_file),
+            data_dir=str(tmp_path),
+            mock_gps=True,
+        )
+        created.append(orchestrator)
+        return orchestrator
+    
+    # Shutdown must not touch the host's wireless interfaces
+    with patch("scan_orchestrator.restore_managed_mode"):
+        yield make
+        for orchestrator in created:
+            orchestrator.stop()
+    
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+    app_logger = logging.getLogger("airdump")
+    for handler in app_logger.handlers[:]:
+        handler.close()
+        app_logger.removeHandler(handler)
+
+
+class TestOrchestratorLifecycle:
+    """Tests for starting, stopping and waiting on the orchestrator."""
+    
+    def test_bounded_start_stops_session(self, make_orchestrator):
+        """Test start(duration=...) returns with the session stopped."""
+        orchestrator = make_orchestrator()
+        
+        assert orchestrator.start(duration=1)
+        
+        assert orchestrator._session.status == ScanStatus.STOPPED
+        assert orchestrator._session.end_time is not None
+        assert orchestrator.wait_until_stopped(timeout=0)
+    
+    def test_stop_releases_wakeup_pipe(self, make_orchestrator):
+        """Test the wakeup pipe is closed and the previous fd restored."""
+        orchestrator = make_orchestrator()
+        assert orchestrator._sig_r >= 0 and orchestrator._sig_w >= 0
+        
+        orchestrator.start(duration=1)
+        
+        assert orchestrator._sig_r == -1
+        assert orchestrator._sig_w == -1
+        # Nothing is left registered as the wakeup fd
+        previous = signal.set_wakeup_fd(-1)
+        signal.set_wakeup_fd(previous)
+        assert previous == orchestrator._prev_wakeup_fd
+    
+    def test_concurrent_stop_waits_for_teardown(self, make_orchestrator):
+        """Test stop() from a second thread returns only after teardown."""
+        orchestrator = make_orchestrator()
+        assert orchestrator.start()
+        
+        teardown_started = threading.Event()
+        release = threading.Event()
+        
+        def slow_teardown():
+            teardown_started.set()
+            release.wait(timeout=5)
+        
+        # Runs first during teardown, holding the first stop() inside it
+        orchestrator._exit_stack.callback(slow_teardown)
+        
+        first = threading.Thread(target=orchestrator.stop)
+        first.start()
+        assert teardown_started.wait(timeout=5)
+        
+        stopped_on_return = []
+        
+        def second_stop():
+            orchestrator.stop()
+            stopped_on_return.append(orchestrator.wait_until_stopped(timeout=0))
+        
+        second = threading.Thread(target=second_stop)
+        second.start()
+        second.join(timeout=0.2)
+        assert second.is_alive()
+        
+        release.set()
+        first.join(timeout=5)
+        second.join(timeout=5)
+        assert stopped_on_return == [True]
+        assert orchestrator._session.status == ScanStatus.STOPPED
+    
+    def test_sigterm_ends_main_loop(self, make_orchestrator):
+        """Test SIGTERM stops an unbounded scan."""
+        orchestrator = make_orchestrator(general={"main_loop_interval": 60})
+        assert orchestrator.start()
+        assert not orchestrator.wait_until_stopped(timeout=0)
+        
+        os.kill(os.getpid(), signal.SIGTERM)
+        
+        assert orchestrator.wait_until_stopped(timeout=5)
+        orchestrator._main_thread.join(timeout=5)
+        assert not orchestrator._main_thread.is_alive()
+        assert orchestrator._session.status == ScanStatus.STOPPED
+
+
+    def test_low_voltage_ends_main_loop(self, make_orchestrator):
+        """Test the main loop stops once the power monitor reports shutdown."""
+        orchestrator = make_orchestrator(power={
+            "monitor_enabled": True,
+            "poll_interval": 0.05,
+            "shutdown_voltage": 3.1,
+        })
+        low_battery = partial(MockPowerMonitor, initial_voltage=3.0)
+        
+        # Leave the shutdown to the main loop rather than the monitor callback
+        with patch("scan_orchestrator.PowerMonitor", low_battery), \
+                patch.object(ScanOrchestrator, "_on_power_shutdown"):
+            started = time.monotonic()
+            assert orchestrator.start(duration=30)
+            elapsed = time.monotonic() - started
+            
+        assert isinstance(orchestrator.power_monitor, MockPowerMonitor)
+        assert orchestrator.power_monitor.last_state == "shutdown"
+        assert elapsed < 10
+        assert orchestrator._session.status == ScanStatus.STOPPED
+
+
+class TestOrchestratorShutdown:
+    """Tests for the order of orchestrator teardown steps."""
+    
+    def test_pending_writes_land_before_database_close(self, make_orchestrator, tmp_path):
+        """Test buffered GPS points, fingerprints and session totals are written before close."""
+        calls = []
+        at_close = {}
+        
+        def spy(obj, name, before=None):
+            real = getattr(obj, name)
+            
+            def call(*args, **kwargs):
+                if before:
+                    before()
+                calls.append(name)
+                return real(*args, **kwargs)
+            return patch.object(obj, name, call)
+            
+        # Keep the new device queued until shutdown flushes it
+        with patch("scan_orchestrator.FP_BATCH_WINDOW", 60):
+            orchestrator = make_orchestrator(general={"main_loop_interval": 60})
+            assert orchestrator.start()
+            
+            database = orchestrator.database
+            engine = orchestrator.fingerprint_engine
+            session_id = orchestrator.get_session_id()
+            
+            def snapshot():
+                conn = database.connect()
+                # Marked with satellites=3 to tell them from mock GPS fixes
+                at_close["gps"] = conn.execute(
+                    "SELECT COUNT(*) FROM gps_track WHERE session_id = ? AND satellites = 3",
+                    (session_id,),
+                ).fetchone()[0]
+                at_close["session"] = dict(conn.execute(
+                    "SELECT status, end_time, wifi_device_count, bt_device_count "
+                    "FROM scan_sessions WHERE session_id = ?",
+                    (session_id,),
+                ).fetchone())
+                at_close["fingerprint"] = engine.get_wifi_fingerprint("AA:BB:CC:DD:EE:FF")
+                
+            with spy(database, "insert_gps_points_bulk"), \
+                    spy(engine, "_store_wifi_device"), \
+                    spy(database, "update_session"), \
+                    spy(database, "close", before=snapshot):
+                for i in range(3):
+                    orchestrator._on_gps_update(GPSPosition(
+                        latitude=51.5074 + i * 0.0001,
+                        longitude=-0.1278,
+                        altitude=30.0,
+                        timestamp=NOW,
+                        hdop=1.0,
+                        fix_quality=1,
+                        satellites=3,
+                        valid=True,
+                    ))
+                orchestrator._on_new_device(KismetDevice(
+                    mac="AA:BB:CC:DD:EE:FF",
+                    device_type="wifi",
+                    first_seen=NOW,
+                    last_seen=NOW,
+                    channel=6,
+                    rssi=-50,
+                    ssid="HomeNet",
+                ))
+                
+                orchestrator.stop()
+                
+        # Buffers are flushed and the session finalized before the close
+        assert calls.index("_store_wifi_device") < calls.index("update_session")
+        assert max(
+            i for i, name in enumerate(calls) if name == "insert_gps_points_bulk"
+        ) < calls.index("update_session")
+        assert calls[-1] == "close"
+        
+        assert at_close["gps"] == 3
+        assert at_close["fingerprint"] is not None
+        assert at_close["session"]["status"] == ScanStatus.STOPPED.value
+        assert at_close["session"]["end_time"] is not None
+        assert at_close["session"]["wifi_device_count"] == 1
+        assert at_close["session"]["bt_device_count"] == 0
+        
+        # Nothing reopened the database after it was closed
+        assert database._connection is None
+        with sqlite3.connect(tmp_path / "airdump.db") as conn:
+            gps_rows = conn.execute(
+                "SELECT COUNT(*) FROM gps_track WHERE session_id = ? AND satellites = 3",
+                (session_id,),
+            ).fetchone()[0]
+        assert gps_rows == 3
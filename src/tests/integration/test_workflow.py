@@ -6,15 +6,17 @@ End-to-end tests for complete scan workflows and system integration.
 
 import os
 import json
+import itertools
 import pytest
 import tempfile
 from pathlib import Path
-from datetime import datetime, timezone
+from operator import itemgetter
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, MagicMock, patch
 
 from core.database import Database
 from core.models import (
-    ScanSession, WiFiDevice, BTDevice, ScanStatus, DeviceType, BTDeviceType
+    ScanSession, WiFiDevice, ScanStatus, DeviceType, BTDeviceType
 )
 from scanners.kismet_controller import KismetController, KismetDevice
 from scanners.gps_logger import GPSLogger, GPSPosition
@@ -22,18 +24,50 @@ from fingerprinting.engine import FingerprintEngine
 from analysis.analyzer import Analyzer, WhitelistComparer
 from analysis.reporter import Reporter
 
+# Tests don't depend on wall-clock time
+NOW = datetime(2025, 12, 25, 12, 0, tzinfo=timezone.utc)
+
+
+def _write_whitelist(tmp_path_factory, name: str, whitelist: dict) -> str:
+    """Write a whitelist once into a session temp dir."""
+    path = tmp_path_factory.mktemp("wl") / name
+    path.write_text(json.dumps(whitelist, separators=(",", ":")))
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def analysis_whitelist_path(tmp_path_factory):
+    """Whitelist naming the first two generated devices."""
+    return _write_whitelist(tmp_path_factory, "whitelist.json", {
+        "wifi_devices": [
+            {"mac": "AA:BB:CC:DD:EE:00", "name": "Known Device 1"},
+            {"mac": "AA:BB:CC:DD:EE:01", "name": "Known Device 2"},
+        ],
+    })
+
+
+@pytest.fixture(scope="session")
+def corp_whitelist_path(tmp_path_factory):
+    """Known infrastructure whitelist for the property audit."""
+    return _write_whitelist(tmp_path_factory, "corp.json", {
+        "wifi_devices": [
+            {"mac": "AA:BB:CC:00:00:01", "name": "Main AP 1", "category": "infrastructure"},
+            {"mac": "AA:BB:CC:00:00:02", "name": "Main AP 2", "category": "infrastructure"},
+            {"mac": "AA:BB:CC:00:00:03", "name": "Guest AP", "category": "infrastructure"},
+        ],
+        "oui_whitelist": ["AA:BB:CC"],  # Corporate OUI
+    })
+
 
 class TestDatabaseWorkflow:
     """Integration tests for database operations."""
     
-    def test_complete_scan_session_workflow(self, temp_db):
+    def test_complete_scan_session_workflow(self, temp_db, make_wifi_device, make_bt_device):
         """Test complete scan session from start to finish."""
-        temp_db.initialize_schema()
-        
         # 1. Create session
         session = ScanSession(
             session_id="integration_test_001",
-            start_time=datetime.now(timezone.utc),
+            start_time=NOW,
             status=ScanStatus.RUNNING,
             property_id="TEST-FACILITY",
             operator="test_user",
@@ -42,9 +76,7 @@ class TestDatabaseWorkflow:
         
         # 2. Add WiFi devices
         for i in range(5):
-            device = WiFiDevice(
-                device_key=f"wifi_device_{i}",
-                bssid=f"AA:BB:CC:DD:EE:{i:02X}",
+            device = make_wifi_device(
                 essid=f"TestNetwork_{i}",
                 session_id="integration_test_001",
                 device_type=DeviceType.AP if i % 2 == 0 else DeviceType.CLIENT,
@@ -53,25 +85,18 @@ class TestDatabaseWorkflow:
                 gps_lat=51.5074 + i * 0.0001,
                 gps_lon=-0.1278 - i * 0.0001,
                 gps_valid=True,
-                first_seen=datetime.now(timezone.utc),
-                last_seen=datetime.now(timezone.utc),
             )
             temp_db.insert_wifi_device(device)
             
         # 3. Add Bluetooth devices
         for i in range(3):
-            device = BTDevice(
-                device_key=f"bt_device_{i}",
-                mac_address=f"11:22:33:44:55:{i:02X}",
-                device_name=f"BTDevice_{i}",
+            device = make_bt_device(
                 session_id="integration_test_001",
                 device_type=BTDeviceType.CLASSIC if i % 2 == 0 else BTDeviceType.BLE,
                 rssi=-50 - i * 5,
                 gps_lat=51.5074,
                 gps_lon=-0.1278,
                 gps_valid=True,
-                first_seen=datetime.now(timezone.utc),
-                last_seen=datetime.now(timezone.utc),
             )
             temp_db.insert_bt_device(device)
             
@@ -89,7 +114,7 @@ class TestDatabaseWorkflow:
             
         # 5. End session
         session.status = ScanStatus.STOPPED
-        session.end_time = datetime.now(timezone.utc)
+        session.end_time = NOW + timedelta(minutes=30)
         session.wifi_device_count = 5
         session.bt_device_count = 3
         temp_db.update_session(session)
@@ -114,19 +139,30 @@ class TestDatabaseWorkflow:
         assert stats["gps_points"] == 10
 
 
+@pytest.fixture(scope="module")
+def _shared_fp_engine():
+    """One FingerprintEngine for the module's fingerprinting tests."""
+    return FingerprintEngine(auto_store=False)
+
+
+@pytest.fixture
+def fp_engine(_shared_fp_engine):
+    """Shared FingerprintEngine, reset after each test."""
+    yield _shared_fp_engine
+    _shared_fp_engine.reset()
+
+
 class TestFingerprintingWorkflow:
     """Integration tests for fingerprinting workflow."""
     
-    def test_wifi_fingerprinting_workflow(self):
+    def test_wifi_fingerprinting_workflow(self, fp_engine):
         """Test complete WiFi fingerprinting workflow."""
-        engine = FingerprintEngine(auto_store=False)
-        
         # Process multiple probes from same device
         mac = "AA:BB:CC:DD:EE:FF"
         ssids = ["Network1", "Network2", "HomeWiFi"]
         
         for ssid in ssids:
-            fp = engine.process_wifi_probe(
+            fp = fp_engine.process_wifi_probe(
                 mac=mac,
                 ssid=ssid,
                 rssi=-45,
@@ -136,20 +172,33 @@ class TestFingerprintingWorkflow:
             )
             
         # Verify fingerprint data
-        stats = engine.get_stats()
+        stats = fp_engine.get_stats()
         assert stats["wifi_fingerprints"] == 3
         
         # Get signature data
-        sig_data = engine.wifi.get_signature_data(mac)
+        sig_data = fp_engine.wifi.get_signature_data(mac)
         assert sig_data is not None
         assert len(sig_data.get("probed_ssids", [])) == 3
         
-    def test_bluetooth_fingerprinting_workflow(self):
-        """Test complete Bluetooth fingerprinting workflow."""
-        engine = FingerprintEngine(auto_store=False)
+    @pytest.mark.parametrize("ssid", ["Network1", "Network2", "HomeWiFi"])
+    def test_single_probe_fingerprint(self, fp_engine, ssid):
+        """Test each probe starts from a clean engine."""
+        fp_engine.process_wifi_probe(
+            mac="AA:BB:CC:DD:EE:FF",
+            ssid=ssid,
+            rssi=-45,
+            supported_rates=[6, 12, 24, 48, 54],
+            channel=6,
+        )
+        
+        assert fp_engine.get_stats()["wifi_fingerprints"] == 1
+        sig_data = fp_engine.wifi.get_signature_data("AA:BB:CC:DD:EE:FF")
+        assert sig_data["probed_ssids"] == [ssid]
         
+    def test_bluetooth_fingerprinting_workflow(self, fp_engine):
+        """Test complete Bluetooth fingerprinting workflow."""
         # Process BT device
-        fp = engine.process_bluetooth_device(
+        fp = fp_engine.process_bluetooth_device(
             mac="11:22:33:44:55:66",
             name="iPhone 14",
             rssi=-50,
@@ -159,42 +208,39 @@ class TestFingerprintingWorkflow:
         )
         
         assert len(fp) == 64
-        stats = engine.get_stats()
+        stats = fp_engine.get_stats()
         assert stats["bt_fingerprints"] == 1
 
 
 class TestAnalysisWorkflow:
     """Integration tests for analysis workflow."""
     
-    def test_complete_analysis_workflow(self, temp_db, tmp_path):
+    def test_complete_analysis_workflow(
+        self, temp_db, tmp_path, make_wifi_device, analysis_whitelist_path
+    ):
         """Test complete analysis from scan to report."""
         # Setup database with scan data
-        temp_db.initialize_schema()
-        
         # Create session
         session = ScanSession(
             session_id="analysis_test_001",
-            start_time=datetime.now(timezone.utc),
+            start_time=NOW,
             status=ScanStatus.STOPPED,
-            end_time=datetime.now(timezone.utc),
+            end_time=NOW + timedelta(minutes=30),
         )
         temp_db.create_session(session)
         
-        # Add devices
-        for i in range(10):
-            device = WiFiDevice(
-                device_key=f"wifi_{i}",
-                bssid=f"AA:BB:CC:DD:EE:{i:02X}",
+        # Add devices (BSSIDs run AA:BB:CC:DD:EE:00 upwards)
+        temp_db.insert_wifi_devices_bulk([
+            make_wifi_device(
                 essid=f"Network_{i}",
                 session_id="analysis_test_001",
                 signal_dbm=-45 - i * 3,
                 gps_lat=51.5074 + i * 0.0001,
                 gps_lon=-0.1278,
                 gps_valid=True,
-                first_seen=datetime.now(timezone.utc),
-                last_seen=datetime.now(timezone.utc),
             )
-            temp_db.insert_wifi_device(device)
+            for i in range(10)
+        ])
             
         # Add GPS track
         for i in range(5):
@@ -205,21 +251,10 @@ class TestAnalysisWorkflow:
                 alt=30.0,
             )
             
-        # Create whitelist
-        whitelist = {
-            "wifi_devices": [
-                {"mac": "AA:BB:CC:DD:EE:00", "name": "Known Device 1"},
-                {"mac": "AA:BB:CC:DD:EE:01", "name": "Known Device 2"},
-            ],
-        }
-        whitelist_path = tmp_path / "whitelist.json"
-        with open(whitelist_path, "w") as f:
-            json.dump(whitelist, f)
-            
         # Run analysis - pass whitelist_file at init time
         analyzer = Analyzer(
             database=temp_db,
-            whitelist_file=str(whitelist_path),
+            whitelist_file=analysis_whitelist_path,
         )
         result = analyzer.analyze_session("analysis_test_001")
         
@@ -231,38 +266,44 @@ class TestAnalysisWorkflow:
         # Generate reports
         reporter = Reporter(output_dir=str(tmp_path))
         
-        json_path = reporter.generate_json_report(result)
+        json_path, report_data = reporter.generate_json_report_with_data(result)
         assert Path(json_path).exists()
         
         # Verify JSON report content
-        with open(json_path) as f:
-            report_data = json.load(f)
         assert report_data["summary"]["total_wifi_devices"] == 10
 
 
+@pytest.fixture
+def kismet_controller():
+    """KismetController without a server behind it."""
+    # Per test: tests register callbacks on it, and construction is cheap
+    return KismetController(host="localhost", port=2501)
+
+
+@pytest.fixture(scope="module")
+def gps_logger_with_fix():
+    """GPSLogger holding a simulated 3D fix, shared by the module."""
+    gps = GPSLogger(host="localhost", port=2947)
+    gps._current_position = GPSPosition(
+        latitude=51.5074,
+        longitude=-0.1278,
+        altitude=30.0,
+        timestamp=NOW,
+        valid=True,
+    )
+    return gps
+
+
 class TestScannerIntegration:
     """Integration tests for scanner coordination."""
     
-    def test_kismet_gps_integration(self):
+    def test_kismet_gps_integration(self, kismet_controller, gps_logger_with_fix):
         """Test Kismet and GPS logger integration."""
-        # Create instances (without actual hardware)
-        kismet = KismetController(host="localhost", port=2501)
-        gps = GPSLogger(host="localhost", port=2947)
-        
-        # Simulate GPS position
-        gps._current_position = GPSPosition(
-            latitude=51.5074,
-            longitude=-0.1278,
-            altitude=30.0,
-            timestamp=datetime.now(timezone.utc),
-            valid=True,
-        )
-        
         # Simulate device discovery with GPS tagging
         devices_with_gps = []
         
         def on_new_device(device):
-            lat, lon, alt, ts = gps.get_current_position()
+            lat, lon, alt, ts = gps_logger_with_fix.get_current_position()
             devices_with_gps.append({
                 "device": device,
                 "gps_lat": lat,
@@ -270,22 +311,21 @@ class TestScannerIntegration:
                 "gps_alt": alt,
             })
             
-        kismet.register_new_device_callback(on_new_device)
+        kismet_controller.register_new_device_callback(on_new_device)
         
         # Simulate device discovery
         test_device = KismetDevice(
             mac="AA:BB:CC:DD:EE:FF",
             device_type="wifi",
-            first_seen=datetime.now(timezone.utc),
-            last_seen=datetime.now(timezone.utc),
+            first_seen=NOW,
+            last_seen=NOW,
             channel=6,
             rssi=-45,
             ssid="TestNetwork",
         )
         
-        for callback in kismet._new_device_callbacks:
-            callback(test_device)
-            
+        kismet_controller._dispatch_new_device(test_device)
+        
         assert len(devices_with_gps) == 1
         assert devices_with_gps[0]["gps_lat"] == 51.5074
 
@@ -293,17 +333,15 @@ class TestScannerIntegration:
 class TestEndToEndScenarios:
     """End-to-end scenario tests."""
     
-    def test_property_audit_scenario(self, temp_db, tmp_path):
+    def test_property_audit_scenario(self, temp_db, tmp_path, corp_whitelist_path):
         """Test complete property audit scenario."""
-        temp_db.initialize_schema()
-        
         # Scenario: Drone performs property audit
         session_id = "AUDIT_20251225_001"
         
         # 1. Start scan session
         session = ScanSession(
             session_id=session_id,
-            start_time=datetime.now(timezone.utc),
+            start_time=NOW,
             status=ScanStatus.RUNNING,
             property_id="CORP-HQ-BUILDING-A",
             operator="security_team",
@@ -338,47 +376,33 @@ class TestEndToEndScenarios:
                 gps_lat=51.5074 + i * 0.0001,
                 gps_lon=-0.1278 - i * 0.0001,
                 gps_valid=True,
-                first_seen=datetime.now(timezone.utc),
-                last_seen=datetime.now(timezone.utc),
+                first_seen=NOW,
+                last_seen=NOW,
             )
             temp_db.insert_wifi_device(device)
             
         # 3. End session
         session.status = ScanStatus.STOPPED
-        session.end_time = datetime.now(timezone.utc)
+        session.end_time = NOW + timedelta(minutes=30)
         temp_db.update_session(session)
         
-        # 4. Create whitelist (known infrastructure)
-        whitelist = {
-            "wifi_devices": [
-                {"mac": "AA:BB:CC:00:00:01", "name": "Main AP 1", "category": "infrastructure"},
-                {"mac": "AA:BB:CC:00:00:02", "name": "Main AP 2", "category": "infrastructure"},
-                {"mac": "AA:BB:CC:00:00:03", "name": "Guest AP", "category": "infrastructure"},
-            ],
-            "oui_whitelist": ["AA:BB:CC"],  # Corporate OUI
-        }
-        whitelist_path = tmp_path / "corp_whitelist.json"
-        with open(whitelist_path, "w") as f:
-            json.dump(whitelist, f)
-            
-        # 5. Run analysis - pass whitelist_file at init time
+        # 4. Run analysis against the known infrastructure whitelist
         analyzer = Analyzer(
             database=temp_db,
-            whitelist_file=str(whitelist_path),
+            whitelist_file=corp_whitelist_path,
         )
         result = analyzer.analyze_session(session_id)
         
-        # 6. Generate report
+        # 5. Generate report
         reporter = Reporter(output_dir=str(tmp_path))
-        json_path = reporter.generate_json_report(result)
+        json_path, report = reporter.generate_json_report_with_data(result)
         
-        # 7. Verify findings
+        # 6. Verify findings
         assert result.known_devices == 3  # Infrastructure
         assert result.unknown_devices >= 2  # Unknown devices
         
-        # Check report file
-        with open(json_path) as f:
-            report = json.load(f)
+        # Check report contents
+        assert Path(json_path).exists()
         assert report["session_id"] == session_id
         
     def test_swarm_data_consolidation(self, tmp_path):
@@ -387,39 +411,44 @@ class TestEndToEndScenarios:
         drone_dbs = {}
         for drone_name in ["drone_alpha", "drone_beta"]:
             db_path = tmp_path / f"{drone_name}.db"
-            db = Database(str(db_path))
+            db = Database(str(db_path), backup_dir=str(tmp_path / "buffer"), durable=False)
             db.initialize_schema()
             drone_dbs[drone_name] = db
             
         swarm_session_id = "SWARM_20251225_001"
         
-        # Add sessions and devices to each drone
+        # Add sessions to each drone
         for drone_name, db in drone_dbs.items():
             session = ScanSession(
                 session_id=f"{swarm_session_id}_{drone_name}",
-                start_time=datetime.now(timezone.utc),
+                start_time=NOW,
                 status=ScanStatus.STOPPED,
                 node_id=drone_name,
                 swarm_session_id=swarm_session_id,
             )
             db.create_session(session)
             
-            # Each drone discovers some unique and some overlapping devices
-            for i in range(3):
-                device = WiFiDevice(
-                    device_key=f"{drone_name}_device_{i}",
-                    bssid=f"AA:BB:CC:DD:EE:{ord(drone_name[6]):02X}",  # Overlapping
-                    essid="SharedNetwork",
-                    session_id=session.session_id,
-                    first_seen=datetime.now(timezone.utc),
-                    last_seen=datetime.now(timezone.utc),
-                )
-                db.insert_wifi_device(device)
-                
+        # Each drone discovers some unique and some overlapping devices;
+        # product() yields them grouped by drone, one batch insert each
+        devices = [
+            (drone_name, WiFiDevice(
+                device_key=f"{drone_name}_device_{i}",
+                bssid=f"AA:BB:CC:DD:EE:{ord(drone_name[6]):02X}",  # Overlapping
+                essid="SharedNetwork",
+                session_id=f"{swarm_session_id}_{drone_name}",
+                first_seen=NOW,
+                last_seen=NOW,
+            ))
+            for drone_name, i in itertools.product(drone_dbs, range(3))
+        ]
+        for drone_name, group in itertools.groupby(devices, key=itemgetter(0)):
+            drone_dbs[drone_name].insert_wifi_devices_bulk([d for _, d in group])
+            
         # Verify both databases have data
         for drone_name, db in drone_dbs.items():
             sessions = db.get_sessions()
             assert len(sessions) == 1
+            assert len(db.get_wifi_devices(f"{swarm_session_id}_{drone_name}")) == 3
             
         # Close databases
         for db in drone_dbs.values():
@@ -431,12 +460,10 @@ class TestErrorHandling:
     
     def test_graceful_database_error_handling(self, temp_db):
         """Test graceful handling of database errors."""
-        temp_db.initialize_schema()
-        
         # Create session
         session = ScanSession(
             session_id="error_test",
-            start_time=datetime.now(timezone.utc),
+            start_time=NOW,
         )
         temp_db.create_session(session)
         
@@ -448,11 +475,9 @@ class TestErrorHandling:
         
     def test_missing_gps_data_handling(self, temp_db):
         """Test handling of missing GPS data."""
-        temp_db.initialize_schema()
-        
         session = ScanSession(
             session_id="no_gps_test",
-            start_time=datetime.now(timezone.utc),
+            start_time=NOW,
         )
         temp_db.create_session(session)
         
@@ -464,8 +489,8 @@ class TestErrorHandling:
             gps_lat=None,
             gps_lon=None,
             gps_valid=False,
-            first_seen=datetime.now(timezone.utc),
-            last_seen=datetime.now(timezone.utc),
+            first_seen=NOW,
+            last_seen=NOW,
         )
         temp_db.insert_wifi_device(device)
         
@@ -480,27 +505,17 @@ class TestErrorHandling:
 class TestPerformance:
     """Performance-related integration tests."""
     
-    def test_large_device_count(self, temp_db):
+    @pytest.mark.parametrize("device_count", [100, 500])
+    def test_large_device_count(self, temp_db, wifi_device_factory, device_count):
         """Test handling large number of devices."""
-        temp_db.initialize_schema()
-        
         session = ScanSession(
             session_id="perf_test",
-            start_time=datetime.now(timezone.utc),
+            start_time=NOW,
         )
         temp_db.create_session(session)
         
         # Insert many devices
-        device_count = 500
-        for i in range(device_count):
-            device = WiFiDevice(
-                device_key=f"device_{i}",
-                bssid=f"{i // 256:02X}:{i % 256:02X}:CC:DD:EE:FF",
-                session_id="perf_test",
-                first_seen=datetime.now(timezone.utc),
-                last_seen=datetime.now(timezone.utc),
-            )
-            temp_db.insert_wifi_device(device)
+        assert wifi_device_factory(device_count, "perf_test") == device_count
             
         # Verify all inserted
         devices = temp_db.get_wifi_devices("perf_test")
@@ -377,6 +377,21 @@ class TestReporter:
             data = json.load(f)
         assert data["session_id"] == "20251225_120000"
         
+    def test_generate_json_report_with_data(self, reporter):
+        """Test the returned report data matches what was written."""
+        result = AnalysisResult(
+            session_id="20251225_120000",
+            analysis_time=datetime(2025, 12, 25, 12, 0, tzinfo=timezone.utc),
+            total_wifi_devices=5,
+        )
+        
+        filepath, data = reporter.generate_json_report_with_data(result, pretty=False)
+        with open(filepath) as f:
+            written = json.load(f)
+        assert data == result.to_dict()
+        assert written["summary"] == data["summary"]
+        assert written["session_id"] == data["session_id"]
+        
     @patch("analysis.reporter.JINJA_AVAILABLE", True)
     def test_generate_html_report(self, reporter, tmp_path):
         """Test HTML report generation."""
@@ -13,7 +13,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from core.database import Database, SCHEMA
+from core.database import Database, SCHEMA, SCHEMA_VERSION
 from core.models import (
     ScanSession, WiFiDevice, BTDevice, FingerprintSignature,
     PcapFile, DJIFlight, DJIPhoto, SwarmSession,
@@ -43,7 +43,6 @@ class TestDatabaseConnection:
         
     def test_row_factory_dict_access(self, temp_db):
         """Test row factory provides dict-like access."""
-        temp_db.initialize_schema()
         conn = temp_db.connect()
         conn.execute("INSERT INTO scan_sessions (session_id, start_time, status) VALUES (?, ?, ?)",
                      ("test_session", "2025-01-01T00:00:00", "running"))
@@ -64,6 +63,21 @@ class TestDatabaseConnection:
         assert "wifi_devices" in table_names
         assert "bt_devices" in table_names
         assert "gps_track" in table_names
+        
+    def test_initialize_schema_skips_current_version(self, temp_db):
+        """Test schema DDL only runs when user_version is behind."""
+        conn = temp_db.connect()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        conn.execute("DROP TABLE gps_track")
+        
+        temp_db.initialize_schema()
+        tables = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master")}
+        assert "gps_track" not in tables
+        
+        conn.execute("PRAGMA user_version = 0")
+        temp_db.initialize_schema()
+        tables = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master")}
+        assert "gps_track" in tables
 
 
 class TestTransactionContext:
@@ -71,7 +85,6 @@ class TestTransactionContext:
     
     def test_transaction_commit(self, temp_db):
         """Test successful transaction commits."""
-        temp_db.initialize_schema()
         with temp_db.transaction() as conn:
             conn.execute(
                 "INSERT INTO scan_sessions (session_id, start_time, status) VALUES (?, ?, ?)",
@@ -85,7 +98,6 @@ class TestTransactionContext:
         
     def test_transaction_rollback_on_error(self, temp_db):
         """Test failed transaction rolls back."""
-        temp_db.initialize_schema()
         try:
             with temp_db.transaction() as conn:
                 conn.execute(
@@ -107,13 +119,11 @@ class TestScanSessions:
     
     def test_create_session(self, temp_db, sample_session):
         """Test creating a scan session."""
-        temp_db.initialize_schema()
         row_id = temp_db.create_session(sample_session)
         assert row_id > 0
         
     def test_get_session(self, temp_db, sample_session):
         """Test retrieving a session by ID."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         session = temp_db.get_session(sample_session.session_id)
         assert session is not None
@@ -122,7 +132,6 @@ class TestScanSessions:
         
     def test_get_latest_session(self, temp_db):
         """Test retrieving the most recent session."""
-        temp_db.initialize_schema()
         # Create sessions with different times
         import time
         for i in range(3):
@@ -140,19 +149,16 @@ class TestScanSessions:
         
     def test_get_latest_session_empty_db(self, temp_db):
         """Test get_latest_session returns None on empty database."""
-        temp_db.initialize_schema()
         latest = temp_db.get_latest_session()
         assert latest is None
         
     def test_get_nonexistent_session(self, temp_db):
         """Test retrieving non-existent session returns None."""
-        temp_db.initialize_schema()
         session = temp_db.get_session("nonexistent")
         assert session is None
         
     def test_get_sessions_list(self, temp_db):
         """Test getting list of sessions."""
-        temp_db.initialize_schema()
         # Create multiple sessions
         for i in range(5):
             session = ScanSession(
@@ -166,7 +172,6 @@ class TestScanSessions:
         
     def test_end_session(self, temp_db, sample_session):
         """Test ending a session."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         end_time = datetime.now(timezone.utc)
         temp_db.end_session(sample_session.session_id, end_time)
@@ -175,7 +180,6 @@ class TestScanSessions:
         
     def test_update_session(self, temp_db, sample_session):
         """Test updating session values."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         sample_session.status = ScanStatus.STOPPED
@@ -194,7 +198,6 @@ class TestWiFiDevices:
     
     def test_insert_wifi_device(self, temp_db, sample_session, sample_wifi_ap):
         """Test inserting a WiFi device."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_wifi_ap.session_id = sample_session.session_id
         result = temp_db.insert_wifi_device(sample_wifi_ap)
@@ -202,7 +205,6 @@ class TestWiFiDevices:
         
     def test_get_wifi_devices(self, temp_db, sample_session, sample_wifi_ap):
         """Test getting WiFi devices for session."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_wifi_ap.session_id = sample_session.session_id
         temp_db.insert_wifi_device(sample_wifi_ap)
@@ -213,7 +215,6 @@ class TestWiFiDevices:
         
     def test_wifi_device_update_on_duplicate(self, temp_db, sample_session, sample_wifi_ap):
         """Test that duplicate device updates instead of inserting."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_wifi_ap.session_id = sample_session.session_id
         
@@ -232,7 +233,6 @@ class TestWiFiDevices:
         
     def test_get_wifi_device_by_bssid(self, temp_db, sample_session, sample_wifi_ap):
         """Test getting WiFi device by BSSID."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_wifi_ap.session_id = sample_session.session_id
         temp_db.insert_wifi_device(sample_wifi_ap)
@@ -246,7 +246,6 @@ class TestWiFiDevices:
         
     def test_get_wifi_unknown_only(self, temp_db, sample_session, sample_wifi_ap):
         """Test filtering for unknown devices only."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         # Insert known device
@@ -273,7 +272,6 @@ class TestWiFiDevices:
         
     def test_update_wifi_known_status(self, temp_db, sample_session, sample_wifi_ap):
         """Test updating device known status."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_wifi_ap.session_id = sample_session.session_id
         temp_db.insert_wifi_device(sample_wifi_ap)
@@ -289,6 +287,32 @@ class TestWiFiDevices:
         )
         assert updated["is_known"] == 1
         assert updated["identified_as"] == "Office Router"
+        
+    def test_insert_wifi_devices_bulk(self, temp_db, sample_session, sample_wifi_ap):
+        """Test bulk insert stores rows matching the single insert path."""
+        temp_db.create_session(sample_session)
+        sample_wifi_ap.session_id = sample_session.session_id
+        other = WiFiDevice(
+            device_key="bulk_key",
+            bssid="11:22:33:44:55:66",
+            session_id=sample_session.session_id,
+            seen_by_nodes=["drone_alpha"],
+        )
+        
+        assert temp_db.insert_wifi_devices_bulk([sample_wifi_ap, other]) == 2
+        assert temp_db.insert_wifi_devices_bulk([]) == 0
+        streamed = (
+            WiFiDevice(device_key=f"gen_{i}", bssid=f"22:22:22:22:22:{i:02X}",
+                       session_id=sample_session.session_id)
+            for i in range(3)
+        )
+        assert temp_db.insert_wifi_devices_bulk(streamed) == 3
+        
+        devices = temp_db.get_wifi_devices(sample_session.session_id)
+        assert len(devices) == 5
+        assert {sample_wifi_ap.bssid, other.bssid} <= {d["bssid"] for d in devices}
+        stored = temp_db.get_wifi_device_by_bssid(sample_session.session_id, other.bssid)
+        assert json.loads(stored["seen_by_nodes"]) == ["drone_alpha"]
 
 
 class TestBluetoothDevices:
@@ -296,7 +320,6 @@ class TestBluetoothDevices:
     
     def test_insert_bt_device(self, temp_db, sample_session, sample_bt_classic):
         """Test inserting a Bluetooth device."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_bt_classic.session_id = sample_session.session_id
         result = temp_db.insert_bt_device(sample_bt_classic)
@@ -304,7 +327,6 @@ class TestBluetoothDevices:
         
     def test_get_bt_devices(self, temp_db, sample_session, sample_bt_classic, sample_bt_ble):
         """Test getting Bluetooth devices for session."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         sample_bt_classic.session_id = sample_session.session_id
@@ -317,7 +339,6 @@ class TestBluetoothDevices:
         
     def test_bt_device_update_on_duplicate(self, temp_db, sample_session, sample_bt_classic):
         """Test BT device update on duplicate."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_bt_classic.session_id = sample_session.session_id
         
@@ -337,7 +358,6 @@ class TestGPSTrack:
     
     def test_insert_gps_point(self, temp_db, sample_session):
         """Test inserting GPS point."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         temp_db.insert_gps_point(
@@ -356,7 +376,6 @@ class TestGPSTrack:
         
     def test_get_gps_track_ordered(self, temp_db, sample_session):
         """Test GPS track is ordered by timestamp."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         # Insert points in reverse order
@@ -372,6 +391,30 @@ class TestGPSTrack:
         track = temp_db.get_gps_track(sample_session.session_id)
         # Should be ordered by timestamp ascending
         assert track[0]["latitude"] < track[-1]["latitude"]
+        
+    def test_insert_gps_points_bulk(self, temp_db, sample_session):
+        """Test inserting a batch of GPS points in one call."""
+        temp_db.create_session(sample_session)
+        
+        points = [
+            (51.5 + i * 0.001, -0.1, 30.0, 5.0, 90.0, 1, 1.2, 8,
+             datetime(2025, 1, 1, 12, i, 0))
+            for i in range(10)
+        ]
+        inserted = temp_db.insert_gps_points_bulk(sample_session.session_id, points)
+        
+        assert inserted == 10
+        track = temp_db.get_gps_track(sample_session.session_id)
+        assert len(track) == 10
+        assert track[0]["hdop"] == 1.2
+        assert track[0]["satellites"] == 8
+        
+    def test_insert_gps_points_bulk_empty(self, temp_db, sample_session):
+        """Test empty batch is a no-op."""
+        temp_db.create_session(sample_session)
+        
+        assert temp_db.insert_gps_points_bulk(sample_session.session_id, []) == 0
+        assert temp_db.get_gps_track(sample_session.session_id) == []
 
 
 class TestFingerprintSignatures:
@@ -379,7 +422,6 @@ class TestFingerprintSignatures:
     
     def test_insert_signature(self, temp_db):
         """Test inserting fingerprint signature."""
-        temp_db.initialize_schema()
         sig = FingerprintSignature(
             fingerprint_hash="abc123hash",
             device_type="smartphone",
@@ -392,7 +434,6 @@ class TestFingerprintSignatures:
         
     def test_get_signature(self, temp_db):
         """Test getting signature by hash."""
-        temp_db.initialize_schema()
         sig = FingerprintSignature(
             fingerprint_hash="lookup_hash",
             device_type="laptop",
@@ -408,7 +449,6 @@ class TestFingerprintSignatures:
         
     def test_signature_times_seen_increment(self, temp_db):
         """Test times_seen increments on duplicate."""
-        temp_db.initialize_schema()
         sig = FingerprintSignature(
             fingerprint_hash="dup_hash",
             device_type="phone",
@@ -424,7 +464,6 @@ class TestFingerprintSignatures:
         
     def test_get_all_signatures(self, temp_db):
         """Test getting all signatures."""
-        temp_db.initialize_schema()
         for i in range(3):
             sig = FingerprintSignature(
                 fingerprint_hash=f"hash_{i}",
@@ -442,7 +481,6 @@ class TestPcapFiles:
     
     def test_insert_pcap(self, temp_db, sample_session):
         """Test inserting pcap record."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         pcap = PcapFile(
@@ -464,7 +502,6 @@ class TestDJIIntegration:
     
     def test_insert_dji_flight(self, temp_db, sample_session):
         """Test inserting DJI flight record."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         flight = DJIFlight(
@@ -479,7 +516,6 @@ class TestDJIIntegration:
         
     def test_insert_dji_photo(self, temp_db, sample_session):
         """Test inserting DJI photo record."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         photo = DJIPhoto(
@@ -495,7 +531,6 @@ class TestDJIIntegration:
         
     def test_update_device_gps(self, temp_db, sample_session, sample_wifi_ap):
         """Test updating device GPS from DJI data."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         sample_wifi_ap.session_id = sample_session.session_id
         temp_db.insert_wifi_device(sample_wifi_ap)
@@ -518,7 +553,6 @@ class TestSwarmSessions:
     
     def test_create_swarm_session(self, temp_db):
         """Test creating a swarm session."""
-        temp_db.initialize_schema()
         swarm = SwarmSession(
             swarm_session_id="SWARM_20251225_001",
             start_time=datetime.now(timezone.utc),
@@ -534,7 +568,6 @@ class TestSpatialQueries:
     
     def test_get_devices_near(self, temp_db, sample_session):
         """Test finding devices near a point."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         # Insert devices at various locations
@@ -567,7 +600,6 @@ class TestSessionStatistics:
     
     def test_get_session_stats(self, temp_db, sample_session, sample_wifi_ap, sample_bt_classic):
         """Test getting session statistics."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         # Add some devices
@@ -608,9 +640,22 @@ class TestBufferRecovery:
             
     def test_flush_buffer(self, temp_db, sample_session):
         """Test flush buffer commits pending writes."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         temp_db.flush_buffer()  # Should not raise
+        
+    def test_wal_uses_normal_sync(self, tmp_path):
+        """Test WAL connections skip per-commit fsync (synchronous=NORMAL)."""
+        db = Database(str(tmp_path / "durable.db"), backup_dir=str(tmp_path))
+        conn = db.connect()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        db.close()
+        
+    def test_non_durable_skips_journal_and_fsync(self, temp_db):
+        """Test throwaway databases keep the journal in memory without fsync."""
+        conn = temp_db.connect()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
 
 
 class TestReadOnlyMode:
@@ -618,7 +663,6 @@ class TestReadOnlyMode:
     
     def test_readonly_wal_graceful(self, temp_db):
         """Test read-only database handles WAL pragma gracefully."""
-        temp_db.initialize_schema()
         temp_db.close()
         
         # Reopen - WAL should work or be skipped
@@ -631,7 +675,6 @@ class TestEdgeCases:
     
     def test_empty_session_no_devices(self, temp_db, sample_session):
         """Test getting devices from empty session."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         devices = temp_db.get_wifi_devices(sample_session.session_id)
@@ -639,7 +682,6 @@ class TestEdgeCases:
         
     def test_duplicate_session_id_fails(self, temp_db, sample_session):
         """Test duplicate session ID raises error."""
-        temp_db.initialize_schema()
         temp_db.create_session(sample_session)
         
         with pytest.raises(sqlite3.IntegrityError):
@@ -558,6 +558,26 @@ class TestFingerprintEngine:
         assert stats["wifi_fingerprints"] == 1
         assert stats["bt_fingerprints"] == 1
         
+    def test_process_kismet_devices_batch(self, engine):
+        """Test batch processing of Kismet devices."""
+        now = datetime.now()
+        devices = [
+            Mock(device_type="wifi", mac="AA:BB:CC:DD:EE:01", ssid="Net",
+                 rssi=-45, channel=6, last_seen=now),
+            Mock(device_type="bluetooth", mac="11:22:33:44:55:66", bt_name="Device",
+                 rssi=-60, bt_type="ble", last_seen=now),
+            Mock(device_type="unknown", mac="AA:BB:CC:DD:EE:02"),
+        ]
+        
+        results = engine.process_kismet_devices_batch(devices)
+        
+        assert len(results) == 3
+        assert len(results[0]) == 64
+        assert len(results[1]) == 64
+        assert results[2] is None
+        assert engine._stats["wifi_fingerprints"] == 1
+        assert engine._stats["bt_fingerprints"] == 1
+        
     def test_clear_all(self, engine):
         """Test clearing fingerprint caches."""
         engine.process_wifi_probe(
@@ -572,6 +592,20 @@ class TestFingerprintEngine:
         # Stats are cumulative, cache is cleared
         # Verify cache was cleared by checking fingerprinter
         assert len(engine.wifi._fingerprint_cache) == 0
+        
+    def test_reset_clears_stats(self, engine):
+        """Test reset clears caches and zeroes statistics."""
+        engine.process_wifi_probe(
+            mac="AA:BB:CC:DD:EE:FF",
+            ssid="Test",
+            rssi=-45,
+            supported_rates=[6, 12, 24],
+        )
+        
+        engine.reset()
+        stats = engine.get_stats()
+        assert stats["wifi_fingerprints"] == 0
+        assert stats["wifi_cache_size"] == 0
 
 
 class TestDeviceClassMappings:
@@ -129,6 +129,12 @@ class TestWiFiDevice:
         assert sample_wifi_ap.signal_dbm == -45
         assert sample_wifi_ap.encryption == "WPA2"
         
+    def test_wifi_device_is_slotted(self, sample_wifi_ap):
+        """Test WiFiDevice instances carry no per-instance __dict__."""
+        assert not hasattr(sample_wifi_ap, "__dict__")
+        with pytest.raises(AttributeError):
+            sample_wifi_ap.not_a_field = 1
+            
     def test_create_wifi_client(self, sample_wifi_client):
         """Test creating WiFi client."""
         assert sample_wifi_client.device_type == DeviceType.CLIENT
@@ -8,12 +8,17 @@ import pytest
 import time
 import json
 import threading
+import socket
+import subprocess
+import sys
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock, Mock
 
 # Import scanner modules
-from scanners.kismet_controller import KismetController, KismetDevice, ChannelHopper
-from scanners.gps_logger import GPSLogger, GPSPosition
+from scanners.kismet_controller import (
+    KismetController, KismetDevice, ChannelHopper, TRACKED_DEVICE_TYPES,
+)
+from scanners.gps_logger import GPSLogger, GPSPosition, MockGPSLogger, BatchedCallback
 
 
 class TestKismetDevice:
@@ -65,6 +70,29 @@ class TestKismetDevice:
         assert data["packets"] == 100
         assert "first_seen" in data
         
+    def test_slotted(self):
+        """Test devices carry no per-instance __dict__."""
+        device = KismetDevice(
+            mac="AA:BB:CC:DD:EE:FF",
+            device_type="wifi",
+            first_seen=datetime.now(timezone.utc),
+            last_seen=datetime.now(timezone.utc),
+        )
+        assert not hasattr(device, "__dict__")
+        
+    def test_to_json_bytes(self):
+        """Test JSON bytes match to_dict with and without orjson."""
+        device = KismetDevice(
+            mac="AA:BB:CC:DD:EE:FF",
+            device_type="wifi",
+            first_seen=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            last_seen=datetime(2024, 1, 1, 12, 5, 0, 123456, tzinfo=timezone.utc),
+            probe_ssids=["Home"],
+        )
+        assert json.loads(device.to_json_bytes()) == device.to_dict()
+        with patch("scanners.kismet_controller.ORJSON_AVAILABLE", False):
+            assert json.loads(device.to_json_bytes()) == device.to_dict()
+            
     def test_default_values(self):
         """Test default field values."""
         device = KismetDevice(
@@ -99,6 +127,13 @@ class TestKismetController:
         assert controller._running is False
         assert controller._devices == {}
         
+    def test_session_keepalive_adapter(self, controller):
+        """Test the HTTP session pools keep-alive connections."""
+        adapter = controller._session.get_adapter("http://localhost:2501/")
+        assert adapter._pool_maxsize == 4
+        pool = adapter.poolmanager.connection_from_url("http://localhost:2501/")
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in pool.conn_kw["socket_options"]
+        
     @patch("requests.Session.get")
     def test_check_connection_success(self, mock_get, controller):
         """Test successful connection check."""
@@ -147,6 +182,19 @@ class TestKismetController:
         assert len(sources) == 1
         assert sources[0]["uuid"] == "abc-123"
         
+    @patch("requests.Session.get")
+    def test_api_request_decodes_content(self, mock_get, controller):
+        """Test responses decode the same with and without orjson."""
+        mock_response = Mock()
+        mock_response.content = b'[{"kismet.device.base.channel": 6}]'
+        mock_response.json.side_effect = lambda: json.loads(mock_response.content)
+        mock_get.return_value = mock_response
+        
+        expected = [{"kismet.device.base.channel": 6}]
+        assert controller._api_request("/devices/all.json") == expected
+        with patch("scanners.kismet_controller.ORJSON_AVAILABLE", False):
+            assert controller._api_request("/devices/all.json") == expected
+            
     @patch("requests.Session.post")
     def test_set_channel(self, mock_post, controller):
         """Test setting channel on datasource."""
@@ -176,6 +224,47 @@ class TestKismetController:
         assert result is True
         mock_post.assert_called_once()
         
+    @patch("requests.Session.post")
+    def test_get_bluetooth_devices_single_query(self, mock_post, controller):
+        """Test classic and BLE devices are fetched with one request."""
+        mock_response = Mock()
+        mock_response.content = b'[{"kismet.device.base.type": "BTLE"}]'
+        mock_post.return_value = mock_response
+        
+        devices = controller.get_bluetooth_devices(last_time=100.0)
+        assert len(devices) == 1
+        mock_post.assert_called_once()
+        body = json.loads(mock_post.call_args.kwargs["data"])
+        assert body["regex"] == [["kismet.device.base.type", "BR/EDR|BTLE"]]
+        assert mock_post.call_args.args[0].endswith("/devices/last-time/100/devices.json")
+        
+    def test_api_token_set_on_session(self):
+        """Test the API token header is attached once to the session."""
+        controller = KismetController(api_token="secret")
+        assert controller._session.headers["KISMET"] == "secret"
+        
+    @patch("requests.Session.post")
+    def test_get_devices_unfiltered_uses_cached_body(self, mock_post, controller):
+        """Test unfiltered device query posts the pre-serialized body."""
+        mock_response = Mock()
+        mock_response.content = b'[]'
+        mock_post.return_value = mock_response
+        
+        assert controller.get_devices() == []
+        kwargs = mock_post.call_args.kwargs
+        assert kwargs["data"] is KismetController._BASE_DEVICE_BODY
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert json.loads(kwargs["data"])["fields"][0] == "kismet.device.base.macaddr"
+        
+    def test_tracked_device_query_is_prebuilt(self, controller):
+        """Test the poll query reuses the serialized fields+regex body."""
+        endpoint, body = controller._device_query(TRACKED_DEVICE_TYPES, 1700000000)
+        assert body is KismetController._TRACKED_DEVICE_BODY
+        assert endpoint == "/devices/last-time/1700000000/devices.json"
+        assert json.loads(body)["regex"] == [
+            ["kismet.device.base.type", "Wi-Fi Device|BR/EDR|BTLE"]
+        ]
+        
     def test_parse_device_wifi(self, controller):
         """Test parsing WiFi device from Kismet API response."""
         raw = {
@@ -190,15 +279,22 @@ class TestKismetController:
             "kismet.device.base.packets.total": 150,
             "dot11.device": {
                 "dot11.device.last_beaconed_ssid": "TestNetwork",
+                "dot11.device.probed_ssid_map": [
+                    {"dot11.probedssid.ssid": "Home"},
+                    {"dot11.probedssid.ssid": ""},
+                ],
             },
         }
         
         device = controller._parse_device(raw)
+        assert device.probe_ssids == ["Home"]
         assert device.mac == "AA:BB:CC:DD:EE:FF"
         assert device.device_type == "wifi"
         assert device.channel == 6
         assert device.rssi == -45
         assert device.ssid == "TestNetwork"
+        assert device.first_seen == datetime.fromtimestamp(1735142400)
+        assert controller._parse_device(raw).last_seen is device.last_seen
         
     def test_parse_device_bluetooth(self, controller):
         """Test parsing Bluetooth device from Kismet API response."""
@@ -231,6 +327,23 @@ class TestKismetController:
         assert device.device_type == "bluetooth"
         assert device.bt_type == "ble"
         
+    def test_parse_device_normalizes_mac(self, controller):
+        """Test device MACs are stored uppercase."""
+        device = controller._parse_device({
+            "kismet.device.base.macaddr": "aa:bb:cc:dd:ee:ff",
+            "kismet.device.base.type": "Wi-Fi Device",
+        })
+        assert device.mac == "AA:BB:CC:DD:EE:FF"
+        
+    def test_parse_device_unknown_type(self, controller):
+        """Test unrecognised Kismet types are marked unknown."""
+        device = controller._parse_device({
+            "kismet.device.base.macaddr": "77:88:99:AA:BB:CC",
+            "kismet.device.base.type": "Wi-Fi AP",
+        })
+        assert device.device_type == "unknown"
+        assert device.bt_type is None
+        
     def test_get_all_devices(self, controller):
         """Test getting all tracked devices."""
         # Add some devices manually
@@ -287,20 +400,174 @@ class TestKismetController:
         assert counts["bluetooth"] == 1
         assert counts["total"] == 2
         
+    def test_iter_devices_streams_with_ijson(self, controller):
+        """Test devices are streamed from the response when ijson is present."""
+        resp = Mock()
+        fake_ijson = Mock()
+        fake_ijson.items.return_value = iter([{"kismet.device.base.type": "BTLE"}])
+        with patch("scanners.kismet_controller.IJSON_AVAILABLE", True), \
+                patch("scanners.kismet_controller.ijson", fake_ijson, create=True), \
+                patch.object(controller, "_api_request", return_value=resp) as request:
+            devices = list(controller._iter_devices(last_time=100.0))
+            
+        assert devices == [{"kismet.device.base.type": "BTLE"}]
+        assert request.call_args.args[0] == "/devices/last-time/100/devices.json"
+        assert request.call_args.kwargs["stream"] is True
+        fake_ijson.items.assert_called_once_with(resp.raw, "item", use_float=True)
+        resp.close.assert_called_once()
+        
+    def test_poll_window_uses_server_clock(self, controller):
+        """Test the next poll window follows Kismet's newest last_time."""
+        windows = []
+        batches = iter([
+            [
+                {"kismet.device.base.macaddr": "AA:BB:CC:DD:EE:01",
+                 "kismet.device.base.last_time": 1700000005},
+                {"kismet.device.base.macaddr": "AA:BB:CC:DD:EE:02",
+                 "kismet.device.base.last_time": 1700000009},
+            ],
+            [],
+        ])
+        
+        def fetch(last_time=None):
+            windows.append(last_time)
+            return next(batches)
+            
+        with patch.object(controller, "_iter_devices", side_effect=fetch):
+            with patch("time.time", return_value=0.0):
+                controller._poll_devices()
+                controller._poll_devices()
+        assert windows == [None, 1700000009]
+        assert controller._server_last_time == 1700000009
+        
+    def test_poll_swaps_device_table(self, controller):
+        """Test a poll publishes a new device dict and fires callbacks."""
+        new_cb, update_cb = Mock(), Mock()
+        controller.register_new_device_callback(new_cb)
+        controller.register_update_callback(update_cb)
+        raw = {
+            "kismet.device.base.macaddr": "AA:BB:CC:DD:EE:FF",
+            "kismet.device.base.type": "Wi-Fi Device",
+        }
+        
+        with patch.object(controller, "_iter_devices", return_value=[raw]):
+            before = controller._devices
+            controller._poll_devices()
+            assert controller._devices is not before
+            assert before == {}
+            raw["kismet.device.base.last_time"] = 1735142500
+            controller._poll_devices()
+            
+        assert new_cb.call_count == 1
+        assert update_cb.call_count == 1
+        assert controller.get_device("AA:BB:CC:DD:EE:FF") is not None
+        
+    def test_poll_skips_unchanged_devices(self, controller):
+        """Test devices with unchanged activity fields are not re-processed."""
+        update_cb = Mock()
+        controller.register_update_callback(update_cb)
+        raw = {
+            "kismet.device.base.macaddr": "AA:BB:CC:DD:EE:FF",
+            "kismet.device.base.type": "Wi-Fi Device",
+            "kismet.device.base.last_time": 1735142500,
+            "kismet.device.base.packets.total": 10,
+        }
+        with patch.object(controller, "_iter_devices", return_value=[raw]):
+            controller._poll_devices()
+            controller._poll_devices()
+            assert update_cb.call_count == 0
+            
+            raw["kismet.device.base.packets.total"] = 11
+            controller._poll_devices()
+            assert update_cb.call_count == 1
+            
+    def test_idle_poll_keeps_device_table(self, controller):
+        """Test a poll with no changes neither copies the table nor stalls the window."""
+        raw = {
+            "kismet.device.base.macaddr": "AA:BB:CC:DD:EE:FF",
+            "kismet.device.base.last_time": 1735142500,
+        }
+        with patch.object(controller, "_iter_devices", return_value=[raw]):
+            controller._poll_devices()
+            table = controller._devices
+            controller._server_last_time = 0
+            controller._poll_devices()
+        assert controller._devices is table
+        assert controller._server_last_time == 1735142500
+            
+    def test_poll_callbacks_run_outside_lock(self, controller):
+        """Test device callbacks are invoked without the table lock held."""
+        held = []
+        controller.register_new_device_callback(lambda d: held.append(controller._lock.locked()))
+        raw = {
+            "kismet.device.base.macaddr": "AA:BB:CC:DD:EE:FF",
+            "kismet.device.base.type": "Wi-Fi Device",
+        }
+        with patch.object(controller, "_iter_devices", return_value=[raw]):
+            controller._poll_devices()
+        assert held == [False]
+        
+    def test_device_count_tracks_type_changes(self, controller):
+        """Test poller-maintained counts follow a device changing type."""
+        raw = {"kismet.device.base.macaddr": "AA:BB:CC:DD:EE:FF"}
+        for dev_type, expected in (("Wi-Fi Device", (1, 0)), ("BTLE", (0, 1))):
+            raw["kismet.device.base.type"] = dev_type
+            with patch.object(controller, "_iter_devices", return_value=[raw]):
+                controller._poll_devices()
+            counts = controller.get_device_count()
+            assert (counts["wifi"], counts["bluetooth"]) == expected
+            assert counts["total"] == 1
+        assert controller._device_counts[0] is controller._devices
+        
     def test_register_callback(self, controller):
         """Test callback registration."""
         callback = Mock()
         controller.register_new_device_callback(callback)
         assert callback in controller._new_device_callbacks
         
+    def test_register_callback_copy_on_write(self, controller):
+        """Test registering publishes a new tuple, leaving snapshots intact."""
+        first, second = Mock(), Mock()
+        controller.register_update_callback(first)
+        snapshot = controller._device_update_callbacks
+        controller.register_update_callback(second)
+        assert snapshot == (first,)
+        assert controller._device_update_callbacks == (first, second)
+        
+    def test_dispatch_new_device_survives_callback_error(self, controller):
+        """Test one failing new-device callback doesn't skip the others."""
+        failing = Mock(side_effect=RuntimeError("boom"))
+        ok = Mock()
+        controller.register_new_device_callback(failing)
+        controller.register_new_device_callback(ok)
+        device = Mock()
+        controller._dispatch_new_device(device)
+        ok.assert_called_once_with(device)
+        
+    def test_stop_interrupts_poll_wait(self, controller):
+        """Test stop() wakes the poll loop instead of waiting out the interval."""
+        controller.poll_interval = 60.0
+        polled = threading.Event()
+        with patch.object(controller, "check_connection", return_value=True), \
+                patch.object(controller, "_poll_devices", side_effect=polled.set):
+            assert controller.start()
+            assert polled.wait(timeout=2.0)
+            thread = controller._thread
+            start = time.monotonic()
+            controller.stop()
+        assert time.monotonic() - start < 2.0
+        assert not thread.is_alive()
+        
     def test_clear_devices(self, controller):
         """Test clearing device list."""
         controller._devices["AA:BB:CC:DD:EE:FF"] = Mock()
         controller._last_poll_time = time.time()
+        controller._server_last_time = 1700000000
         
         controller.clear_devices()
         assert controller._devices == {}
         assert controller._last_poll_time is None
+        assert controller._server_last_time == 0
 
 
 class TestChannelHopper:
@@ -339,6 +606,34 @@ class TestChannelHopper:
         assert result is False
         assert hopper._mode == "adaptive"  # unchanged
         
+    def test_set_mode_applies_rate(self, hopper):
+        """Test modes push the full hop list at their rate to the source."""
+        hopper.set_active_source("uuid-123")
+        hopper.set_mode("slow")
+        hopper.kismet.set_hop_channels.assert_called_once_with(
+            "uuid-123", hopper._ALL_CHANNELS, hopper.slow_rate
+        )
+        assert len(hopper._ALL_CHANNELS) == 36
+        
+        hopper.set_mode("lock")
+        hopper.kismet.disable_hop_mode.assert_called_once_with("uuid-123")
+        
+    def test_update_adaptive_rate_skips_small_changes(self, hopper):
+        """Test adaptive updates only reach Kismet when the rate moves."""
+        hopper.gps_logger = Mock()
+        hopper.set_active_source("uuid-123")
+        hopper.kismet.set_hop_channels.return_value = True
+        
+        for speed in (6.0, 6.1, 6.2):
+            hopper.gps_logger.get_velocity.return_value = (speed, 0.0)
+            hopper.update_adaptive_rate()
+        assert hopper.kismet.set_hop_channels.call_count == 1
+        
+        hopper.gps_logger.get_velocity.return_value = (12.0, 0.0)
+        hopper.update_adaptive_rate()
+        assert hopper.kismet.set_hop_channels.call_count == 2
+        assert hopper._applied_rate == hopper.fast_rate
+        
     def test_set_active_source(self, hopper):
         """Test setting active data source."""
         hopper.set_active_source("uuid-123")
@@ -407,12 +702,33 @@ class TestGPSPosition:
         assert data["valid"] is True
         assert "timestamp" in data
         
+    def test_to_json_bytes(self):
+        """Test JSON bytes match to_dict with and without orjson."""
+        pos = GPSPosition(
+            latitude=51.5074,
+            longitude=-0.1278,
+            altitude=30.0,
+            timestamp=datetime(2024, 1, 1, 12, 0, 0, 250000),
+            satellites=8,
+            valid=True,
+        )
+        assert json.loads(pos.to_json_bytes()) == pos.to_dict()
+        with patch("scanners.gps_logger.ORJSON_AVAILABLE", False):
+            assert json.loads(pos.to_json_bytes()) == pos.to_dict()
+            
     def test_invalid_position(self):
         """Test creating invalid position."""
         pos = GPSPosition.invalid()
         assert pos.valid is False
         assert pos.latitude == 0.0
         assert pos.longitude == 0.0
+        assert GPSPosition.invalid() is pos
+        
+    def test_position_immutable(self):
+        """Test positions cannot be modified after creation."""
+        pos = GPSPosition.invalid()
+        with pytest.raises(AttributeError):
+            pos.valid = True
 
 
 class TestGPSLogger:
@@ -436,6 +752,12 @@ class TestGPSLogger:
         assert gps_logger._running is False
         assert gps_logger._connected is False
         
+    def test_init_coerces_thresholds(self):
+        """Test fix thresholds are coerced to numeric types."""
+        gps = GPSLogger(min_hdop="5", min_satellites="6")
+        assert gps.min_hdop == 5.0
+        assert gps.min_satellites == 6
+        
     def test_get_current_position_no_fix(self, gps_logger):
         """Test getting position without fix."""
         lat, lon, alt, ts = gps_logger.get_current_position()
@@ -485,6 +807,67 @@ class TestGPSLogger:
         gps_logger.unregister_callback(callback)
         assert callback not in gps_logger._callbacks
         
+    def test_callbacks_dispatched_off_poll_thread(self):
+        """Test callbacks run on the callback executor once started."""
+        gps = MockGPSLogger(poll_interval=0.05)
+        called = threading.Event()
+        threads = []
+        
+        def callback(pos):
+            threads.append(threading.current_thread())
+            called.set()
+            
+        gps.register_callback(callback)
+        gps.connect()
+        gps.start()
+        try:
+            gps._publish_position(gps._mock_position)
+            assert called.wait(timeout=2.0)
+        finally:
+            gps.stop()
+        assert threads[0].name.startswith("gps-callbacks")
+        
+    def test_dispatch_loop_batches_queued_positions(self, gps_logger):
+        """Test queued positions reach batched and plain callbacks."""
+        batches = []
+        plain = Mock()
+        gps_logger.register_callback(BatchedCallback(batches.append))
+        gps_logger.register_callback(plain)
+        for _ in range(3):
+            gps_logger._callback_queue.put(GPSPosition.invalid())
+        gps_logger._callback_queue.put(None)
+        
+        gps_logger._dispatch_loop()
+        
+        assert len(batches) == 1
+        assert len(batches[0]) == 3
+        assert plain.call_count == 3
+        
+    def test_wait_for_fix_wakes_on_fix(self, gps_logger):
+        """Test wait_for_fix returns as soon as a valid fix is published."""
+        assert gps_logger.wait_for_fix(timeout=0.01) is False
+        pos = GPSPosition(
+            latitude=51.5,
+            longitude=-0.1,
+            altitude=0.0,
+            timestamp=datetime.now(timezone.utc),
+            valid=True,
+        )
+        threading.Timer(0.05, gps_logger._publish_position, args=(pos,)).start()
+        start = time.monotonic()
+        assert gps_logger.wait_for_fix(timeout=5.0) is True
+        assert time.monotonic() - start < 1.0
+        
+    def test_mock_seeded_jitter_repeatable(self):
+        """Test seeded mock loggers produce the same track."""
+        a = MockGPSLogger(seed=42)
+        b = MockGPSLogger(seed=42)
+        for _ in range(3):
+            a._update_position()
+            b._update_position()
+        assert [p.latitude for p in a.get_history()] == [p.latitude for p in b.get_history()]
+        assert a.has_fix() is True
+        
     def test_get_history_empty(self, gps_logger):
         """Test getting empty history."""
         history = gps_logger.get_history()
@@ -508,6 +891,26 @@ class TestGPSLogger:
         # Test limited history
         history_limited = gps_logger.get_history(count=3)
         assert len(history_limited) == 3
+        assert history_limited == history[-3:]
+        
+        # Iterator form yields the same positions
+        assert list(gps_logger.get_history_iter()) == history
+        assert list(gps_logger.get_history_iter(count=3)) == history[-3:]
+        assert len(list(gps_logger.get_history_iter(count=10))) == 5
+        
+    def test_history_bounded(self):
+        """Test history evicts oldest positions beyond history_size."""
+        gps = GPSLogger(history_size=3)
+        for i in range(5):
+            gps._position_history.append(GPSPosition(
+                latitude=float(i),
+                longitude=0.0,
+                altitude=0.0,
+                timestamp=datetime.now(timezone.utc),
+                valid=True,
+            ))
+        history = gps.get_history()
+        assert [p.latitude for p in history] == [2.0, 3.0, 4.0]
         
     def test_get_velocity_no_fix(self, gps_logger):
         """Test getting velocity without fix."""
@@ -556,6 +959,155 @@ class TestGPSLogger:
         mode = gps_logger.estimate_channel_hop_mode()
         assert mode == "fast"
         
+    def test_parse_gpsd_packet_caches_caps(self, gps_logger):
+        """Test packet capability probe is cached per packet type."""
+        class Packet:
+            mode = 3
+            sats = []
+            def position(self):
+                return (51.5, -0.1)
+            def position_precision(self):
+                raise KeyError("x")
+                
+        pos = gps_logger._parse_gpsd_packet(Packet())
+        assert pos.latitude == 51.5
+        assert pos.altitude == 0.0
+        assert pos.hdop == 99.0
+        assert gps_logger._packet_caps == (Packet, False, False, False, True)
+        
+    def test_parse_gpsd_packet_satellite_counts(self, gps_logger):
+        """Test used satellites are counted from a list or gpsd-py3 counts."""
+        class Packet:
+            mode = 2
+            def position(self):
+                return (51.5, -0.1)
+            def position_precision(self):
+                return (1.0, 2.0)
+                
+        pkt = Packet()
+        pkt.sats = [Mock(used=True)] * 5 + [Mock(used=False)]
+        assert gps_logger._parse_gpsd_packet(pkt).satellites == 5
+        
+        pkt.sats, pkt.sats_valid = 9, 6
+        pos = gps_logger._parse_gpsd_packet(pkt)
+        assert pos.satellites == 6
+        assert pos.valid is True
+        
+    def test_handle_tpv_report(self, gps_logger):
+        """Test TPV report is parsed using latest SKY data."""
+        gps_logger._handle_report(b'{"class":"SKY","hdop":1.2,"uSat":7}')
+        gps_logger._handle_report(
+            b'{"class":"TPV","mode":3,"lat":51.5,"lon":-0.12,"altMSL":31.0,"speed":2.5,"track":45.0}'
+        )
+        pos = gps_logger.get_position()
+        assert pos.valid is True
+        assert pos.latitude == 51.5
+        assert pos.altitude == 31.0
+        assert pos.satellites == 7
+        assert pos.hdop == 1.2
+        
+    def test_handle_tpv_report_no_fix(self, gps_logger):
+        """Test TPV report without a fix yields invalid position."""
+        gps_logger._handle_report(b'{"class":"TPV","mode":1}')
+        gps_logger._handle_report(b'not json')
+        assert gps_logger.has_fix() is False
+        assert gps_logger.get_stats()["no_fix_count"] == 1
+        
+    def test_handle_tpv_report_without_sky(self, gps_logger):
+        """Test TPV error estimates stand in for HDOP before any SKY report."""
+        gps_logger._handle_report(b'{"class":"TPV","mode":2,"lat":51.5,"lon":-0.1,"epx":3.5,"epy":4.0}')
+        assert gps_logger.get_position().hdop == 4.0
+        with patch("scanners.gps_logger.ORJSON_AVAILABLE", False):
+            gps_logger._handle_report(b'{"class":"TPV","mode":2,"lat":51.6,"lon":-0.1}')
+        assert gps_logger.get_position().latitude == 51.6
+        assert gps_logger.get_position().hdop == 99.0
+        
+    def test_reuse_positions(self):
+        """Test evicted history positions are recycled only when enabled."""
+        tpv = b'{"class":"TPV","mode":2,"lat":51.5,"lon":-0.1,"epx":1.0,"epy":1.0}'
+        gps = GPSLogger(history_size=2, min_satellites=0, reuse_positions=True)
+        gps._handle_report(tpv)
+        first = gps.get_position()
+        for _ in range(2):
+            gps._handle_report(tpv)
+        assert gps._position_pool[0] is first
+        
+        gps._handle_report(tpv.replace(b"51.5", b"52.0"))
+        assert gps.get_position() is first
+        assert first.latitude == 52.0
+        assert len(gps._position_pool) == 1
+        
+        plain = GPSLogger(history_size=2, min_satellites=0)
+        assert plain._position_pool is None
+        
+    def test_streaming_reader(self):
+        """Test streaming mode reads reports pushed by gpsd."""
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        gps = GPSLogger(
+            host="127.0.0.1",
+            port=server.getsockname()[1],
+            min_satellites=4,
+            use_streaming=True,
+        )
+        try:
+            assert gps.start() is True
+            conn, _ = server.accept()
+            assert b"?WATCH=" in conn.recv(1024)
+            conn.sendall(
+                b'{"class":"SKY","hdop":0.9,"satellites":'
+                b'[{"used":true},{"used":true},{"used":true},{"used":true},{"used":false}]}\n'
+                b'{"class":"TPV","mode":2,"lat":51.5,"lon":-0.1}\n'
+            )
+            assert gps.wait_for_fix(timeout=5.0) is True
+            assert gps.get_position().satellites == 4
+            conn.close()
+        finally:
+            gps.stop()
+            server.close()
+            
+    def test_estimate_channel_hop_mode_hysteresis(self, gps_logger):
+        """Test hop mode is held until speed changes past the hysteresis."""
+        def set_speed(speed):
+            gps_logger._current_position = GPSPosition(
+                latitude=51.5074,
+                longitude=-0.1278,
+                altitude=30.0,
+                timestamp=datetime.now(timezone.utc),
+                speed=speed,
+                valid=True,
+            )
+            
+        set_speed(4.8)
+        assert gps_logger.estimate_channel_hop_mode() == "adaptive"
+        set_speed(5.1)
+        assert gps_logger.estimate_channel_hop_mode() == "adaptive"
+        set_speed(5.4)
+        assert gps_logger.estimate_channel_hop_mode() == "fast"
+        assert gps_logger.estimate_channel_hop_mode(fast_threshold=6.0) == "adaptive"
+        
+    def test_reconnect_backoff(self, gps_logger):
+        """Test reconnect delay doubles up to the cap."""
+        gps_logger._backoff = 0.01
+        with patch.object(gps_logger, "connect", return_value=False) as connect:
+            gps_logger._reconnect()
+            gps_logger._reconnect()
+            assert gps_logger._backoff == 0.04
+            assert connect.call_count == 2
+            
+            gps_logger._backoff = 20.0
+            gps_logger._stop_event.set()
+            assert gps_logger._reconnect() is False
+            assert connect.call_count == 2
+            
+        gps_logger._backoff = 20.0
+        gps_logger._stop_event.clear()
+        with patch.object(gps_logger._stop_event, "wait", return_value=False), \
+                patch.object(gps_logger, "connect", return_value=True):
+            assert gps_logger._reconnect() is True
+        assert gps_logger._backoff == 30.0
+        
     @patch("scanners.gps_logger.GPSD_AVAILABLE", False)
     def test_connect_no_gpsd(self, gps_logger):
         """Test connect fails without gpsd."""
@@ -582,6 +1134,15 @@ class TestTsharkCapture:
         assert probe.source_mac == "AA:BB:CC:DD:EE:FF"
         assert probe.supported_rates == [6, 12, 24, 48]
         
+    def test_parsed_frames_use_slots(self):
+        """Test per-frame dataclasses carry no instance __dict__."""
+        from scanners.tshark_capture import ProbeRequest, BeaconFrame
+        
+        probe = ProbeRequest(source_mac="AA", timestamp=0.0, ssid="", channel=1, rssi=-50)
+        beacon = BeaconFrame(bssid="BB", timestamp=0.0, ssid="", channel=1, rssi=-50)
+        assert not hasattr(probe, "__dict__")
+        assert not hasattr(beacon, "__dict__")
+        
     def test_beacon_frame_dataclass(self):
         """Test BeaconFrame dataclass."""
         from scanners.tshark_capture import BeaconFrame
@@ -612,6 +1173,272 @@ class TestTsharkCapture:
         assert session.session_id == "20251225_120000"
         assert session.packet_count == 0
 
+        
+    @pytest.fixture
+    def capture(self, tmp_path):
+        """Create TsharkCapture instance writing under tmp_path."""
+        from scanners.tshark_capture import TsharkCapture
+        return TsharkCapture(interface="wlan0mon", output_dir=str(tmp_path))
+        
+    def test_get_field_prefers_exact_key(self, capture):
+        """Test an exact key wins over earlier keys that merely contain it."""
+        layers = {
+            "wlan.sa_resolved": ["Vendor_dd:ee:ff"],
+            "wlan.sa": ["aa:bb:cc:dd:ee:ff"],
+            "wlan.mgt": {"wlan.ssid": "HomeNet"},
+        }
+        assert capture._get_field(layers, "wlan.sa", None) == "aa:bb:cc:dd:ee:ff"
+        assert capture._get_field(layers, "wlan.ssid", None) == "HomeNet"
+        assert capture._get_field(layers, "wlan.ds", "x") == "x"
+        
+    def test_iter_tshark_output_streams_lines(self, capture):
+        """Test tshark stdout is yielded line by line as bytes."""
+        script = "print('a\\tb'); print('c\\td')"
+        lines = list(capture._iter_tshark_output([sys.executable, "-c", script]))
+        assert lines == [b"a\tb\n", b"c\td\n"]
+        
+    def test_iter_tshark_output_reports_failure(self, capture):
+        """Test a non-zero tshark exit surfaces its stderr."""
+        script = "import sys; sys.stderr.write('bad pcap'); sys.exit(2)"
+        with pytest.raises(subprocess.CalledProcessError) as exc:
+            list(capture._iter_tshark_output([sys.executable, "-c", script]))
+        assert exc.value.stderr == "bad pcap"
+        
+    def test_extract_beacons_keeps_latest_per_bssid(self, capture, tmp_path):
+        """Test only the last beacon from each AP becomes a BeaconFrame."""
+        def beacon(epoch, bssid, rssi):
+            return b"\t".join([
+                b"0x0008", epoch, bssid, b"Net", b"1", rssi, b"", b"", b"", b"", b"", b"",
+            ]) + b"\n"
+            
+        lines = [
+            beacon(b"100", b"aa:aa:aa:aa:aa:aa", b"-70"),
+            beacon(b"101", b"bb:bb:bb:bb:bb:bb", b"-60"),
+            beacon(b"102", b"aa:aa:aa:aa:aa:aa", b"-50"),
+        ]
+        with patch.object(capture, "_iter_tshark_output", return_value=iter(lines)):
+            beacons = capture._extract_beacons(str(tmp_path / "x.pcapng"))
+        assert [(b.bssid, b.rssi) for b in beacons] == [
+            ("aa:aa:aa:aa:aa:aa", -50),
+            ("bb:bb:bb:bb:bb:bb", -60),
+        ]
+        assert beacons[0].beacon_interval == 100
+        
+    def test_parse_pcap_single_tshark_pass(self, capture, tmp_path):
+        """Test probes and beacons come from one tshark run."""
+        from scanners.tshark_capture import PROBE_FIELDS, BEACON_FIELDS
+        
+        pcap = tmp_path / "x.pcapng"
+        pcap.write_bytes(b"")
+        probe = [b"0x0004", b"100", b"aa:bb:cc:dd:ee:ff"]
+        probe += [b""] * (len(PROBE_FIELDS) - 2 + len(BEACON_FIELDS))
+        beacon = [b"0x0008"] + [b""] * len(PROBE_FIELDS)
+        beacon += [b"101", b"11:22:33:44:55:66"] + [b""] * (len(BEACON_FIELDS) - 2)
+        lines = [b"\t".join(probe) + b"\n", b"\t".join(beacon) + b"\n"]
+        
+        with patch.object(capture, "_iter_tshark_output", return_value=iter(lines)) as run:
+            result = capture.parse_pcap(str(pcap))
+        run.assert_called_once()
+        cmd = run.call_args.args[0]
+        assert "||" in cmd[cmd.index("-Y") + 1]
+        assert cmd[cmd.index("--disable-protocol") + 1] == "llc"
+        assert "-n" in cmd and "-2" not in cmd
+        assert [p.source_mac for p in result["probes"]] == ["aa:bb:cc:dd:ee:ff"]
+        assert [b.bssid for b in result["beacons"]] == ["11:22:33:44:55:66"]
+        
+    def test_analyze_pcap_single_pass(self, capture, tmp_path):
+        """Test one tshark run yields probes, beacons, vendor IEs and MACs."""
+        from scanners.tshark_capture import PROBE_FIELDS, BEACON_FIELDS
+        
+        pcap = tmp_path / "x.pcapng"
+        pcap.write_bytes(b"")
+        blank_beacon = [b""] * len(BEACON_FIELDS)
+        probe = [b"0x0004", b"100", b"aa:bb:cc:dd:ee:ff"]
+        probe += [b""] * (len(PROBE_FIELDS) - 2) + blank_beacon
+        probe += [b"00:50:f2", b"4", b"1040"]
+        data = [b"0x0028", b"", b"11:22:33:44:55:66"]
+        data += [b""] * (len(PROBE_FIELDS) - 2) + blank_beacon + [b"", b"", b""]
+        lines = [b"\t".join(probe) + b"\n", b"\t".join(data) + b"\n"]
+        
+        with patch.object(capture, "_iter_tshark_output", return_value=iter(lines)) as run:
+            result = capture.analyze_pcap(str(pcap))
+        run.assert_called_once()
+        assert "-Y" not in run.call_args.args[0]
+        assert [p.source_mac for p in result["probes"]] == ["aa:bb:cc:dd:ee:ff"]
+        assert result["beacons"] == []
+        assert result["vendor_ies"] == {
+            "aa:bb:cc:dd:ee:ff": [{"oui": "00:50:f2", "type": "4", "data": "1040"}]
+        }
+        assert sorted(result["macs"]) == ["11:22:33:44:55:66", "AA:BB:CC:DD:EE:FF"]
+        
+    def test_parse_rotated_merges_files(self, capture, tmp_path):
+        """Test rotated files merge probes and keep the newest beacon per AP."""
+        from scanners.tshark_capture import BeaconFrame
+        
+        for name in ("00001_a", "00002_b"):
+            (tmp_path / f"airdump_capture_s1_{name}.pcapng").write_bytes(b"")
+        (tmp_path / "airdump_capture_s2_00001_a.pcapng").write_bytes(b"")
+        
+        def beacon(rssi, ts):
+            return BeaconFrame(
+                bssid="AA:AA:AA:AA:AA:AA", timestamp=ts,
+                ssid="Net", channel=1, rssi=rssi,
+            )
+            
+        per_file = {
+            "00001_a": (["p1"], [beacon(-70, 100)]),
+            "00002_b": (["p2"], [beacon(-50, 200)]),
+        }
+        
+        def extract(pcap_file):
+            return per_file[pcap_file.split("_s1_")[1].split(".")[0]]
+            
+        with patch.object(capture, "_extract_mgmt_frames", side_effect=extract):
+            result = capture.parse_rotated("s1", max_workers=1)
+        assert result["probes"] == ["p1", "p2"]
+        assert [b.rssi for b in result["beacons"]] == [-50]
+        
+    def test_capture_pickles_without_session_state(self, capture):
+        """Test worker copies drop the lock and callbacks but keep config."""
+        import pickle
+        
+        capture.register_probe_callback(lambda probe: None)
+        clone = pickle.loads(pickle.dumps(capture))
+        assert clone.output_dir == capture.output_dir
+        assert clone._probe_callbacks == []
+        assert clone._lock is not capture._lock
+        
+    def test_start_capture_sets_buffer_size(self, capture):
+        """Test the live capture asks tshark for a large capture buffer."""
+        with patch.object(capture, "_check_tshark", return_value=True), \
+                patch.object(capture, "_check_interface", return_value=True), \
+                patch("subprocess.Popen") as popen:
+            assert capture.start_capture("s1")
+        cmd = popen.call_args.args[0]
+        assert cmd[cmd.index("-B") + 1] == "64"
+        capture._active_session = None
+        
+    def test_capture_state_reads_skip_lock(self, capture, tmp_path):
+        """Test status reads don't wait on the start/stop lock."""
+        from scanners.tshark_capture import CaptureSession
+        
+        output = tmp_path / "cap.pcapng"
+        output.write_bytes(b"x" * 10)
+        capture._active_session = CaptureSession(
+            session_id="s1",
+            interface="wlan0mon",
+            output_file=str(output),
+            start_time=datetime.now(),
+        )
+        with capture._lock:
+            assert capture.is_capturing()
+            assert capture.get_capture_stats()["file_size_bytes"] == 10
+        output.unlink()
+        assert capture.get_capture_stats()["file_size_bytes"] == 0
+            
+    @patch("subprocess.run")
+    def test_get_unique_macs_from_bytes(self, mock_run, capture):
+        """Test MACs are deduplicated from raw tshark bytes."""
+        mock_run.return_value = Mock(
+            returncode=0, stdout=b"aa:bb:cc:dd:ee:ff\n\naa:bb:cc:dd:ee:ff\n11:22:33:44:55:66\n"
+        )
+        macs = capture.get_unique_macs("x.pcapng")
+        assert sorted(macs) == ["11:22:33:44:55:66", "AA:BB:CC:DD:EE:FF"]
+        assert "text" not in mock_run.call_args.kwargs
+        
+    def test_extract_vendor_ies_from_fields(self, capture):
+        """Test vendor IEs are built from tab separated tshark fields."""
+        lines = [
+            b"aa:bb:cc:dd:ee:ff\t00:50:f2\t4\t1040\n",
+            b"\t00:50:f2\t4\t1040\n",  # no source address
+        ]
+        with patch.object(capture, "_iter_tshark_output", return_value=iter(lines)) as it:
+            ies = capture.extract_vendor_ies("x.pcapng")
+        assert ies == {"aa:bb:cc:dd:ee:ff": [{"oui": "00:50:f2", "type": "4", "data": "1040"}]}
+        assert "fields" in it.call_args.args[0]
+        
+    def test_parse_rates_formats(self, capture):
+        """Test rates parse from tshark lists with units and markers."""
+        assert capture._parse_rates("1(B),2(B),5.5(B),11") == [1, 2, 5, 11]
+        assert capture._parse_rates("6 Mb/s 54 Mb/s") == [6, 54]
+        assert capture._parse_rates("") == []
+        assert capture._parse_rates(None) == []
+        
+    def test_parse_rates_returns_independent_lists(self, capture):
+        """Test cached rate parsing still hands out separate lists."""
+        first = capture._parse_rates("6,12,24")
+        first.append(48)
+        assert capture._parse_rates("6,12,24") == [6, 12, 24]
+        
+    def test_live_parser_enlarges_pipe(self):
+        """Test the live parser asks for a large tshark output pipe."""
+        from scanners.tshark_capture import LivePacketParser, PIPE_SIZE
+        
+        parser = LivePacketParser(interface="wlan0mon")
+        with patch("subprocess.Popen") as popen, \
+                patch("scanners.tshark_capture._live_reader") as reader:
+            assert parser.start()
+        assert popen.call_args.kwargs["pipesize"] == PIPE_SIZE
+        reader.add.assert_called_once()
+        parser._running = False
+        
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_live_parser_decodes_byte_lines(self, use_orjson):
+        """Test ek byte lines decode the same with and without orjson."""
+        from scanners.tshark_capture import LivePacketParser
+        
+        if use_orjson:
+            pytest.importorskip("orjson")
+        packets = []
+        parser = LivePacketParser(callback=packets.append)
+        parser._running = True
+        with patch("scanners.tshark_capture.ORJSON_AVAILABLE", use_orjson):
+            parser._handle_line(b'{"layers": {"wlan_sa": ["aa"]}}')
+            parser._handle_line(b"not json")
+        assert packets == [{"layers": {"wlan_sa": ["aa"]}}]
+        
+    def test_live_parsers_share_one_reader_thread(self):
+        """Test several live parsers are read by a single shared thread."""
+        from scanners.tshark_capture import LivePacketParser, _live_reader
+        
+        script = "print('{\"n\": 1}'); print('{\"n\": 2}', end='')"
+        packets = []
+        parsers = [LivePacketParser(callback=packets.append) for _ in range(2)]
+        for parser in parsers:
+            parser._process = subprocess.Popen(
+                [sys.executable, "-c", script], stdout=subprocess.PIPE, bufsize=0
+            )
+            parser._running = True
+            _live_reader.add(parser, parser._process.stdout.fileno())
+            
+        deadline = time.monotonic() + 10
+        while len(packets) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        live = [t for t in threading.enumerate() if t.name == "tshark-live"]
+        for parser in parsers:
+            parser.stop()
+            
+        assert sorted(p["n"] for p in packets) == [1, 1, 2, 2]
+        assert len(live) <= 1
+        
+    def test_extract_probe_requests_from_fields(self, capture, tmp_path):
+        """Test probe requests are built from tab separated tshark fields."""
+        line = b"\t".join([
+            b"4", b"1735142400.5", b"aa:bb:cc:dd:ee:ff", b"HomeNet", b"6", b"-42",
+            b"100", b"120", b"2,4,11", b"", b"0x012c", b"",
+        ]) + b"\n"
+        with patch.object(capture, "_iter_tshark_output", return_value=iter([line])):
+            probes = capture._extract_probe_requests(str(tmp_path / "x.pcapng"))
+        assert len(probes) == 1
+        assert probes[0].source_mac == "aa:bb:cc:dd:ee:ff"
+        assert probes[0].ssid == "HomeNet"
+        assert probes[0].timestamp == 1735142400.5
+        assert probes[0].timestamp_dt == datetime.fromtimestamp(1735142400.5)
+        assert (probes[0].channel, probes[0].rssi) == (6, -42)
+        assert probes[0].supported_rates == [2, 4, 11]
+        assert probes[0].ht_capabilities == "0x012c"
+        assert probes[0].vht_capabilities is None
+
 
 class TestScannerIntegration:
     """Integration tests for scanner coordination."""
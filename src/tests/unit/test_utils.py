@@ -29,6 +29,9 @@ from core.utils import (
     sync_filesystem,
     RateLimiter,
     compute_hash,
+    pin_to_cpus,
+    get_interface_cpus,
+    set_process_priority,
     _expand_variables,
 )
 
@@ -153,6 +156,34 @@ class TestLoadConfig:
         # Check that data_dir variable was expanded
         assert "${data_dir}" not in str(config.get("database", {}).get("path", ""))
         
+    def test_config_cache_written_and_reused(self, temp_config_file):
+        """Test parsed config is cached as JSON and reused."""
+        cache_file = Path(temp_config_file + ".cache.json")
+        first = load_config(temp_config_file)
+        assert cache_file.exists()
+        
+        with patch("core.utils.yaml.load") as mock_load:
+            second = load_config(temp_config_file)
+            mock_load.assert_not_called()
+        assert second == first
+        
+    def test_config_cache_keeps_source_mode(self, temp_config_file):
+        """Test the cache is no more readable than the config it copies."""
+        os.chmod(temp_config_file, 0o600)
+        load_config(temp_config_file)
+        cache_mode = os.stat(temp_config_file + ".cache.json").st_mode & 0o777
+        assert cache_mode == 0o600
+        
+    def test_config_cache_invalidated_on_change(self, temp_config_file):
+        """Test stale cache is ignored after the YAML file changes."""
+        load_config(temp_config_file)
+        
+        with open(temp_config_file, "a") as f:
+            f.write("extra_section:\n  key: value\n")
+            
+        config = load_config(temp_config_file)
+        assert config["extra_section"]["key"] == "value"
+        
     def test_expand_variables_function(self):
         """Test _expand_variables utility."""
         variables = {"data_dir": "/opt/airdump"}
@@ -328,6 +359,32 @@ class TestSystemCommands:
         """Test filesystem sync."""
         sync_filesystem()
         mock_run.assert_called_once_with(["sync"], timeout=30)
+        
+    @patch("core.utils.os.sched_setaffinity", create=True)
+    def test_pin_to_cpus(self, mock_affinity):
+        """Test CPU pinning applies affinity."""
+        assert pin_to_cpus(1234, {1}) is True
+        mock_affinity.assert_called_once_with(1234, {1})
+        
+    @patch("core.utils.os.sched_setaffinity", create=True, side_effect=OSError)
+    def test_pin_to_cpus_failure(self, mock_affinity):
+        """Test CPU pinning failure is reported, not raised."""
+        assert pin_to_cpus(1234, {99}) is False
+        
+    def test_get_interface_cpus(self):
+        """Test NIC-local cpulist ranges are expanded."""
+        with patch("builtins.open", mock_open(read_data="0-2,8\n")):
+            assert get_interface_cpus("wlan0") == {0, 1, 2, 8}
+            
+    def test_get_interface_cpus_unreported(self):
+        """Test interfaces without locality info return None."""
+        with patch("builtins.open", side_effect=FileNotFoundError):
+            assert get_interface_cpus("wlan0mon") is None
+            
+    @patch("core.utils.os.setpriority", create=True, side_effect=PermissionError)
+    def test_set_process_priority_unprivileged(self, mock_setpriority):
+        """Test a refused priority change is reported, not raised."""
+        assert set_process_priority(1234, -5) is False
 
 
 class TestRateLimiter: